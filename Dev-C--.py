@@ -15,20 +15,1027 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import sys
+
+if __name__ == "__main__" and sys.argv[1:2]:
+    from cmm.__main__ import command_names, main
+    
+    if sys.argv[1] in command_names():
+        sys.exit(main())
+
 import tkinter as tk
-from tkinter import filedialog, messagebox, font, ttk, scrolledtext
-from pygments import lex
+from tkinter import filedialog, messagebox, simpledialog, font, ttk, scrolledtext
 from pygments.lexers import CLexer
 from pygments.token import Token
 import subprocess
 import tempfile
-import sys
-import re
-import io
-import contextlib
+import threading
+import hashlib
+import queue
+import stat
+import mmap
 import os
+import re
+import json
+import time
+import zlib
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime
 
+import cmm
+import cmm.search
+
+
+class TextChangeTracker:
+    def __init__(self, widget):
+        self.widget = widget
+        self.listeners = []
+        self.recorder = None
+        self.orig = widget._w + "_orig"
+        widget.tk.call("rename", widget._w, self.orig)
+        widget.tk.createcommand(widget._w, self.dispatch)
+    
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+    
+    def call(self, *args):
+        return self.widget.tk.call((self.orig,) + args)
+    
+    def line_of(self, index):
+        return int(str(self.call("index", index)).split(".")[0])
+    
+    def dispatch(self, command, *args):
+        if not self.listeners or command not in ("insert", "delete", "replace"):
+            return self.call(command, *args)
+        
+        if self.recorder is not None:
+            self.recorder(command, args)
+        last_line = self.line_of("end-1c")
+        if command == "insert":
+            first = min(self.line_of(args[0]), last_line)
+            old_last = first
+            added = sum(chars.count("\n") for chars in args[1::2])
+        elif command == "replace" or len(args) <= 2:
+            first = self.line_of(args[0])
+            end = args[1] if len(args) > 1 else f"{args[0]}+1c"
+            old_last = max(first, min(self.line_of(end), last_line))
+            added = sum(chars.count("\n") for chars in args[2::2]) if command == "replace" else 0
+        else:
+            result = self.call(command, *args)
+            self.notify(1, last_line, self.line_of("end-1c"))
+            return result
+        
+        result = self.call(command, *args)
+        self.notify(first, old_last, first + added)
+        return result
+    
+    def notify(self, first, old_last, new_last):
+        for callback in self.listeners:
+            callback(first, old_last, new_last)
+
+
+class SyntaxHighlighter:
+    TAGS = ("keyword", "comment", "string", "number", "builtin")
+    CONTEXT_LINES = 32
+    CHUNK_LINES = 400
+    
+    def __init__(self, text, tracker, viewport_threshold=20000):
+        self.text = text
+        self.lexer = CLexer()
+        self.tag_cache = {}
+        self.viewport_threshold = viewport_threshold
+        self.line_states = [False] * tracker.line_of("end-1c")
+        self.dirty = (1, len(self.line_states))
+        self.valid_upto = 1
+        self.last_viewport = None
+        tracker.add_listener(self.on_change)
+    
+    def configure(self, theme):
+        self.text.tag_config("keyword", foreground=theme["keywords"])
+        self.text.tag_config("comment", foreground=theme["comments"])
+        self.text.tag_config("string", foreground=theme["strings"])
+        self.text.tag_config("number", foreground=theme["numbers"])
+        self.text.tag_config("builtin", foreground=theme["builtins"])
+    
+    def tag_for(self, token_type):
+        try:
+            return self.tag_cache[token_type]
+        except KeyError:
+            pass
+        
+        if token_type in Token.Keyword:
+            tag = "keyword"
+        elif token_type in Token.Comment:
+            tag = "comment"
+        elif token_type in Token.String:
+            tag = "string"
+        elif token_type in Token.Number:
+            tag = "number"
+        elif token_type in Token.Name.Builtin:
+            tag = "builtin"
+        else:
+            tag = None
+        self.tag_cache[token_type] = tag
+        return tag
+    
+    def on_change(self, first, old_last, new_last):
+        self.line_states[first:old_last] = [False] * (new_last - first)
+        self.last_viewport = None
+        
+        delta = new_last - old_last
+        if self.valid_upto > old_last:
+            self.valid_upto += delta
+        elif self.valid_upto > first:
+            self.valid_upto = first
+        
+        if self.dirty is None:
+            self.dirty = (first, new_last)
+            return
+        
+        low, high = self.dirty
+        if low > old_last:
+            low += delta
+        elif low > first:
+            low = first
+        if high > old_last:
+            high += delta
+        elif high > first:
+            high = new_last
+        self.dirty = (min(low, first), max(high, new_last))
+    
+    def is_large(self):
+        return len(self.line_states) >= self.viewport_threshold
+    
+    def pending(self):
+        return self.dirty is not None or self.valid_upto <= len(self.line_states)
+    
+    def highlight(self, visible=None):
+        total = len(self.line_states)
+        if visible is None or not self.is_large():
+            if self.valid_upto <= total:
+                low = self.valid_upto if self.dirty is None else min(self.dirty[0], self.valid_upto)
+                self.dirty = (low, total)
+            if self.dirty is None:
+                return
+            first, last = self.dirty
+            self.dirty = None
+            self.relex(first, last)
+            self.valid_upto = total + 1
+            return
+        
+        top, bottom = visible
+        if self.dirty is not None:
+            first, last = self.dirty
+            self.dirty = None
+            if first < self.valid_upto:
+                if last - first > bottom - top:
+                    self.valid_upto = first
+                else:
+                    end_line, synced = self.relex(first, last, limit=max(last, bottom) + self.CONTEXT_LINES)
+                    if not synced:
+                        self.valid_upto = min(self.valid_upto, end_line)
+        
+        if bottom >= self.valid_upto and self.last_viewport != visible:
+            self.relex(max(top, self.valid_upto), bottom, resync=False)
+            self.last_viewport = visible
+    
+    def catch_up(self, budget=0.008):
+        deadline = time.perf_counter() + budget
+        while self.valid_upto <= len(self.line_states):
+            end_line, synced = self.relex(self.valid_upto, self.valid_upto + self.CHUNK_LINES - 1, resync=False)
+            self.valid_upto = end_line
+            if time.perf_counter() >= deadline:
+                break
+        return self.valid_upto <= len(self.line_states)
+    
+    def relex(self, first, last, resync=True, limit=None):
+        total = len(self.line_states)
+        first = max(1, min(first, total))
+        last = max(first, min(last, total))
+        
+        start = first
+        while start > 1 and self.line_states[start - 1]:
+            start -= 1
+        
+        window = last - start + 1 + self.CONTEXT_LINES
+        while True:
+            stop = start + window
+            if stop > total:
+                chunk = self.text.get(f"{start}.0", "end")
+            else:
+                chunk = self.text.get(f"{start}.0", f"{stop}.0")
+            result = self.lex_chunk(chunk, start, last, stop > total, resync, limit)
+            if result is not None:
+                return result
+            window *= 2
+    
+    def lex_chunk(self, chunk, start, last, at_eof, resync, limit):
+        ranges = {tag: [] for tag in self.TAGS}
+        states = []
+        line = start
+        line_pos = 0
+        end_line = None
+        synced = True
+        
+        for pos, token_type, value in self.lexer.get_tokens_unprocessed(chunk):
+            if pos == line_pos and line > last:
+                if resync and not self.line_states[line - 1]:
+                    end_line = line
+                    break
+                if not resync or (limit is not None and line >= limit):
+                    end_line = line
+                    synced = False
+                    break
+            
+            newlines = value.count("\n")
+            tail = value.rfind("\n")
+            tag = self.tag_for(token_type)
+            if tag is not None:
+                ranges[tag].append(f"{line}.{pos - line_pos}")
+                if newlines:
+                    ranges[tag].append(f"{line + newlines}.{len(value) - 1 - tail}")
+                else:
+                    ranges[tag].append(f"{line}.{pos - line_pos + len(value)}")
+            
+            if newlines:
+                states.extend([True] * (newlines - 1))
+                states.append(tail != len(value) - 1)
+                line += newlines
+                line_pos = pos + tail + 1
+        
+        if end_line is None and not at_eof:
+            return None
+        
+        stop_index = f"{end_line}.0" if end_line is not None else "end"
+        for tag in self.TAGS:
+            self.text.tag_remove(tag, f"{start}.0", stop_index)
+        for tag, tag_ranges in ranges.items():
+            if tag_ranges:
+                self.text.tag_add(tag, *tag_ranges)
+        
+        end_line = end_line if end_line is not None else len(self.line_states) + 1
+        self.line_states[start:end_line - 1] = states[:end_line - 1 - start]
+        return end_line, synced
+
+class LineGutter:
+    HEAT_LEVELS = 8
+    
+    def __init__(self, canvas, text, tracker, text_font, fg, heat_color):
+        self.canvas = canvas
+        self.text = text
+        self.fg = fg
+        self.items = []
+        self.heat = {}
+        self.heat_color = heat_color
+        self.heat_items = []
+        self.heat_fills = {}
+        self.line_count = tracker.line_of("end-1c")
+        self.expected_lines = 0
+        self.set_font(text_font)
+        tracker.add_listener(self.on_change)
+    
+    def on_change(self, first, old_last, new_last):
+        self.line_count += new_last - old_last
+        if self.heat:
+            self.heat = {}
+    
+    def set_heat(self, heat):
+        self.heat = heat
+    
+    def set_heat_color(self, color):
+        self.heat_color = color
+        self.heat_fills = {}
+    
+    def heat_fill(self, value):
+        level = max(1, min(self.HEAT_LEVELS, round(value * self.HEAT_LEVELS)))
+        fill = self.heat_fills.get(level)
+        if fill is None:
+            background = self.canvas.winfo_rgb(self.canvas.cget("bg"))
+            color = self.canvas.winfo_rgb(self.heat_color)
+            mix = level / self.HEAT_LEVELS
+            fill = "#" + "".join(
+                f"{int(low + (high - low) * mix) >> 8:02x}" for low, high in zip(background, color)
+            )
+            self.heat_fills[level] = fill
+        return fill
+    
+    def set_font(self, text_font):
+        self.font = text_font
+        self.digit_width = font.Font(font=text_font).measure("0")
+        for item in self.items:
+            self.canvas.itemconfig(item, font=text_font)
+        self.width = None
+    
+    def set_color(self, fg):
+        self.fg = fg
+        for item in self.items:
+            self.canvas.itemconfig(item, fill=fg)
+    
+    def redraw(self):
+        width = self.digit_width * max(len(str(max(self.line_count, self.expected_lines))) + 1, 4) + 10
+        if width != self.width:
+            self.width = width
+            self.canvas.config(width=width)
+        
+        line = int(self.text.index("@0,0").split(".")[0])
+        used = 0
+        heated = 0
+        while line <= self.line_count:
+            info = self.text.dlineinfo(f"{line}.0")
+            if info is None:
+                break
+            if line in self.heat:
+                fill = self.heat_fill(self.heat[line])
+                if heated < len(self.heat_items):
+                    item = self.heat_items[heated]
+                    self.canvas.coords(item, 0, info[1], width, info[1] + info[3])
+                    self.canvas.itemconfig(item, fill=fill, state="normal")
+                else:
+                    item = self.canvas.create_rectangle(0, info[1], width, info[1] + info[3], fill=fill, width=0)
+                    self.canvas.tag_lower(item)
+                    self.heat_items.append(item)
+                heated += 1
+            if used < len(self.items):
+                item = self.items[used]
+                self.canvas.coords(item, width - 5, info[1])
+                self.canvas.itemconfig(item, text=str(line), state="normal")
+            else:
+                item = self.canvas.create_text(
+                    width - 5, info[1], anchor="ne", text=str(line),
+                    font=self.font, fill=self.fg
+                )
+                self.items.append(item)
+            used += 1
+            line += 1
+        
+        for item in self.items[used:]:
+            self.canvas.itemconfig(item, state="hidden")
+        for item in self.heat_items[heated:]:
+            self.canvas.itemconfig(item, state="hidden")
+
+
+class SearchIndex:
+    CHUNK_LINES = 5000
+    
+    def __init__(self, text, tracker):
+        self.text = text
+        self.tracker = tracker
+        self.pattern = None
+        self.matches = []
+        self.scanned_upto = 1
+        self.current = None
+        tracker.add_listener(self.on_change)
+    
+    def configure(self):
+        self.text.tag_config("found", background="yellow", foreground="black")
+        self.text.tag_config("current_match", background="orange", foreground="black")
+        self.text.tag_raise("found")
+        self.text.tag_raise("current_match")
+    
+    @staticmethod
+    def compile(query, regex=False, match_case=False):
+        flags = re.MULTILINE if match_case else re.MULTILINE | re.IGNORECASE
+        return re.compile(query if regex else re.escape(query), flags)
+    
+    def set_pattern(self, pattern):
+        self.pattern = pattern
+        self.matches = []
+        self.scanned_upto = 1
+        self.current = None
+    
+    def total_lines(self):
+        return self.tracker.line_of("end-1c")
+    
+    def pending(self):
+        return self.pattern is not None and self.scanned_upto <= self.total_lines()
+    
+    def scan(self, first, last):
+        chunk = self.text.get(f"{first}.0", f"{last}.end")
+        matches = []
+        line = first
+        line_start = 0
+        position = 0
+        for match in self.pattern.finditer(chunk):
+            start, end = match.span()
+            if start == end:
+                continue
+            newlines = chunk.count("\n", position, start)
+            if newlines:
+                line += newlines
+                line_start = chunk.rfind("\n", 0, start) + 1
+            position = start
+            if chunk.find("\n", start, end) == -1:
+                matches.append((line, start - line_start, end - line_start))
+        return matches
+    
+    def catch_up(self, budget=0.01):
+        deadline = time.perf_counter() + budget
+        total = self.total_lines()
+        while self.pattern is not None and self.scanned_upto <= total:
+            last = min(self.scanned_upto + self.CHUNK_LINES - 1, total)
+            self.matches.extend(self.scan(self.scanned_upto, last))
+            self.scanned_upto = last + 1
+            if time.perf_counter() >= deadline:
+                break
+        return self.pending()
+    
+    def on_change(self, first, old_last, new_last):
+        if self.pattern is None or self.scanned_upto <= first:
+            return
+        self.current = None
+        low = bisect_left(self.matches, (first,))
+        if self.scanned_upto <= old_last:
+            del self.matches[low:]
+            self.scanned_upto = first
+            return
+        
+        delta = new_last - old_last
+        tail = self.matches[bisect_left(self.matches, (old_last + 1,)):]
+        if delta:
+            tail = [(line + delta, start, end) for line, start, end in tail]
+        self.matches[low:] = self.scan(first, new_last) + tail
+        self.scanned_upto += delta
+    
+    def tag_viewport(self, top, bottom):
+        self.text.tag_remove("found", "1.0", "end")
+        self.text.tag_remove("current_match", "1.0", "end")
+        ranges = []
+        first = bisect_left(self.matches, (top,))
+        last = bisect_left(self.matches, (bottom + 1,))
+        for line, start, end in self.matches[first:last]:
+            ranges.extend((f"{line}.{start}", f"{line}.{end}"))
+        if ranges:
+            self.text.tag_add("found", *ranges)
+        if self.current is not None:
+            line, start, end = self.matches[self.current]
+            self.text.tag_add("current_match", f"{line}.{start}", f"{line}.{end}")
+    
+    def position(self, index):
+        line, column = self.text.index(index).split(".")
+        return int(line), int(column)
+    
+    def find(self, index, backwards=False):
+        line, column = self.position(index)
+        while self.pending() and self.scanned_upto <= line:
+            self.catch_up()
+        at = bisect_left(self.matches, (line, column))
+        if backwards:
+            at -= 1
+            if at < 0:
+                while self.pending():
+                    self.catch_up()
+                at = len(self.matches) - 1
+        else:
+            while at == len(self.matches) and self.pending():
+                self.catch_up()
+            if at == len(self.matches):
+                at = 0
+        if not self.matches:
+            return None
+        self.current = at
+        return self.matches[at]
+
+
+class FileLoader:
+    CHUNK_BYTES = 1 << 18
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.file.close()
+            raise
+        self.size = len(self.data)
+        self.chunks = []
+        self.scanned = 0
+        self.lines = 1
+        self.inserted = 0
+    
+    def close(self):
+        self.data.close()
+        self.file.close()
+    
+    def scanning(self):
+        return self.scanned < self.size
+    
+    def done(self):
+        return not self.scanning() and self.inserted == len(self.chunks)
+    
+    def scan(self, deadline):
+        while self.scanned < self.size:
+            end = self.data.find(b"\n", self.scanned + self.CHUNK_BYTES)
+            end = self.size if end < 0 else end + 1
+            self.chunks.append((self.scanned, end, self.lines))
+            self.lines += self.data[self.scanned:end].count(b"\n")
+            self.scanned = end
+            if time.perf_counter() >= deadline:
+                break
+    
+    def next_text(self):
+        start, end, first_line = self.chunks[self.inserted]
+        self.inserted += 1
+        return self.data[start:end].decode("utf-8").replace("\r\n", "\n")
+    
+    def loaded_bytes(self):
+        return self.chunks[self.inserted - 1][1] if self.inserted else 0
+    
+    def loaded_lines(self):
+        if self.inserted < len(self.chunks):
+            return self.chunks[self.inserted][2] - 1
+        return self.lines
+
+
+def write_atomic(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def process_alive(pid):
+    if pid == os.getpid():
+        return True
+    if sys.platform == "win32":
+        from ctypes import byref, c_ulong, windll
+        
+        handle = windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        code = c_ulong()
+        windll.kernel32.GetExitCodeProcess(handle, byref(code))
+        windll.kernel32.CloseHandle(handle)
+        return code.value == 259
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class BackgroundWriter:
+    SAVE = "save"
+    AUTOSAVE = "autosave"
+    DISCARD = "discard"
+    
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = 0
+        self.digests = {}
+        self.thread = threading.Thread(target=self.run, name="editor-writer", daemon=True)
+        self.thread.start()
+    
+    def submit(self, kind, path, data=None, token=None):
+        self.pending += 1
+        self.requests.put((kind, path, data, token))
+    
+    def run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                self.requests.task_done()
+                return
+            kind, path, data, token = request
+            error = None
+            try:
+                if kind == self.SAVE:
+                    write_atomic(path, data)
+                elif kind == self.AUTOSAVE:
+                    digest = hashlib.sha256(data["text"].encode("utf-8", "surrogatepass")).digest()
+                    if self.digests.get(path) != digest:
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        write_atomic(path, json.dumps(data))
+                        self.digests[path] = digest
+                else:
+                    self.digests.pop(path, None)
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+            except OSError as e:
+                error = e
+            self.results.put((kind, path, token, error))
+            self.requests.task_done()
+    
+    def drain(self):
+        items = []
+        while True:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        self.pending -= len(items)
+        return items
+    
+    def wait(self):
+        self.requests.join()
+    
+    def close(self, timeout=None):
+        self.requests.put(None)
+        self.thread.join(timeout)
+
+
+class UndoGroup:
+    def __init__(self, kind=None):
+        self.ops = []
+        self.kind = kind
+        self.size = 0
+        self.compressed = False
+
+
+class UndoHistory:
+    COALESCE_SECONDS = 1.0
+    
+    def __init__(self, text, tracker, max_bytes=32 << 20, compress_threshold=None):
+        self.text = text
+        self.tracker = tracker
+        self.max_bytes = max_bytes
+        self.compress_threshold = compress_threshold
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.size = 0
+        self.group = None
+        self.close_job = None
+        self.last_time = 0.0
+        self.clean = None
+        self.enabled = True
+        self.applying = False
+        tracker.recorder = self.record
+    
+    def reset(self, clean=True):
+        self.close_group()
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.size = 0
+        self.clean = None if clean else False
+    
+    def mark_clean(self):
+        self.close_group()
+        self.clean = self.undo_stack[-1] if self.undo_stack else None
+    
+    def is_clean(self):
+        return (self.undo_stack[-1] if self.undo_stack else None) is self.clean
+    
+    def clamp(self, index):
+        index = str(self.tracker.call("index", index))
+        if self.tracker.call("compare", index, ">", "end-1c"):
+            index = str(self.tracker.call("index", "end-1c"))
+        return index
+    
+    def record(self, command, args):
+        if not self.enabled or self.applying:
+            return
+        if command == "insert":
+            start = self.clamp(args[0])
+            deleted = ""
+            inserted = "".join(args[1::2])
+        elif command == "replace" or len(args) <= 2:
+            start = self.clamp(args[0])
+            end = self.clamp(args[1] if len(args) > 1 else f"{args[0]}+1c")
+            deleted = self.tracker.call("get", start, end) if self.tracker.call("compare", start, "<", end) else ""
+            inserted = "".join(args[2::2]) if command == "replace" else ""
+        else:
+            self.reset(clean=False)
+            return
+        if not deleted and not inserted:
+            return
+        
+        line, col = map(int, start.split("."))
+        if not deleted and len(inserted) == 1 and inserted != "\n":
+            kind = "insert"
+        elif not inserted and len(deleted) == 1 and deleted != "\n":
+            kind = "delete"
+        else:
+            kind = None
+        self.add([line, col, deleted, inserted], kind)
+    
+    def adjacent(self, previous, op, kind):
+        if previous[0] != op[0]:
+            return False
+        if kind == "insert":
+            return previous[1] + len(previous[3]) == op[1]
+        return op[1] + 1 == previous[1] or op[1] == previous[1]
+    
+    def add(self, op, kind):
+        now = time.perf_counter()
+        group = self.group
+        if group is None:
+            last = self.undo_stack[-1] if self.undo_stack else None
+            if (
+                kind is not None and last is not None and last is not self.clean and last.kind == kind
+                and now - self.last_time < self.COALESCE_SECONDS and self.adjacent(last.ops[-1], op, kind)
+            ):
+                group = last
+            else:
+                group = UndoGroup(kind)
+                self.undo_stack.append(group)
+            self.group = group
+            self.close_job = self.text.after_idle(self.close_group)
+            for stale in self.redo_stack:
+                self.size -= stale.size
+            self.redo_stack.clear()
+        
+        if group.kind is not None and group.ops and kind == group.kind and self.adjacent(group.ops[-1], op, kind):
+            previous = group.ops[-1]
+            if kind == "insert":
+                previous[3] += op[3]
+            elif op[1] < previous[1]:
+                previous[1] = op[1]
+                previous[2] = op[2] + previous[2]
+            else:
+                previous[2] += op[2]
+        else:
+            group.ops.append(op)
+            if len(group.ops) > 1:
+                group.kind = None
+        
+        added = len(op[2].encode("utf-8", "surrogatepass")) + len(op[3].encode("utf-8", "surrogatepass"))
+        group.size += added
+        self.size += added
+        self.last_time = now
+        while self.size > self.max_bytes and len(self.undo_stack) > 1:
+            dropped = self.undo_stack.popleft()
+            self.size -= dropped.size
+            if self.clean is None or self.clean is dropped:
+                self.clean = False
+    
+    def close_group(self):
+        if self.close_job is not None:
+            self.text.after_cancel(self.close_job)
+            self.close_job = None
+        group = self.group
+        self.group = None
+        if group is None or self.compress_threshold is None or group.size < self.compress_threshold:
+            return
+        data = zlib.compress(json.dumps(group.ops).encode("utf-8", "surrogatepass"))
+        self.size += len(data) - group.size
+        group.ops = data
+        group.size = len(data)
+        group.compressed = True
+        group.kind = None
+    
+    def ops_of(self, group):
+        if group.compressed:
+            return json.loads(zlib.decompress(group.ops).decode("utf-8", "surrogatepass"))
+        return group.ops
+    
+    @staticmethod
+    def end_of(line, col, chars):
+        newlines = chars.count("\n")
+        if newlines:
+            tail = len(chars) - chars.rfind("\n") - 1
+            return f"{line + newlines}.{tail}"
+        return f"{line}.{col + len(chars)}"
+    
+    def undo(self):
+        self.close_group()
+        if not self.undo_stack:
+            return None
+        group = self.undo_stack.pop()
+        self.applying = True
+        try:
+            for line, col, deleted, inserted in reversed(self.ops_of(group)):
+                if inserted:
+                    self.text.delete(f"{line}.{col}", self.end_of(line, col, inserted))
+                if deleted:
+                    self.text.insert(f"{line}.{col}", deleted)
+        finally:
+            self.applying = False
+        self.redo_stack.append(group)
+        return self.end_of(line, col, deleted)
+    
+    def redo(self):
+        self.close_group()
+        if not self.redo_stack:
+            return None
+        group = self.redo_stack.pop()
+        self.applying = True
+        try:
+            for line, col, deleted, inserted in self.ops_of(group):
+                if deleted:
+                    self.text.delete(f"{line}.{col}", self.end_of(line, col, deleted))
+                if inserted:
+                    self.text.insert(f"{line}.{col}", inserted)
+        finally:
+            self.applying = False
+        self.undo_stack.append(group)
+        return self.end_of(line, col, inserted)
+
+
+class RenderScheduler:
+    def __init__(self, root, handlers, delay=0):
+        self.root = root
+        self.handlers = handlers
+        self.delay = delay
+        self.dirty = set()
+        self.job = None
+    
+    def invalidate(self, *parts):
+        self.dirty.update(parts)
+        if self.job is None:
+            if self.delay:
+                self.job = self.root.after(self.delay, self.flush_when_idle)
+            else:
+                self.job = self.root.after_idle(self.flush)
+    
+    def flush_when_idle(self):
+        self.job = self.root.after_idle(self.flush)
+    
+    def flush(self):
+        self.job = None
+        dirty, self.dirty = self.dirty, set()
+        for part, callback in self.handlers:
+            if part in dirty:
+                callback()
+
+
+class ConsoleBuffer:
+    def __init__(self, root, widget, interval=33, max_lines=10000):
+        self.root = root
+        self.widget = widget
+        self.interval = interval
+        self.max_lines = max_lines
+        self.log_path = None
+        self.chunks = []
+        self.pending_lines = 0
+        self.job = None
+    
+    def write(self, text, tag=None):
+        if self.chunks and self.chunks[-1][1] == tag:
+            self.chunks[-1][0].append(text)
+        else:
+            self.chunks.append(([text], tag))
+        self.pending_lines += text.count("\n")
+        if self.pending_lines > 2 * self.max_lines:
+            self.drop_overflow()
+        if self.job is None:
+            self.job = self.root.after(self.interval, self.flush)
+    
+    def drop_overflow(self):
+        chunks = [("".join(texts), tag) for texts, tag in self.chunks]
+        excess = self.pending_lines - self.max_lines
+        spilled = []
+        while excess > 0:
+            text, tag = chunks[0]
+            lines = text.count("\n")
+            if lines <= excess:
+                spilled.append(text)
+                chunks.pop(0)
+                excess -= lines
+            else:
+                cut = -1
+                for _ in range(excess):
+                    cut = text.index("\n", cut + 1)
+                spilled.append(text[:cut + 1])
+                chunks[0] = (text[cut + 1:], tag)
+                excess = 0
+        self.spill("".join(spilled))
+        self.chunks = [([text], tag) for text, tag in chunks]
+        self.pending_lines = sum(text.count("\n") for text, tag in chunks)
+    
+    def flush(self):
+        self.job = None
+        if not self.chunks:
+            return
+        
+        args = []
+        for texts, tag in self.chunks:
+            args.extend(("".join(texts), tag or ()))
+        self.chunks = []
+        self.pending_lines = 0
+        
+        self.widget.config(state="normal")
+        self.widget.insert("end", *args)
+        self.trim()
+        self.widget.see("end")
+        self.widget.config(state="disabled")
+    
+    def trim(self):
+        excess = int(self.widget.index("end-1c").split(".")[0]) - self.max_lines
+        if excess > 0:
+            end = f"{excess + 1}.0"
+            if self.log_path:
+                self.spill(self.widget.get("1.0", end))
+            self.widget.delete("1.0", end)
+    
+    def spill(self, text):
+        if not self.log_path or not text:
+            return
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(text)
+        except OSError:
+            self.log_path = None
+    
+    def clear(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.chunks = []
+        self.pending_lines = 0
+        self.widget.config(state="normal")
+        self.widget.delete("1.0", "end")
+        self.widget.config(state="disabled")
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+class PerfMonitor:
+    IDLE = "idle_latency"
+    
+    def __init__(self, window=30.0, max_events=50000):
+        self.window = window
+        self.events = deque(maxlen=max_events)
+        self.origin = time.perf_counter()
+    
+    def record(self, name, start, duration):
+        self.events.append((name, start, duration))
+    
+    def wrap(self, name, func):
+        events = self.events
+        clock = time.perf_counter
+        
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                events.append((name, start, clock() - start))
+        
+        return timed
+    
+    def recent(self, seconds=None):
+        cutoff = time.perf_counter() - (seconds or self.window)
+        return [event for event in self.events if event[1] >= cutoff]
+    
+    def stats(self, seconds=None):
+        durations = {}
+        for name, start, duration in self.recent(seconds):
+            durations.setdefault(name, []).append(duration)
+        rows = []
+        for name, samples in sorted(durations.items()):
+            samples.sort()
+            rows.append((
+                name, len(samples), percentile(samples, 0.5), percentile(samples, 0.95),
+                percentile(samples, 0.99), samples[-1]
+            ))
+        return rows
+    
+    def report(self, seconds=None):
+        lines = [f"{'':<20} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for name, count, p50, p95, p99, peak in self.stats(seconds):
+            lines.append(
+                f"{name:<20} {count:>6} {p50 * 1000:>8.2f} {p95 * 1000:>8.2f} {p99 * 1000:>8.2f} {peak * 1000:>8.2f}"
+            )
+        return "\n".join(lines)
+    
+    def dump(self, path, seconds=None):
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "Tk callbacks"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 2, "args": {"name": "Tk idle latency"}}
+        ]
+        for name, start, duration in self.recent(seconds):
+            events.append({
+                "name": name, "ph": "X", "pid": pid, "tid": 2 if name == self.IDLE else 1,
+                "ts": round((start - self.origin) * 1e6, 1), "dur": round(duration * 1e6, 1)
+            })
+        summary = {
+            name: {
+                "count": count, "p50_ms": p50 * 1000, "p95_ms": p95 * 1000,
+                "p99_ms": p99 * 1000, "max_ms": peak * 1000
+            }
+            for name, count, p50, p95, p99, peak in self.stats(seconds)
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {"window_seconds": seconds or self.window, "platform": sys.platform, "summary": summary}
+            }, f)
+
+
 class SimpleLangEditor:
     def __init__(self, root):
         self.root = root
@@ -44,17 +1051,91 @@ class SimpleLangEditor:
         self.dark_theme = False
         self.setup_themes()
         
+        self.large_file_threshold = 20000
+        self.render_delay = 15
+        self.highlight_job = None
+        self.optimize_level = tk.IntVar(value=cmm.DEFAULT_LEVEL)
+        self.memory_rate = tk.DoubleVar(value=0.0)
+        self.perf_trace_seconds = 30.0
+        self.perf_overlay_seconds = 10.0
+        self.perf_refresh_interval = 500
+        self.idle_probe_interval = 200
+        self.show_perf_overlay = tk.BooleanVar(value=False)
+        self.perf_overlay = None
+        self.perf_job = None
+        self.find_window = None
+        self.search_delay = 150
+        self.search_job = None
+        self.search_scan_job = None
+        self.project_window = None
+        self.project_worker = None
+        self.project_hits = []
+        self.project_delay = 250
+        self.project_job = None
+        self.stream_threshold = 4 << 20
+        self.load_budget = 0.03
+        self.load_interval = 1
+        self.loader = None
+        self.load_job = None
+        self.load_target = None
+        self.edit_version = 0
+        self.undo_limit_bytes = 32 << 20
+        self.undo_compress_threshold = 64 << 10
+        self.compress_undo = tk.BooleanVar(value=False)
+        self.saved_version = 0
+        self.autosave_interval = 30000
+        self.autosave_job = None
+        self.writer_job = None
+        self.recovery_dir = os.path.join(os.path.expanduser("~"), ".dev-cmm", "recovery")
+        self.recovery_path = os.path.join(self.recovery_dir, f"{os.getpid()}-{int(time.time())}.json")
+        self.console_max_lines = 10000
+        self.run_limits = cmm.Limits()
+        
         self.create_widgets()
+        self.tracker = TextChangeTracker(self.text)
+        self.history = UndoHistory(self.text, self.tracker, self.undo_limit_bytes)
+        self.highlighter = SyntaxHighlighter(self.text, self.tracker, self.large_file_threshold)
+        self.highlighter.configure(self.themes["light"])
+        self.search = SearchIndex(self.text, self.tracker)
+        self.search.configure()
+        self.gutter = LineGutter(
+            self.line_numbers, self.text, self.tracker,
+            self.current_font, self.themes["light"]["line_fg"], self.themes["light"]["line_heat"]
+        )
+        self.perf = PerfMonitor(self.perf_trace_seconds)
+        for name in (
+            "highlight_syntax", "highlight_catch_up", "update_line_numbers",
+            "update_status_bar", "write_to_console", "load_step", "undo", "redo"
+        ):
+            setattr(self, name, self.perf.wrap(name, getattr(self, name)))
+        self.scheduler = RenderScheduler(self.root, [
+            ("highlight", self.highlight_syntax),
+            ("gutter", self.update_line_numbers),
+            ("status", self.update_status_bar),
+            ("title", self.update_title),
+            ("search", self.update_search_tags)
+        ], self.render_delay)
+        self.tracker.add_listener(self.on_text_modified)
+        self.console = ConsoleBuffer(self.root, self.console_output, max_lines=self.console_max_lines)
+        self.console.flush = self.perf.wrap("console_flush", self.console.flush)
+        self.console_output.tag_config("input", foreground=self.themes["light"]["console_input"])
         self.setup_scrollbars()
         self.setup_menu()
         self.bind_events()
+        self.root.protocol("WM_DELETE_WINDOW", self.quit_editor)
         
         self.current_file = None
-        self.update_line_numbers()
-        self.update_status_bar()
+        self.scheduler.invalidate("gutter", "status", "title")
         
-        self.input_buffer = []
+        self.worker = None
+        self.worker_poll_interval = 20
         self.waiting_for_input = False
+        self.profile = None
+        self.profile_top = 15
+        self.writer = BackgroundWriter()
+        self.probe_idle()
+        self.root.after_idle(self.offer_recovery)
+        self.autosave_job = self.root.after(self.autosave_interval, self.autosave)
     
     def setup_translations(self):
         self.translations = {
@@ -74,6 +1155,27 @@ class SimpleLangEditor:
                 "Copy": "Copy",
                 "Paste": "Paste",
                 "Find...": "Find...",
+                "Find in Files...": "Find in Files...",
+                "Go to Line...": "Go to Line...",
+                "Compress Large Undo Steps": "Compress Large Undo Steps",
+                "Go to Line": "Go to Line",
+                "Line number (1-{}):": "Line number (1-{}):",
+                "Line {} will be shown once it has loaded": "Line {} will be shown once it has loaded",
+                "Scanning: {}": "Scanning: {}",
+                "Loading: {} ({} of {} lines)": "Loading: {} ({} of {} lines)",
+                "Loading cancelled": "Loading cancelled",
+                "Cancel": "Cancel",
+                "Please wait until the file has finished loading": "Please wait until the file has finished loading",
+                "Find in Files": "Find in Files",
+                "Directory:": "Directory:",
+                "Browse...": "Browse...",
+                "Indexing...": "Indexing...",
+                "Indexing {} of {} files...": "Indexing {} of {} files...",
+                "{} files indexed ({:.2f} s)": "{} files indexed ({:.2f} s)",
+                "Error: {}": "Error: {}",
+                "{} matches ({:.0f} ms)": "{} matches ({:.0f} ms)",
+                "First {} matches ({:.0f} ms)": "First {} matches ({:.0f} ms)",
+                "You have unsaved changes. Do you want to discard them?": "You have unsaved changes. Do you want to discard them?",
                 "Font...": "Font...",
                 "Toggle Theme": "Toggle Theme",
                 "Language": "Language",
@@ -82,6 +1184,10 @@ class SimpleLangEditor:
                 "Run": "Run",
                 "Run Script": "Run Script",
                 "Stop Execution": "Stop Execution",
+                "Optimization": "Optimization",
+                "O0 (none)": "O0 (none)",
+                "O1 (fold constants, remove dead code)": "O1 (fold constants, remove dead code)",
+                "O2 (also hoist invariants, fast for loops)": "O2 (also hoist invariants, fast for loops)",
                 "Help": "Help",
                 "Syntax Help": "Syntax Help",
                 "Editor Help": "Editor Help (Comming Soon)",
@@ -93,12 +1199,63 @@ class SimpleLangEditor:
                 "Execution stopped": "Execution stopped",
                 "Text not found": "Text not found",
                 "Found: {}": "Found: {}",
+                "Find:": "Find:",
+                "Match case": "Match case",
+                "Regular expression": "Regular expression",
+                "Previous": "Previous",
+                "Next": "Next",
+                "Invalid pattern: {}": "Invalid pattern: {}",
+                "{} matches so far...": "{} matches so far...",
+                "No matches": "No matches",
+                "{} of {}": "{} of {}",
+                "{} matches": "{} matches",
                 "Error": "Error",
                 "Cannot open file:\n{}": "Cannot open file:\n{}",
                 "Cannot save file:\n{}": "Cannot save file:\n{}",
+                "Saving: {}": "Saving: {}",
+                "Autosave failed: {}": "Autosave failed: {}",
+                "Recover Unsaved Changes": "Recover Unsaved Changes",
+                "Unsaved changes to {} from {} were found. Do you want to recover them?": "Unsaved changes to {} from {} were found. Do you want to recover them?",
+                "Recovered: {}": "Recovered: {}",
                 "Cannot run script:\n{}": "Cannot run script:\n{}",
                 "No code to run": "No code to run",
                 "Script executed: {}": "Script executed: {}",
+                "Running: {}": "Running: {}",
+                "Execution Limits": "Execution Limits",
+                "Execution Limits...": "Execution Limits...",
+                "Max loop iterations:": "Max loop iterations:",
+                "Time limit (seconds):": "Time limit (seconds):",
+                "Memory limit (MiB):": "Memory limit (MiB):",
+                "Leave empty for no limit": "Leave empty for no limit",
+                "Limits must be positive numbers": "Limits must be positive numbers",
+                "OK": "OK",
+                "Console Log File...": "Console Log File...",
+                "Trimmed console output goes to: {}": "Trimmed console output goes to: {}",
+                "Input queued ({} line(s) pending)": "Input queued ({} line(s) pending)",
+                "Run with Input": "Run with Input",
+                "Run with Input...": "Run with Input...",
+                "Run with Profiling": "Run with Profiling",
+                "Memory Tracking": "Memory Tracking",
+                "Performance Overlay": "Performance Overlay",
+                "Dump Performance Trace...": "Dump Performance Trace...",
+                "Performance": "Performance",
+                "Last {} s": "Last {} s",
+                "Performance trace saved: {}": "Performance trace saved: {}",
+                "Cannot save performance trace:\n{}": "Cannot save performance trace:\n{}",
+                "Off": "Off",
+                "Sample 2% of run time": "Sample 2% of run time",
+                "Sample 10% of run time": "Sample 10% of run time",
+                "Trace continuously (slow)": "Trace continuously (slow)",
+                "Memory": "Memory",
+                "unknown": "unknown",
+                "peak {}, sampled {:.0%} of run time": "peak {}, sampled {:.0%} of run time",
+                "Export Profile...": "Export Profile...",
+                "Profile": "Profile",
+                "No profile to export": "No profile to export",
+                "Profile exported: {}": "Profile exported: {}",
+                "Cannot export profile:\n{}": "Cannot export profile:\n{}",
+                "One line per input() call:": "One line per input() call:",
+                "A script is already running": "A script is already running",
                 "Theme switched to {}": "Theme switched to {}",
                 "Font changed to {} {}": "Font changed to {} {}",
                 "Save File": "Save File",
@@ -134,6 +1291,27 @@ class SimpleLangEditor:
                 "Copy": "复制",
                 "Paste": "粘贴",
                 "Find...": "查找...",
+                "Find in Files...": "在文件中查找...",
+                "Go to Line...": "转到行...",
+                "Compress Large Undo Steps": "压缩较大的撤销步骤",
+                "Go to Line": "转到行",
+                "Line number (1-{}):": "行号 (1-{}):",
+                "Line {} will be shown once it has loaded": "第 {} 行加载后将自动跳转",
+                "Scanning: {}": "正在扫描: {}",
+                "Loading: {} ({} of {} lines)": "正在加载: {} (第 {} 行, 共 {} 行)",
+                "Loading cancelled": "已取消加载",
+                "Cancel": "取消",
+                "Please wait until the file has finished loading": "请等待文件加载完成",
+                "Find in Files": "在文件中查找",
+                "Directory:": "目录:",
+                "Browse...": "浏览...",
+                "Indexing...": "正在建立索引...",
+                "Indexing {} of {} files...": "正在索引第 {} 个文件, 共 {} 个...",
+                "{} files indexed ({:.2f} s)": "已索引 {} 个文件 ({:.2f} 秒)",
+                "Error: {}": "错误: {}",
+                "{} matches ({:.0f} ms)": "{} 处匹配 ({:.0f} 毫秒)",
+                "First {} matches ({:.0f} ms)": "前 {} 处匹配 ({:.0f} 毫秒)",
+                "You have unsaved changes. Do you want to discard them?": "有未保存的更改, 是否放弃?",
                 "Font...": "字体...",
                 "Toggle Theme": "切换主题",
                 "Language": "语言",
@@ -142,6 +1320,10 @@ class SimpleLangEditor:
                 "Run": "运行",
                 "Run Script": "运行脚本",
                 "Stop Execution": "停止执行",
+                "Optimization": "优化级别",
+                "O0 (none)": "O0 (不优化)",
+                "O1 (fold constants, remove dead code)": "O1 (常量折叠, 删除无用代码)",
+                "O2 (also hoist invariants, fast for loops)": "O2 (另外外提循环不变量, 快速 for 循环)",
                 "Help": "帮助",
                 "Syntax Help": "语法帮助",
                 "Editor Help": "编辑器帮助 (敬请期待)",
@@ -153,12 +1335,63 @@ class SimpleLangEditor:
                 "Execution stopped": "执行已停止",
                 "Text not found": "未找到文本",
                 "Found: {}": "已找到: {}",
+                "Find:": "查找:",
+                "Match case": "区分大小写",
+                "Regular expression": "正则表达式",
+                "Previous": "上一个",
+                "Next": "下一个",
+                "Invalid pattern: {}": "无效的模式: {}",
+                "{} matches so far...": "已找到 {} 处, 仍在搜索...",
+                "No matches": "没有匹配",
+                "{} of {}": "第 {} 处, 共 {} 处",
+                "{} matches": "共 {} 处匹配",
                 "Error": "错误",
                 "Cannot open file:\n{}": "无法打开文件:\n{}",
                 "Cannot save file:\n{}": "无法保存文件:\n{}",
+                "Saving: {}": "正在保存: {}",
+                "Autosave failed: {}": "自动保存失败: {}",
+                "Recover Unsaved Changes": "恢复未保存的更改",
+                "Unsaved changes to {} from {} were found. Do you want to recover them?": "发现 {} 在 {} 的未保存更改, 是否恢复?",
+                "Recovered: {}": "已恢复: {}",
                 "Cannot run script:\n{}": "无法运行脚本:\n{}",
                 "No code to run": "没有可运行的代码",
                 "Script executed: {}": "脚本已执行: {}",
+                "Running: {}": "正在运行: {}",
+                "Execution Limits": "执行限制",
+                "Execution Limits...": "执行限制...",
+                "Max loop iterations:": "最大循环次数:",
+                "Time limit (seconds):": "时间限制 (秒):",
+                "Memory limit (MiB):": "内存限制 (MiB):",
+                "Leave empty for no limit": "留空表示不限制",
+                "Limits must be positive numbers": "限制必须为正数",
+                "OK": "确定",
+                "Console Log File...": "控制台日志文件...",
+                "Trimmed console output goes to: {}": "被裁剪的控制台输出将写入: {}",
+                "Input queued ({} line(s) pending)": "输入已排队 (还有 {} 行待读取)",
+                "Run with Input": "带输入运行",
+                "Run with Input...": "带输入运行...",
+                "Run with Profiling": "性能分析运行",
+                "Memory Tracking": "内存跟踪",
+                "Performance Overlay": "性能浮窗",
+                "Dump Performance Trace...": "导出性能追踪...",
+                "Performance": "性能",
+                "Last {} s": "最近 {} 秒",
+                "Performance trace saved: {}": "性能追踪已保存: {}",
+                "Cannot save performance trace:\n{}": "无法保存性能追踪:\n{}",
+                "Off": "关闭",
+                "Sample 2% of run time": "采样 2% 的运行时间",
+                "Sample 10% of run time": "采样 10% 的运行时间",
+                "Trace continuously (slow)": "持续跟踪 (较慢)",
+                "Memory": "内存",
+                "unknown": "未知",
+                "peak {}, sampled {:.0%} of run time": "峰值 {}, 采样了 {:.0%} 的运行时间",
+                "Export Profile...": "导出性能分析...",
+                "Profile": "性能分析",
+                "No profile to export": "没有可导出的性能分析",
+                "Profile exported: {}": "性能分析已导出: {}",
+                "Cannot export profile:\n{}": "无法导出性能分析:\n{}",
+                "One line per input() call:": "每行对应一次 input() 调用:",
+                "A script is already running": "已有脚本正在运行",
                 "Theme switched to {}": "主题已切换为 {}",
                 "Font changed to {} {}": "字体已更改为 {} {}",
                 "Save File": "保存文件",
@@ -191,7 +1424,6 @@ class SimpleLangEditor:
         self.v_scroll.pack(side="right", fill="y")
         
         self.text.config(yscrollcommand=self.update_scroll)
-        self.line_numbers.config(yscrollcommand=self.update_scroll)
 
     def init_dpi_awareness(self):
         if sys.platform == "win32":
@@ -205,7 +1437,7 @@ class SimpleLangEditor:
         self.themes = {
             "light": {
                 "bg": "white", "fg": "black", "cursor": "black",
-                "line_bg": "#f0f0f0", "line_fg": "#666",
+                "line_bg": "#f0f0f0", "line_fg": "#666", "line_heat": "#ff6000",
                 "keywords": "blue", "comments": "green",
                 "strings": "purple", "numbers": "red",
                 "builtins": "orange",
@@ -217,7 +1449,7 @@ class SimpleLangEditor:
             },
             "dark": {
                 "bg": "#1e1e1e", "fg": "#d4d4d4", "cursor": "#d4d4d4",
-                "line_bg": "#252526", "line_fg": "#858585",
+                "line_bg": "#252526", "line_fg": "#858585", "line_heat": "#d7451b",
                 "keywords": "#569cd6", "comments": "#6a9955",
                 "strings": "#ce9178", "numbers": "#b5cea8",
                 "builtins": "#d7ba7d",
@@ -233,12 +1465,10 @@ class SimpleLangEditor:
         self.main_frame = tk.Frame(self.root)
         self.main_frame.pack(fill="both", expand=True)
         
-        self.line_numbers = tk.Text(
-            self.main_frame, width=4, padx=5, pady=5,
-            bg=self.themes["light"]["line_bg"], fg=self.themes["light"]["line_fg"],
-            font=self.current_font, state="disabled", wrap="none",
-            takefocus=0, bd=0, highlightthickness=0,
-            spacing1=0, spacing2=0, spacing3=0
+        self.line_numbers = tk.Canvas(
+            self.main_frame, width=40,
+            bg=self.themes["light"]["line_bg"],
+            takefocus=0, bd=0, highlightthickness=0
         )
         self.line_numbers.pack(side="left", fill="y")
         
@@ -248,7 +1478,7 @@ class SimpleLangEditor:
             insertbackground=self.themes["light"]["cursor"],
             selectbackground=self.themes["light"]["select_bg"],
             selectforeground=self.themes["light"]["select_fg"],
-            padx=5, pady=5, undo=True,
+            padx=5, pady=5, undo=False,
             spacing1=0, spacing2=0, spacing3=0,
             bd=0, highlightthickness=0
         )
@@ -320,6 +1550,7 @@ class SimpleLangEditor:
         file_menu.add_command(label=self.tr("Save As..."), command=self.save_as)
         file_menu.add_separator()
         file_menu.add_command(label=self.tr("Clear Console"), command=self.clear_console)
+        file_menu.add_command(label=self.tr("Console Log File..."), command=self.set_console_log)
         file_menu.add_separator()
         file_menu.add_command(label=self.tr("Exit"), command=self.quit_editor)
         menubar.add_cascade(label=self.tr("File"), menu=file_menu)
@@ -333,9 +1564,20 @@ class SimpleLangEditor:
         edit_menu.add_command(label=self.tr("Paste"), accelerator="Ctrl+V", command=self.paste)
         edit_menu.add_separator()
         edit_menu.add_command(label=self.tr("Find..."), accelerator="Ctrl+F", command=self.find_text)
+        edit_menu.add_command(label=self.tr("Find in Files..."), accelerator="Ctrl+Shift+F", command=self.find_in_files)
+        edit_menu.add_command(label=self.tr("Go to Line..."), accelerator="Ctrl+G", command=self.go_to_line)
+        edit_menu.add_separator()
+        edit_menu.add_checkbutton(
+            label=self.tr("Compress Large Undo Steps"), variable=self.compress_undo,
+            command=self.toggle_undo_compression
+        )
         edit_menu.add_separator()
         edit_menu.add_command(label=self.tr("Font..."), command=self.change_font)
         edit_menu.add_command(label=self.tr("Toggle Theme"), command=self.toggle_theme)
+        edit_menu.add_checkbutton(
+            label=self.tr("Performance Overlay"), variable=self.show_perf_overlay, command=self.toggle_perf_overlay
+        )
+        edit_menu.add_command(label=self.tr("Dump Performance Trace..."), command=self.dump_perf_trace)
         
         lang_menu = tk.Menu(edit_menu, tearoff=0)
         lang_menu.add_command(label=self.tr("English"), command=lambda: self.change_language("en"))
@@ -346,7 +1588,31 @@ class SimpleLangEditor:
         
         run_menu = tk.Menu(menubar, tearoff=0)
         run_menu.add_command(label=self.tr("Run Script"), accelerator="F5", command=self.run_script)
+        run_menu.add_command(label=self.tr("Run with Input..."), command=self.run_with_input)
+        run_menu.add_command(label=self.tr("Run with Profiling"), command=self.run_with_profiling)
+        run_menu.add_command(label=self.tr("Export Profile..."), command=self.export_profile)
         run_menu.add_command(label=self.tr("Stop Execution"), accelerator="F6", command=self.stop_execution)
+        run_menu.add_command(label=self.tr("Execution Limits..."), command=self.set_run_limits)
+        run_menu.add_separator()
+        
+        optimize_menu = tk.Menu(run_menu, tearoff=0)
+        for level, label in (
+            (cmm.O0, "O0 (none)"),
+            (cmm.O1, "O1 (fold constants, remove dead code)"),
+            (cmm.O2, "O2 (also hoist invariants, fast for loops)")
+        ):
+            optimize_menu.add_radiobutton(label=self.tr(label), variable=self.optimize_level, value=level)
+        run_menu.add_cascade(label=self.tr("Optimization"), menu=optimize_menu)
+        
+        memory_menu = tk.Menu(run_menu, tearoff=0)
+        for rate, label in (
+            (0.0, "Off"),
+            (0.02, "Sample 2% of run time"),
+            (0.1, "Sample 10% of run time"),
+            (1.0, "Trace continuously (slow)")
+        ):
+            memory_menu.add_radiobutton(label=self.tr(label), variable=self.memory_rate, value=rate)
+        run_menu.add_cascade(label=self.tr("Memory Tracking"), menu=memory_menu)
         menubar.add_cascade(label=self.tr("Run"), menu=run_menu)
         
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -372,58 +1638,47 @@ class SimpleLangEditor:
         self.console_label.config(text=self.tr("Console"))
         
         self.status_label.config(text=self.tr("Ready"))
-        self.update_status_bar()
+        self.scheduler.invalidate("status", "title")
     
     def clear_console(self):
-        self.console_output.config(state="normal")
-        self.console_output.delete("1.0", "end")
-        self.console_output.config(state="disabled")
+        self.console.clear()
         self.status(self.tr("Console cleared"))
     
     def handle_console_input(self, event=None):
-        if not self.waiting_for_input:
+        if self.worker is None:
             return
         
         input_text = self.console_input.get()
         self.console_input.delete(0, "end")
         
-        self.input_buffer.append(input_text)
-        
-        self.write_to_console(f"> {input_text}\n", is_input=True)
-        
-        self.waiting_for_input = False
+        self.worker.send(input_text)
+        if not self.waiting_for_input:
+            self.status(self.tr("Input queued ({} line(s) pending)").format(self.worker.input.pending()))
     
     def write_to_console(self, text, is_input=False):
-        theme = self.themes["dark"] if self.dark_theme else self.themes["light"]
-        self.console_output.config(state="normal")
-        
-        if is_input:
-            self.console_output.insert("end", text, "input")
-            self.console_output.tag_config("input", foreground=theme["console_input"])
-        else:
-            self.console_output.insert("end", text)
-        
-        self.console_output.see("end")
-        self.console_output.config(state="disabled")
+        self.console.write(text, "input" if is_input else None)
+    
+    def set_console_log(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".log",
+            filetypes=[("Log Files", "*.log"), ("All Files", "*.*")]
+        )
+        self.console.log_path = file_path or None
+        if file_path:
+            self.status(self.tr("Trimmed console output goes to: {}").format(file_path))
     
-    def custom_input(self, prompt=""):
+    def request_input(self, prompt=""):
         if prompt:
             self.write_to_console(prompt)
         
         self.waiting_for_input = True
         
         self.console_input.focus()
-        
-        while self.waiting_for_input:
-            self.root.update()
-        
-        return self.input_buffer.pop(0)
     
     def bind_events(self):
-        self.text.bind("<KeyRelease>", self.on_key_release)
-        self.text.bind("<<Modified>>", self.on_text_modified)
-        self.text.bind("<Key>", self.update_status_bar)
-        self.text.bind("<Button-1>", self.update_status_bar)
+        self.text.bind("<Key>", lambda e: self.scheduler.invalidate("status"))
+        self.text.bind("<Button-1>", lambda e: self.scheduler.invalidate("status"))
+        self.text.bind("<Configure>", lambda e: self.scheduler.invalidate("gutter"))
         
         self.text.bind("<Return>", self.auto_indent)
         
@@ -438,6 +1693,10 @@ class SimpleLangEditor:
         self.root.bind_all("<F5>", lambda e: self.run_script())
         self.root.bind_all("<F6>", lambda e: self.stop_execution())
         self.root.bind_all("<Control-f>", lambda e: self.find_text())
+        self.root.bind_all("<Control-F>", lambda e: self.find_in_files())
+        self.root.bind_all("<Control-g>", lambda e: self.go_to_line())
+        self.root.bind_all("<F3>", lambda e: self.find_next())
+        self.root.bind_all("<Shift-F3>", lambda e: self.find_previous())
         self.root.bind_all("<Control-z>", lambda e: self.undo())
         self.root.bind_all("<Control-y>", lambda e: self.redo())
     
@@ -451,49 +1710,33 @@ class SimpleLangEditor:
         self.text.insert("insert", "\n" + " " * leading_spaces)
         return "break"
     
-    def update_line_numbers(self, event=None):
-        text_content = self.text.get("1.0", "end-1c")
-        lines = text_content.split("\n")
-        line_count = len(lines)
-        
-        max_line_num_width = len(str(max(1, line_count))) + 1
-        self.line_numbers.config(width=max(max_line_num_width, 4))
-        
-        self.line_numbers.config(state="normal")
-        self.line_numbers.delete("1.0", "end")
-        
+    def visible_line_range(self):
         first_visible_line = int(self.text.index("@0,0").split(".")[0])
         dlineinfo = self.text.dlineinfo("@0,0")
         
-        if dlineinfo and line_count > 100:
+        if dlineinfo:
             line_height = dlineinfo[3]
             visible_lines = int(self.text.winfo_height() / line_height) + 2
-            last_line = min(first_visible_line + visible_lines, line_count)
-            for i in range(first_visible_line, last_line + 1):
-                self.line_numbers.insert("end", f"{i}\n")
         else:
-            for i in range(1, line_count + 1):
-                self.line_numbers.insert("end", f"{i}\n")
-        
-        self.line_numbers.config(state="disabled")
-        
-        self.line_numbers.yview_moveto(self.text.yview()[0])
-        self.line_numbers.update_idletasks()
+            visible_lines = 50
+        return first_visible_line, first_visible_line + visible_lines
     
-    def on_text_modified(self, event=None):
-        if self.text.edit_modified():
-            self.update_line_numbers()
-            self.highlight_syntax()
-            self.update_status_bar()
-            self.text.edit_modified(False)
+    def update_line_numbers(self, event=None):
+        self.gutter.redraw()
     
-    def on_key_release(self, event=None):
-        self.on_text_modified()
+    def on_text_modified(self, *args):
+        self.edit_version += 1
+        self.scheduler.invalidate("highlight", "gutter", "status", "title", "search")
     
     def update_scroll(self, *args):
         self.text.yview_moveto(args[0])
-        self.line_numbers.yview_moveto(args[0])
         self.v_scroll.set(*args)
+        
+        self.scheduler.invalidate("gutter")
+        if self.highlighter.is_large():
+            self.scheduler.invalidate("highlight")
+        if self.search.pattern is not None:
+            self.scheduler.invalidate("search")
     
     def on_scroll(self, *args):
         if len(args) == 1 and isinstance(args[0], tk.Event):
@@ -506,48 +1749,19 @@ class SimpleLangEditor:
         else:
             self.text.yview(*args)
         
-        self.update_line_numbers()
+        self.scheduler.invalidate("gutter")
         return "break"
     
     def highlight_syntax(self):
-        code = self.text.get("1.0", "end-1c")
-        
-        for tag in self.text.tag_names():
-            self.text.tag_remove(tag, "1.0", "end")
-        
-        lexer = CLexer()
-        tokens = lex(code, lexer)
-        
-        theme = self.themes["dark"] if self.dark_theme else self.themes["light"]
-        
-        for token_type, value in tokens:
-            if token_type in Token.Keyword:
-                tag_name = "keyword"
-                color = theme["keywords"]
-            elif token_type in Token.Comment:
-                tag_name = "comment"
-                color = theme["comments"]
-            elif token_type in Token.String:
-                tag_name = "string"
-                color = theme["strings"]
-            elif token_type in Token.Number:
-                tag_name = "number"
-                color = theme["numbers"]
-            elif token_type in Token.Name.Builtin:
-                tag_name = "builtin"
-                color = theme["builtins"]
-            else:
-                continue
-            
-            start = "1.0"
-            while True:
-                start = self.text.search(re.escape(value), start, stopindex="end", regexp=True)
-                if not start:
-                    break
-                end = f"{start}+{len(value)}c"
-                self.text.tag_add(tag_name, start, end)
-                self.text.tag_config(tag_name, foreground=color)
-                start = end
+        self.highlighter.highlight(self.visible_line_range())
+        if self.highlighter.pending() and self.highlight_job is None:
+            self.highlight_job = self.root.after_idle(self.highlight_catch_up)
+    
+    def highlight_catch_up(self):
+        self.highlight_job = None
+        self.highlighter.highlight(self.visible_line_range())
+        if self.highlighter.catch_up():
+            self.highlight_job = self.root.after_idle(self.highlight_catch_up)
     
     def toggle_theme(self):
         self.dark_theme = not self.dark_theme
@@ -559,9 +1773,10 @@ class SimpleLangEditor:
             selectbackground=theme["select_bg"],
             selectforeground=theme["select_fg"]
         )
-        self.line_numbers.config(
-            bg=theme["line_bg"], fg=theme["line_fg"]
-        )
+        self.line_numbers.config(bg=theme["line_bg"])
+        self.gutter.set_color(theme["line_fg"])
+        self.gutter.set_heat_color(theme["line_heat"])
+        self.console_output.tag_config("input", foreground=theme["console_input"])
         self.console_output.config(
             bg=theme["console_bg"], fg=theme["console_fg"]
         )
@@ -581,7 +1796,7 @@ class SimpleLangEditor:
             bg=theme["status_bg"], fg=theme["status_fg"]
         )
         
-        self.highlight_syntax()
+        self.highlighter.configure(theme)
         self.status(self.tr("Theme switched to {}").format(self.tr("Dark") if self.dark_theme else self.tr("Light")))
     
     def change_font(self):
@@ -621,11 +1836,11 @@ class SimpleLangEditor:
             try:
                 self.current_font = (font_family.get(), font_size.get())
                 self.text.config(font=self.current_font)
-                self.line_numbers.config(font=self.current_font)
+                self.gutter.set_font(self.current_font)
                 self.console_output.config(font=self.current_font)
                 self.console_input.config(font=self.current_font)
                 font_window.destroy()
-                self.update_line_numbers()
+                self.scheduler.invalidate("gutter")
                 self.status(self.tr("Font changed to {} {}").format(font_family.get(), font_size.get()))
             except Exception as e:
                 messagebox.showerror(self.tr("Error"), self.tr("Invalid font: {}").format(e))
@@ -633,9 +1848,12 @@ class SimpleLangEditor:
         ttk.Button(font_window, text=self.tr("Apply"), command=apply_font).grid(row=3, columnspan=2, pady=5)
     
     def new_file(self, event=None):
+        self.cancel_load()
         self.text.delete("1.0", "end")
+        self.history.reset()
+        self.text.edit_modified(False)
         self.current_file = None
-        self.update_status_bar()
+        self.scheduler.invalidate("status", "title")
         self.status(self.tr("New file created"))
     
     def open_file(self, event=None):
@@ -643,31 +1861,228 @@ class SimpleLangEditor:
             filetypes=[("C-- Files", "*.cmm"), ("All Files", "*.*")]
         )
         if file_path:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    self.text.delete("1.0", "end")
-                    self.text.insert("1.0", f.read())
-                self.current_file = file_path
-                self.status(self.tr("Opened: {}").format(file_path))
-                self.highlight_syntax()
-                self.update_line_numbers()
-                self.update_status_bar()
-            except Exception as e:
-                messagebox.showerror(self.tr("Error"), self.tr("Cannot open file:\n{}").format(e))
+            self.load_file(file_path)
+    
+    def load_file(self, file_path):
+        self.cancel_load()
+        try:
+            size = os.path.getsize(file_path)
+            if size and size >= self.stream_threshold:
+                return self.start_load(file_path)
+            with open(file_path, "r", encoding="utf-8") as f:
+                self.text.delete("1.0", "end")
+                self.text.insert("1.0", f.read())
+            self.history.reset()
+            self.text.edit_modified(False)
+            self.current_file = file_path
+            self.status(self.tr("Opened: {}").format(file_path))
+            self.scheduler.invalidate("status", "title")
+            return True
+        except Exception as e:
+            messagebox.showerror(self.tr("Error"), self.tr("Cannot open file:\n{}").format(e))
+            return False
+    
+    def start_load(self, file_path):
+        loader = FileLoader(file_path)
+        self.text.delete("1.0", "end")
+        self.text.config(state="disabled")
+        self.history.enabled = False
+        self.current_file = file_path
+        self.loader = loader
+        self.load_target = None
+        
+        self.load_frame = tk.Frame(self.status_bar, bg=self.status_bar.cget("bg"))
+        self.load_progress = ttk.Progressbar(self.load_frame, length=160, maximum=loader.size or 1)
+        self.load_progress.pack(side="left", padx=5)
+        ttk.Button(self.load_frame, text=self.tr("Cancel"), command=self.cancel_load).pack(side="left")
+        self.load_frame.pack(side="right", before=self.line_col_label)
+        
+        self.status(self.tr("Scanning: {}").format(file_path))
+        self.scheduler.invalidate("status", "title")
+        self.load_job = self.root.after(self.load_interval, self.load_step)
+        return True
+    
+    def load_step(self):
+        self.load_job = None
+        loader = self.loader
+        deadline = time.perf_counter() + self.load_budget
+        if loader.scanning():
+            loader.scan(deadline)
+            if not loader.scanning():
+                self.gutter.expected_lines = loader.lines
+                self.scheduler.invalidate("gutter")
+            self.load_job = self.root.after(self.load_interval, self.load_step)
+            return
+        
+        self.text.config(state="normal")
+        try:
+            while not loader.done():
+                self.text.insert("end-1c", loader.next_text())
+                if time.perf_counter() >= deadline:
+                    break
+        except UnicodeDecodeError as e:
+            self.finish_load(discard=True)
+            messagebox.showerror(self.tr("Error"), self.tr("Cannot open file:\n{}").format(e))
+            return
+        finally:
+            if self.loader is loader:
+                self.text.config(state="disabled")
+        
+        if self.load_target is not None and self.load_target[0] <= loader.loaded_lines():
+            self.show_line(*self.load_target)
+            self.load_target = None
+        
+        if loader.done():
+            self.finish_load()
+            self.status(self.tr("Opened: {}").format(loader.path))
+            return
+        
+        self.load_progress.config(value=loader.loaded_bytes())
+        self.status(self.tr("Loading: {} ({} of {} lines)").format(loader.path, loader.loaded_lines(), loader.lines))
+        self.load_job = self.root.after(self.load_interval, self.load_step)
+    
+    def finish_load(self, discard=False):
+        if self.load_job is not None:
+            self.root.after_cancel(self.load_job)
+            self.load_job = None
+        self.loader.close()
+        self.loader = None
+        self.load_target = None
+        self.load_frame.destroy()
+        self.gutter.expected_lines = 0
+        self.text.config(state="normal")
+        self.history.enabled = True
+        if discard:
+            self.text.delete("1.0", "end")
+            self.current_file = None
+        self.history.reset()
+        self.text.edit_modified(False)
+        self.scheduler.invalidate("gutter", "status", "title")
+    
+    def cancel_load(self):
+        if self.loader is not None:
+            self.finish_load(discard=True)
+            self.status(self.tr("Loading cancelled"))
+    
+    def is_loading(self):
+        if self.loader is not None:
+            self.status(self.tr("Please wait until the file has finished loading"))
+            return True
+        return False
+    
+    def go_to_line(self):
+        total = self.loader.lines if self.loader is not None else self.tracker.line_of("end-1c")
+        line = simpledialog.askinteger(
+            self.tr("Go to Line"), self.tr("Line number (1-{}):").format(total),
+            minvalue=1, maxvalue=total, parent=self.root
+        )
+        if line is None:
+            return
+        self.jump_to(line)
+    
+    def jump_to(self, line, start=0, end=0):
+        if self.loader is not None and line > self.loader.loaded_lines():
+            self.load_target = (line, start, end)
+            self.status(self.tr("Line {} will be shown once it has loaded").format(line))
+            return
+        self.show_line(line, start, end)
+    
+    def show_line(self, line, start=0, end=0):
+        self.text.mark_set("insert", f"{line}.{end}")
+        self.text.tag_remove("sel", "1.0", "end")
+        if end > start:
+            self.text.tag_add("sel", f"{line}.{start}", f"{line}.{end}")
+        self.text.see(f"{line}.{start}")
+        self.text.focus_set()
+        self.scheduler.invalidate("status")
     
     def save_file(self, event=None):
+        if self.is_loading():
+            return
         if self.current_file:
-            try:
-                with open(self.current_file, "w", encoding="utf-8") as f:
-                    f.write(self.text.get("1.0", "end-1c"))
-                self.text.edit_modified(False)
-                self.update_status_bar()
-                self.status(self.tr("Saved: {}").format(self.current_file))
-            except Exception as e:
-                messagebox.showerror(self.tr("Error"), self.tr("Cannot save file:\n{}").format(e))
+            self.writer.submit(
+                BackgroundWriter.SAVE, self.current_file, self.text.get("1.0", "end-1c"), self.edit_version
+            )
+            self.status(self.tr("Saving: {}").format(self.current_file))
+            self.poll_writer()
         else:
             self.save_as()
     
+    def poll_writer(self):
+        if self.writer_job is not None:
+            self.root.after_cancel(self.writer_job)
+            self.writer_job = None
+        
+        for kind, path, version, error in self.writer.drain():
+            if kind == BackgroundWriter.SAVE:
+                if error is not None:
+                    messagebox.showerror(self.tr("Error"), self.tr("Cannot save file:\n{}").format(error))
+                    continue
+                if path == self.current_file and version == self.edit_version:
+                    self.history.mark_clean()
+                    self.text.edit_modified(False)
+                    self.saved_version = version
+                    self.writer.submit(BackgroundWriter.DISCARD, self.recovery_path)
+                    self.scheduler.invalidate("title")
+                self.status(self.tr("Saved: {}").format(path))
+            elif kind == BackgroundWriter.AUTOSAVE and error is not None:
+                self.status(self.tr("Autosave failed: {}").format(error))
+        
+        if self.writer.pending:
+            self.writer_job = self.root.after(self.worker_poll_interval, self.poll_writer)
+    
+    def autosave(self):
+        self.autosave_job = self.root.after(self.autosave_interval, self.autosave)
+        if self.loader is not None or self.edit_version == self.saved_version:
+            return
+        
+        self.saved_version = self.edit_version
+        if self.text.edit_modified():
+            self.writer.submit(BackgroundWriter.AUTOSAVE, self.recovery_path, {
+                "file": self.current_file,
+                "time": time.time(),
+                "text": self.text.get("1.0", "end-1c")
+            })
+        else:
+            self.writer.submit(BackgroundWriter.DISCARD, self.recovery_path)
+        self.poll_writer()
+    
+    def offer_recovery(self):
+        try:
+            names = [name for name in os.listdir(self.recovery_dir) if name.endswith(".json")]
+        except OSError:
+            return
+        paths = sorted(
+            (os.path.join(self.recovery_dir, name) for name in names),
+            key=os.path.getmtime, reverse=True
+        )
+        for path in paths:
+            pid = os.path.basename(path).split("-")[0]
+            if path == self.recovery_path or (pid.isdigit() and process_alive(int(pid))):
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)
+                name, saved, text = entry["file"], entry["time"], entry["text"]
+            except (OSError, ValueError, KeyError, TypeError):
+                self.writer.submit(BackgroundWriter.DISCARD, path)
+                continue
+            
+            if messagebox.askyesno(self.tr("Recover Unsaved Changes"), self.tr(
+                "Unsaved changes to {} from {} were found. Do you want to recover them?"
+            ).format(name or self.tr("Untitled"), datetime.fromtimestamp(saved).strftime("%Y-%m-%d %H:%M:%S"))):
+                self.text.delete("1.0", "end")
+                self.text.insert("1.0", text)
+                self.history.reset(clean=False)
+                self.text.edit_modified(True)
+                self.current_file = name
+                self.scheduler.invalidate("status", "title")
+                self.status(self.tr("Recovered: {}").format(name or self.tr("Untitled")))
+                self.writer.submit(BackgroundWriter.DISCARD, path)
+                break
+            self.writer.submit(BackgroundWriter.DISCARD, path)
+        self.poll_writer()
+    
     def save_as(self):
         file_path = filedialog.asksaveasfilename(
             defaultextension=".cmm",
@@ -676,15 +2091,19 @@ class SimpleLangEditor:
         if file_path:
             self.current_file = file_path
             self.save_file()
-            self.update_status_bar()
+            self.scheduler.invalidate("title")
     
-    def run_script(self, event=None):
+    def run_script(self, event=None, input_text=None, profile=False):
+        if self.is_loading():
+            return
+        if self.worker is not None:
+            self.status(self.tr("A script is already running"))
+            return
+        
         if not self.text.get("1.0", "end-1c").strip():
             self.status(self.tr("No code to run"))
             return
         
-        self.input_buffer = []
-        
         if not self.current_file:
             if not messagebox.askyesno(self.tr("Save File"), self.tr("Do you want to save before running?")):
                 return
@@ -693,47 +2112,159 @@ class SimpleLangEditor:
                 return
         
         try:
-            class ConsoleOutput(io.StringIO):
-                def __init__(self, editor):
-                    super().__init__()
-                    self.editor = editor
-                
-                def write(self, text):
-                    self.editor.write_to_console(text)
-            
-            output_redirect = ConsoleOutput(self)
-            
-            import builtins
-            original_input = builtins.input
-            builtins.input = self.custom_input
-            
             code = self.text.get("1.0", "end-1c")
             
             self.write_to_console(f"=== {self.tr('Running script:')} {self.current_file} ===\n")
             self.write_to_console(f"{self.tr('Start time:')} {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             
-            with contextlib.redirect_stdout(output_redirect), \
-                 contextlib.redirect_stderr(output_redirect):
-                try:
-                    exec(code, {'__name__': '__main__'})
-                except Exception as e:
-                    self.write_to_console(f"\n{self.tr('Error:')} {str(e)}\n")
+            if profile:
+                self.profile = None
+                self.gutter.set_heat({})
+                self.scheduler.invalidate("gutter")
             
-            builtins.input = original_input
-            
-            self.write_to_console(f"\n=== {self.tr('Execution finished at')} {datetime.now().strftime('%H:%M:%S')} ===\n\n")
-            self.status(self.tr("Script executed: {}").format(self.current_file))
+            self.worker = cmm.ScriptWorker(
+                code, self.current_file, self.optimize_level.get(), input_text, self.run_limits, profile,
+                self.memory_rate.get() or None
+            ).start()
+            self.status(self.tr("Running: {}").format(self.current_file))
+            self.root.after(self.worker_poll_interval, self.poll_worker)
             
         except Exception as e:
+            self.worker = None
             messagebox.showerror(self.tr("Error"), self.tr("Cannot run script:\n{}").format(e))
     
+    def poll_worker(self):
+        worker = self.worker
+        if worker is None:
+            return
+        
+        for kind, value in worker.drain():
+            if kind == cmm.worker.OUTPUT:
+                self.write_to_console(value)
+            elif kind == cmm.worker.INPUT:
+                self.request_input(value)
+            elif kind == cmm.worker.ECHO:
+                self.waiting_for_input = False
+                self.write_to_console(f"> {value}\n", is_input=True)
+            elif kind == cmm.worker.ERROR:
+                self.write_to_console(f"\n{self.tr('Error:')} {value}\n")
+            elif kind == cmm.worker.DONE:
+                self.finish_run(value)
+                if worker.memory_profiler is not None:
+                    self.show_memory(worker.memory_profiler, worker.source)
+                if worker.profiler is not None:
+                    self.show_profile(worker.profiler, worker.source)
+                return
+        
+        self.root.after(self.worker_poll_interval, self.poll_worker)
+    
+    def finish_run(self, elapsed):
+        self.worker = None
+        self.waiting_for_input = False
+        self.write_to_console(
+            f"\n=== {self.tr('Execution finished at')} {datetime.now().strftime('%H:%M:%S')} "
+            f"({elapsed:.3f} s) ===\n\n"
+        )
+        self.status(self.tr("Script executed: {}").format(self.current_file))
+    
+    def run_with_profiling(self):
+        self.run_script(profile=True)
+    
+    def show_profile(self, profiler, source):
+        self.profile = profiler
+        self.write_to_console(f"=== {self.tr('Profile')} ({profiler.elapsed / 1e6:.3f} ms) ===\n")
+        self.write_to_console(profiler.report(source, self.profile_top) + "\n")
+        self.gutter.set_heat(profiler.heat())
+        self.scheduler.invalidate("gutter")
+    
+    def show_memory(self, memory_profiler, source):
+        if memory_profiler.peak is None:
+            peak = self.tr("unknown")
+        else:
+            peak = f"+{memory_profiler.peak / (1 << 20):.1f} MiB"
+        summary = self.tr("peak {}, sampled {:.0%} of run time").format(peak, memory_profiler.rate)
+        self.write_to_console(f"=== {self.tr('Memory')} ({summary}) ===\n")
+        self.write_to_console(memory_profiler.report(source, self.profile_top) + "\n")
+    
+    def export_profile(self):
+        if self.profile is None:
+            self.status(self.tr("No profile to export"))
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Speedscope JSON", "*.json"), ("Collapsed Stacks", "*.folded"), ("All Files", "*.*")]
+        )
+        if file_path:
+            try:
+                self.profile.export(file_path)
+                self.status(self.tr("Profile exported: {}").format(file_path))
+            except Exception as e:
+                messagebox.showerror(self.tr("Error"), self.tr("Cannot export profile:\n{}").format(e))
+    
+    def run_with_input(self):
+        input_window = tk.Toplevel(self.root)
+        input_window.title(self.tr("Run with Input"))
+        input_window.transient(self.root)
+        
+        tk.Label(input_window, text=self.tr("One line per input() call:"), anchor="w").pack(fill="x", padx=5, pady=(5, 0))
+        input_box = scrolledtext.ScrolledText(input_window, width=50, height=10, font=self.current_font)
+        input_box.pack(fill="both", expand=True, padx=5, pady=5)
+        input_box.focus()
+        
+        def do_run():
+            input_text = input_box.get("1.0", "end-1c")
+            input_window.destroy()
+            self.run_script(input_text=input_text)
+        
+        ttk.Button(input_window, text=self.tr("Run Script"), command=do_run).pack(pady=5)
+    
     def stop_execution(self):
-        if self.waiting_for_input:
-            self.input_buffer.append("")
+        if self.worker is not None:
             self.waiting_for_input = False
+            self.worker.cancel()
             self.write_to_console(f"{self.tr('Execution stopped by user')}\n")
             self.status(self.tr("Execution stopped"))
     
+    def set_run_limits(self):
+        limits_window = tk.Toplevel(self.root)
+        limits_window.title(self.tr("Execution Limits"))
+        limits_window.transient(self.root)
+        limits_window.resizable(False, False)
+        
+        limits = self.run_limits
+        fields = (
+            (self.tr("Max loop iterations:"), limits.max_steps, int),
+            (self.tr("Time limit (seconds):"), limits.timeout, float),
+            (self.tr("Memory limit (MiB):"), limits.max_memory and limits.max_memory // (1 << 20), int)
+        )
+        entries = []
+        for row, (label, value, convert) in enumerate(fields):
+            tk.Label(limits_window, text=label).grid(row=row, column=0, padx=5, pady=5, sticky="w")
+            entry = ttk.Entry(limits_window, width=15)
+            entry.insert(0, "" if value is None else str(value))
+            entry.grid(row=row, column=1, padx=5, pady=5)
+            entries.append((entry, convert))
+        tk.Label(limits_window, text=self.tr("Leave empty for no limit")).grid(row=len(fields), columnspan=2, padx=5)
+        
+        def do_apply():
+            values = []
+            for entry, convert in entries:
+                text = entry.get().strip()
+                try:
+                    value = convert(text) if text else None
+                except ValueError:
+                    value = -1
+                if value is not None and value <= 0:
+                    messagebox.showerror(self.tr("Error"), self.tr("Limits must be positive numbers"), parent=limits_window)
+                    return
+                values.append(value)
+            max_steps, timeout, max_memory = values
+            self.run_limits = cmm.Limits(max_steps, timeout, max_memory and max_memory << 20)
+            limits_window.destroy()
+        
+        ttk.Button(limits_window, text=self.tr("OK"), command=do_apply).grid(row=len(fields) + 1, columnspan=2, pady=5)
+    
     def show_syntax_help(self):
         help_text = f"""C--语法帮助
 C-- Syntax Help
@@ -939,7 +2470,7 @@ v1.0.0
     
     def show_about(self):
         about_text = f"""# 编辑器版本 | Editor Version: 1.0.0
-# C--语言版本 | Language Vertion: 1.0.0
+# C--语言版本 | Language Vertion: {cmm.LANG_VERSION}
 # 作者 | Author: YXStudio
 # 日期 | Date: 2025/8/17
 
@@ -998,18 +2529,21 @@ Copyright (C) 2023~2025 YX-Studio
         close_button.pack(pady=5)
     
     def undo(self):
-        try:
-            self.text.edit_undo()
-            self.update_status_bar()
-        except:
-            pass
+        self.apply_history(self.history.undo())
     
     def redo(self):
-        try:
-            self.text.edit_redo()
-            self.update_status_bar()
-        except:
-            pass
+        self.apply_history(self.history.redo())
+    
+    def apply_history(self, position):
+        if position is None:
+            return
+        self.text.mark_set("insert", position)
+        self.text.see("insert")
+        self.text.edit_modified(not self.history.is_clean())
+        self.scheduler.invalidate("status", "title")
+    
+    def toggle_undo_compression(self):
+        self.history.compress_threshold = self.undo_compress_threshold if self.compress_undo.get() else None
     
     def cut(self):
         self.text.event_generate("<<Cut>>")
@@ -1021,34 +2555,353 @@ Copyright (C) 2023~2025 YX-Studio
         self.text.event_generate("<<Paste>>")
     
     def find_text(self):
-        find_window = tk.Toplevel(self.root)
-        find_window.title(self.tr("Find"))
-        find_window.transient(self.root)
-        find_window.resizable(False, False)
-        
-        tk.Label(find_window, text=self.tr("Find:")).grid(row=0, column=0, padx=5, pady=5)
-        find_entry = ttk.Entry(find_window, width=30)
-        find_entry.grid(row=0, column=1, padx=5, pady=5)
-        find_entry.focus()
-        
-        def do_find():
-            text_to_find = find_entry.get()
-            if text_to_find:
-                start_pos = self.text.search(
-                    text_to_find, "1.0", 
-                    stopindex="end", nocase=True
-                )
-                if start_pos:
-                    end_pos = f"{start_pos}+{len(text_to_find)}c"
-                    self.text.tag_remove("found", "1.0", "end")
-                    self.text.tag_add("found", start_pos, end_pos)
-                    self.text.tag_config("found", background="yellow")
-                    self.text.see(start_pos)
-                    self.status(self.tr("Found: {}").format(text_to_find))
-                else:
-                    self.status(self.tr("Text not found"))
+        if self.find_window is not None:
+            self.find_window.lift()
+            self.find_entry.focus_set()
+            return
         
-        ttk.Button(find_window, text=self.tr("Find"), command=do_find).grid(row=1, columnspan=2, pady=5)
+        self.find_window = tk.Toplevel(self.root)
+        self.find_window.title(self.tr("Find"))
+        self.find_window.transient(self.root)
+        self.find_window.resizable(False, False)
+        self.find_window.protocol("WM_DELETE_WINDOW", self.close_find)
+        
+        self.find_query = tk.StringVar()
+        self.find_case = tk.BooleanVar(value=False)
+        self.find_regex = tk.BooleanVar(value=False)
+        
+        tk.Label(self.find_window, text=self.tr("Find:")).grid(row=0, column=0, padx=5, pady=5)
+        self.find_entry = ttk.Entry(self.find_window, width=30, textvariable=self.find_query)
+        self.find_entry.grid(row=0, column=1, columnspan=2, padx=5, pady=5)
+        self.find_entry.focus()
+        
+        ttk.Checkbutton(
+            self.find_window, text=self.tr("Match case"), variable=self.find_case, command=self.schedule_search
+        ).grid(row=1, column=0, padx=5, sticky="w")
+        ttk.Checkbutton(
+            self.find_window, text=self.tr("Regular expression"), variable=self.find_regex, command=self.schedule_search
+        ).grid(row=1, column=1, columnspan=2, padx=5, sticky="w")
+        
+        ttk.Button(self.find_window, text=self.tr("Previous"), command=self.find_previous).grid(row=2, column=0, pady=5)
+        ttk.Button(self.find_window, text=self.tr("Next"), command=self.find_next).grid(row=2, column=1, pady=5)
+        self.find_count = tk.Label(self.find_window, anchor="w", width=24)
+        self.find_count.grid(row=2, column=2, padx=5, sticky="w")
+        
+        self.find_query.trace_add("write", lambda *args: self.schedule_search())
+        self.find_entry.bind("<Return>", lambda e: self.find_next())
+        self.find_entry.bind("<Shift-Return>", lambda e: self.find_previous())
+        self.find_window.bind("<Escape>", lambda e: self.close_find())
+        
+        try:
+            selected = self.text.get("sel.first", "sel.last")
+        except tk.TclError:
+            selected = ""
+        if selected and "\n" not in selected:
+            self.find_query.set(selected)
+            self.find_entry.select_range(0, "end")
+    
+    def close_find(self):
+        for job in (self.search_job, self.search_scan_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self.search_job = self.search_scan_job = None
+        self.search.set_pattern(None)
+        self.text.tag_remove("found", "1.0", "end")
+        self.text.tag_remove("current_match", "1.0", "end")
+        if self.find_window is not None:
+            self.find_window.destroy()
+            self.find_window = None
+    
+    def schedule_search(self):
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.search_delay, self.update_search_query)
+    
+    def update_search_query(self):
+        self.search_job = None
+        query = self.find_query.get()
+        pattern = None
+        if query:
+            try:
+                pattern = SearchIndex.compile(query, self.find_regex.get(), self.find_case.get())
+            except re.error as e:
+                self.search.set_pattern(None)
+                self.find_count.config(text=self.tr("Invalid pattern: {}").format(e))
+                self.scheduler.invalidate("search")
+                return
+        self.search.set_pattern(pattern)
+        if self.search_scan_job is not None:
+            self.root.after_cancel(self.search_scan_job)
+        self.search_catch_up()
+    
+    def search_catch_up(self):
+        self.search_scan_job = None
+        if self.search.catch_up():
+            self.search_scan_job = self.root.after_idle(self.search_catch_up)
+        self.scheduler.invalidate("search")
+    
+    def update_search_tags(self):
+        if self.find_window is None:
+            return
+        self.search.tag_viewport(*self.visible_line_range())
+        if self.search.pending() and self.search_scan_job is None:
+            self.search_scan_job = self.root.after_idle(self.search_catch_up)
+        
+        if self.search.pattern is None:
+            if not self.find_query.get():
+                self.find_count.config(text="")
+            return
+        count = len(self.search.matches)
+        if self.search.pending():
+            message = self.tr("{} matches so far...").format(count)
+        elif count == 0:
+            message = self.tr("No matches")
+        elif self.search.current is not None:
+            message = self.tr("{} of {}").format(self.search.current + 1, count)
+        else:
+            message = self.tr("{} matches").format(count)
+        self.find_count.config(text=message)
+    
+    def find_next(self, backwards=False):
+        if self.find_window is None:
+            self.find_text()
+            return
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+            self.update_search_query()
+        if self.search.pattern is None:
+            return
+        
+        anchor = "insert"
+        if backwards and self.search.current is not None:
+            line, start, end = self.search.matches[self.search.current]
+            if self.text.compare("insert", "==", f"{line}.{end}"):
+                anchor = f"{line}.{start}"
+        
+        match = self.search.find(anchor, backwards)
+        if match is None:
+            self.status(self.tr("Text not found"))
+        else:
+            line, start, end = match
+            self.text.mark_set("insert", f"{line}.{end}")
+            self.text.tag_remove("sel", "1.0", "end")
+            self.text.tag_add("sel", f"{line}.{start}", f"{line}.{end}")
+            self.text.see(f"{line}.{start}")
+            self.status(self.tr("Found: {}").format(self.find_query.get()))
+        self.scheduler.invalidate("search", "status")
+    
+    def find_previous(self):
+        self.find_next(backwards=True)
+    
+    def find_in_files(self):
+        if self.project_window is not None:
+            self.project_window.lift()
+            self.project_entry.focus_set()
+            return
+        
+        self.project_window = tk.Toplevel(self.root)
+        self.project_window.title(self.tr("Find in Files"))
+        self.project_window.transient(self.root)
+        self.project_window.protocol("WM_DELETE_WINDOW", self.close_find_in_files)
+        self.project_window.columnconfigure(1, weight=1)
+        self.project_window.rowconfigure(3, weight=1)
+        
+        self.project_root = tk.StringVar(value=os.path.dirname(os.path.abspath(self.current_file or "untitled")))
+        self.project_query = tk.StringVar()
+        self.project_case = tk.BooleanVar(value=False)
+        self.project_regex = tk.BooleanVar(value=False)
+        
+        tk.Label(self.project_window, text=self.tr("Directory:")).grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        ttk.Entry(self.project_window, textvariable=self.project_root, state="readonly").grid(
+            row=0, column=1, padx=5, pady=5, sticky="ew"
+        )
+        ttk.Button(self.project_window, text=self.tr("Browse..."), command=self.choose_project_root).grid(
+            row=0, column=2, padx=5, pady=5
+        )
+        
+        tk.Label(self.project_window, text=self.tr("Find:")).grid(row=1, column=0, padx=5, sticky="w")
+        self.project_entry = ttk.Entry(self.project_window, textvariable=self.project_query)
+        self.project_entry.grid(row=1, column=1, columnspan=2, padx=5, sticky="ew")
+        self.project_entry.focus()
+        
+        options = tk.Frame(self.project_window)
+        options.grid(row=2, column=0, columnspan=3, padx=5, sticky="ew")
+        ttk.Checkbutton(
+            options, text=self.tr("Match case"), variable=self.project_case, command=self.schedule_project_search
+        ).pack(side="left")
+        ttk.Checkbutton(
+            options, text=self.tr("Regular expression"), variable=self.project_regex,
+            command=self.schedule_project_search
+        ).pack(side="left", padx=10)
+        self.project_status = tk.Label(options, anchor="e")
+        self.project_status.pack(side="right")
+        
+        results = tk.Frame(self.project_window)
+        results.grid(row=3, column=0, columnspan=3, padx=5, pady=5, sticky="nsew")
+        self.project_list = tk.Listbox(results, width=90, height=20, font=self.current_font, activestyle="none")
+        scrollbar = ttk.Scrollbar(results, command=self.project_list.yview)
+        self.project_list.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.project_list.pack(side="left", fill="both", expand=True)
+        
+        self.project_query.trace_add("write", lambda *args: self.schedule_project_search())
+        self.project_entry.bind("<Return>", lambda e: self.open_project_hit(0))
+        self.project_list.bind("<Double-Button-1>", lambda e: self.open_project_hit())
+        self.project_list.bind("<Return>", lambda e: self.open_project_hit())
+        self.project_window.bind("<Escape>", lambda e: self.close_find_in_files())
+        
+        try:
+            selected = self.text.get("sel.first", "sel.last")
+        except tk.TclError:
+            selected = ""
+        if selected and "\n" not in selected:
+            self.project_query.set(selected)
+            self.project_entry.select_range(0, "end")
+        self.start_project_index()
+    
+    def choose_project_root(self):
+        directory = filedialog.askdirectory(initialdir=self.project_root.get(), parent=self.project_window)
+        if directory:
+            self.project_root.set(directory)
+            self.start_project_index()
+    
+    def start_project_index(self):
+        if self.project_worker is not None:
+            self.project_worker.stop()
+        self.project_worker = cmm.search.SearchWorker(self.project_root.get()).start()
+        self.project_status.config(text=self.tr("Indexing..."))
+        self.root.after(self.worker_poll_interval, self.poll_project_worker, self.project_worker)
+        if self.project_query.get():
+            self.schedule_project_search()
+    
+    def close_find_in_files(self):
+        if self.project_job is not None:
+            self.root.after_cancel(self.project_job)
+            self.project_job = None
+        if self.project_worker is not None:
+            self.project_worker.stop()
+            self.project_worker = None
+        self.project_hits = []
+        if self.project_window is not None:
+            self.project_window.destroy()
+            self.project_window = None
+    
+    def schedule_project_search(self):
+        if self.project_job is not None:
+            self.root.after_cancel(self.project_job)
+        self.project_job = self.root.after(self.project_delay, self.update_project_search)
+    
+    def update_project_search(self):
+        self.project_job = None
+        query = self.project_query.get()
+        if not query:
+            self.project_hits = []
+            self.project_list.delete(0, "end")
+            self.project_status.config(text="")
+            return
+        self.project_worker.query(query, self.project_regex.get(), self.project_case.get())
+    
+    def poll_project_worker(self, worker):
+        if worker is not self.project_worker:
+            return
+        
+        for kind, value in worker.drain():
+            if kind == cmm.search.PROGRESS:
+                self.project_status.config(text=self.tr("Indexing {} of {} files...").format(*value))
+            elif kind == cmm.search.INDEXED:
+                files, changed, removed, elapsed = value
+                self.project_status.config(text=self.tr("{} files indexed ({:.2f} s)").format(files, elapsed))
+                if self.project_query.get() and (changed or removed):
+                    self.schedule_project_search()
+            elif kind == cmm.search.RESULTS:
+                query, hits, elapsed = value
+                if query == self.project_query.get():
+                    self.show_project_hits(hits, elapsed)
+            elif kind == cmm.search.ERROR:
+                self.project_status.config(text=self.tr("Error: {}").format(value))
+        
+        if worker.thread.is_alive() or not worker.events.empty():
+            self.root.after(self.worker_poll_interval, self.poll_project_worker, worker)
+    
+    def show_project_hits(self, hits, elapsed):
+        self.project_hits = hits
+        self.project_list.delete(0, "end")
+        self.project_list.insert("end", *(f"{hit.path}:{hit.line}: {hit.text.strip()}" for hit in hits))
+        if len(hits) >= cmm.search.MAX_RESULTS:
+            message = self.tr("First {} matches ({:.0f} ms)").format(len(hits), elapsed * 1000)
+        else:
+            message = self.tr("{} matches ({:.0f} ms)").format(len(hits), elapsed * 1000)
+        self.project_status.config(text=message)
+    
+    def open_project_hit(self, position=None):
+        if position is None:
+            selection = self.project_list.curselection()
+            if not selection:
+                return
+            position = selection[0]
+        if position >= len(self.project_hits):
+            return
+        
+        hit = self.project_hits[position]
+        path = os.path.join(self.project_root.get(), hit.path)
+        if self.current_file is None or os.path.abspath(path) != os.path.abspath(self.current_file):
+            if self.text.edit_modified() and not messagebox.askyesno(
+                self.tr("Unsaved Changes"),
+                self.tr("You have unsaved changes. Do you want to discard them?"),
+                parent=self.project_window
+            ):
+                return
+            if not self.load_file(path):
+                return
+        self.jump_to(hit.line, hit.start, hit.end)
+    
+    def probe_idle(self):
+        self.root.after_idle(self.record_idle, time.perf_counter())
+        self.root.after(self.idle_probe_interval, self.probe_idle)
+    
+    def record_idle(self, scheduled):
+        self.perf.record(PerfMonitor.IDLE, scheduled, time.perf_counter() - scheduled)
+    
+    def toggle_perf_overlay(self):
+        if self.show_perf_overlay.get():
+            if self.perf_overlay is not None:
+                return
+            self.perf_overlay = tk.Toplevel(self.root)
+            self.perf_overlay.title(self.tr("Performance"))
+            self.perf_overlay.transient(self.root)
+            self.perf_overlay.attributes("-topmost", True)
+            self.perf_overlay.protocol("WM_DELETE_WINDOW", self.close_perf_overlay)
+            self.perf_label = tk.Label(self.perf_overlay, font=("Consolas", 10), justify="left", anchor="nw")
+            self.perf_label.pack(fill="both", expand=True, padx=5, pady=5)
+            self.refresh_perf_overlay()
+        else:
+            self.close_perf_overlay()
+    
+    def close_perf_overlay(self):
+        self.show_perf_overlay.set(False)
+        if self.perf_job is not None:
+            self.root.after_cancel(self.perf_job)
+            self.perf_job = None
+        if self.perf_overlay is not None:
+            self.perf_overlay.destroy()
+            self.perf_overlay = None
+    
+    def refresh_perf_overlay(self):
+        header = self.tr("Last {} s").format(f"{self.perf_overlay_seconds:g}")
+        self.perf_label.config(text=f"{header}\n{self.perf.report(self.perf_overlay_seconds)}")
+        self.perf_job = self.root.after(self.perf_refresh_interval, self.refresh_perf_overlay)
+    
+    def dump_perf_trace(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Trace Files", "*.json"), ("All Files", "*.*")]
+        )
+        if file_path:
+            try:
+                self.perf.dump(file_path)
+                self.status(self.tr("Performance trace saved: {}").format(file_path))
+            except Exception as e:
+                messagebox.showerror(self.tr("Error"), self.tr("Cannot save performance trace:\n{}").format(e))
     
     def status(self, message):
         self.status_label.config(text=message)
@@ -1059,7 +2912,8 @@ Copyright (C) 2023~2025 YX-Studio
         self.line_col_label.config(text=self.tr("Line: {}, Col: {}").format(line, col))
         
         self.language_label.config(text=self.tr("Language: {}").format(self.current_language.upper()))
-        
+    
+    def update_title(self):
         if self.text.edit_modified():
             modified = "*" if self.current_file else f"{self.tr('New File')} *"
             filename = os.path.basename(self.current_file) if self.current_file else self.tr("Untitled")
@@ -1069,6 +2923,9 @@ Copyright (C) 2023~2025 YX-Studio
             self.root.title(f"{self.tr('Advanced Code Editor')} - {filename}")
     
     def quit_editor(self):
+        if self.writer.pending:
+            self.writer.wait()
+            self.poll_writer()
         if self.text.edit_modified():
             if not messagebox.askyesno(
                 self.tr("Unsaved Changes"), 
@@ -1076,6 +2933,11 @@ Copyright (C) 2023~2025 YX-Studio
             ):
                 return
         
+        if self.project_worker is not None:
+            self.project_worker.stop()
+        self.cancel_load()
+        self.writer.submit(BackgroundWriter.DISCARD, self.recovery_path)
+        self.writer.close()
         self.root.destroy()
 
 if __name__ == "__main__":
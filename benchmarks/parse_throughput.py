@@ -0,0 +1,84 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cmm.lexer import tokenize
+from cmm.parser import Parser
+
+BLOCK = """int f{n}(int a, int b) {{
+    int total = 0;
+    for (int i = 0; i < a; i++) {{
+        if (i % 2 == 0 && b > 0) {{
+            total += i * b;  // even
+        }} else {{
+            total -= 1;
+        }}
+    }}
+    /* result */
+    return total;
+}}
+x{n} = f{n}({n}, 3) + 2 ** 4;
+name{n} = "value {n}";
+while (x{n} > 0) {{
+    x{n} = x{n} - 100;
+}}
+print(name{n}, x{n}, !true || false);
+"""
+
+
+def make_source(lines):
+    block_lines = BLOCK.count("\n")
+    return "".join(BLOCK.format(n=n) for n in range(max(1, lines // block_lines)))
+
+
+def best_of(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure C-- tokenizer and parser throughput.")
+    parser.add_argument("--lines", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    
+    for lines in args.lines:
+        source = make_source(lines)
+        count = source.count("\n")
+        tokens = tokenize(source)
+        lex_time = best_of(args.repeat, tokenize, source)
+        parse_time = best_of(args.repeat, lambda: Parser(tokens).parse_program())
+        total = lex_time + parse_time
+        print(
+            f"{count:>8} lines  tokenize {count / lex_time:>12,.0f} lines/s  "
+            f"parse {count / parse_time:>12,.0f} lines/s  total {count / total:>12,.0f} lines/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
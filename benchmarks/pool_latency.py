@@ -0,0 +1,76 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cmm.pool import WarmPool
+
+SCRIPT = 'print("hi");\n'
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def report(label, samples):
+    print(
+        f"{label:<24} median {statistics.median(samples) * 1000:>8.3f} ms  "
+        f"p99 {percentile(samples, 0.99) * 1000:>8.3f} ms  ({len(samples)} runs)"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure latency of trivial scripts on the warm worker pool.")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--subprocess-runs", type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    with WarmPool(size=args.workers) as pool:
+        pool.run(SCRIPT)
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            pool.run(SCRIPT)
+            samples.append(time.perf_counter() - start)
+    report("warm pool", samples)
+    
+    if args.subprocess_runs:
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hi.cmm")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SCRIPT)
+            samples = []
+            for _ in range(args.subprocess_runs):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, "-m", "cmm", "run", path], env=env, stdout=subprocess.DEVNULL, check=True)
+                samples.append(time.perf_counter() - start)
+        report("python -m cmm run", samples)
+
+
+if __name__ == "__main__":
+    main()
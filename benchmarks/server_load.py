@@ -0,0 +1,76 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+SCRIPT = 'int total = 0;\nfor (int i = 0; i < 1000; i++) {\n    total += i;\n}\nprint(total);\n'
+
+
+async def run_once(host, port, source):
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps({"source": source}).encode("utf-8")
+    writer.write(
+        f"POST /run HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    lines = [line for line in data.split(b"\r\n") if line.startswith(b"{")]
+    return json.loads(lines[-1]) if lines else {"status": "no response"}
+
+
+async def load(host, port, total, concurrency, source):
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = {}
+    
+    async def one():
+        async with gate:
+            start = time.perf_counter()
+            result = await run_once(host, port, source)
+            latencies.append(time.perf_counter() - start)
+            statuses[result.get("status")] = statuses.get(result.get("status"), 0) + 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start, sorted(latencies), statuses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a running `python -m cmm serve` instance.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=300)
+    args = parser.parse_args(argv)
+    
+    elapsed, latencies, statuses = asyncio.run(load(args.host, args.port, args.runs, args.concurrency, SCRIPT))
+    print(f"{args.runs} runs, {args.concurrency} concurrent: {args.runs / elapsed:,.0f} runs/s")
+    print(
+        f"latency median {statistics.median(latencies) * 1000:.1f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms"
+    )
+    print("statuses: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items(), key=str)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = 'print("hello");\n'
+GUI_MODULES = ("tkinter", "pygments")
+
+
+def timed_run(command, env):
+    start = time.perf_counter()
+    subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def median_of(repeat, command, env, before=None):
+    samples = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        samples.append(timed_run(command, env))
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure start-up time of the headless C-- runner.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "hello.cmm")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(SCRIPT)
+        cache = os.path.join(directory, "__cmmcache__")
+        
+        probe = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "cmm", "run", path],
+            env=env, capture_output=True, text=True, check=True
+        )
+        leaked = sorted({
+            line.rsplit("|", 1)[-1].strip() for line in probe.stderr.splitlines()
+            if line.rsplit("|", 1)[-1].strip().split(".")[0] in GUI_MODULES
+        })
+        
+        results = [
+            ("python -c pass", median_of(args.repeat, [sys.executable, "-c", "pass"], env)),
+            ("cmm run (no cache)", median_of(
+                args.repeat, [sys.executable, "-m", "cmm", "run", "--no-cache", path], env
+            )),
+            ("cmm run (cold .cmmc)", median_of(
+                args.repeat, [sys.executable, "-m", "cmm", "run", path], env,
+                lambda: shutil.rmtree(cache, ignore_errors=True)
+            )),
+            ("cmm run (warm .cmmc)", median_of(args.repeat, [sys.executable, "-m", "cmm", "run", path], env)),
+            ("cmm check", median_of(args.repeat, [sys.executable, "-m", "cmm", "check", path], env))
+        ]
+    
+    for label, elapsed in results:
+        print(f"{label:<22} {elapsed * 1000:>8.1f} ms")
+    print(f"GUI modules imported: {', '.join(leaked) if leaked else 'none'}")
+    return 1 if leaked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
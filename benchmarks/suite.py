@@ -0,0 +1,325 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parse_throughput import make_source
+
+from cmm.compiler import compile_source
+from cmm.parser import parse
+from cmm.runtime import execute
+
+EDITOR_PATH = os.path.join(ROOT, "Dev-C--.py")
+FORMAT_VERSION = 1
+NEEDLE = "needle_marker"
+
+PROGRAMS = {
+    "loop": """int total = 0;
+for (int i = 0; i < 200000; i++) {
+    if (i % 3 == 0) {
+        total += i * 2;
+    } else {
+        total -= 1;
+    }
+}
+int n = 0;
+while (n < 50000) {
+    n = n + 1;
+}
+print(total, n);
+""",
+    "string": """text = "";
+for (int i = 0; i < 20000; i++) {
+    text = text + "item " + str(i) + ";";
+}
+print(len(text));
+""",
+    "recursion": """int fib(int n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+print(fib(22));
+"""
+}
+
+
+def label(lines):
+    return f"{lines // 1000}k" if lines >= 1000 and lines % 1000 == 0 else str(lines)
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def measure(repeat, func, setup=None, number=1):
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"best": min(samples), "median": statistics.median(samples), "runs": repeat * number}
+
+
+def record(results, name, result):
+    results[name] = result
+    log(f"{name:<36} best {result['best'] * 1000:>10.3f} ms  median {result['median'] * 1000:>10.3f} ms")
+
+
+def discard(text):
+    pass
+
+
+def no_input(prompt=""):
+    return ""
+
+
+def runtime_benchmarks(sizes, repeat, results):
+    for lines in sizes:
+        source = make_source(lines)
+        record(results, f"cmm.parse.corpus.{label(lines)}", measure(repeat, lambda: parse(source)))
+        record(results, f"cmm.compile.corpus.{label(lines)}", measure(repeat, lambda: compile_source(source, cache=None)))
+    
+    for name, source in PROGRAMS.items():
+        code = compile_source(source, cache=None)
+        record(results, f"cmm.parse.{name}", measure(repeat, lambda: parse(source)))
+        record(results, f"cmm.compile.{name}", measure(repeat, lambda: compile_source(source, cache=None)))
+        record(results, f"cmm.execute.{name}", measure(repeat, lambda: execute(code, discard, no_input)))
+
+
+def start_xvfb():
+    executable = shutil.which("Xvfb")
+    if executable is None:
+        return None
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        [executable, "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    if not number:
+        process.kill()
+        process.wait()
+        return None
+    os.environ["DISPLAY"] = f":{number}"
+    return process
+
+
+def load_editor():
+    import tkinter as tk
+    
+    spec = importlib.util.spec_from_file_location("dev_cmm_editor", EDITOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    
+    root = tk.Tk()
+    root.iconbitmap = lambda *args: None
+    editor = module.SimpleLangEditor(root)
+    root.update()
+    return module, editor
+
+
+def gui_benchmarks(sizes, repeat, results, directory):
+    module, editor = load_editor()
+    root = editor.root
+    text = editor.text
+    
+    def set_text(source):
+        root.update_idletasks()
+        text.delete("1.0", "end")
+        text.insert("1.0", source)
+    
+    def highlight_all():
+        editor.highlight_syntax()
+        if editor.highlight_job is not None:
+            root.after_cancel(editor.highlight_job)
+            editor.highlight_job = None
+        while editor.highlighter.catch_up():
+            pass
+    
+    try:
+        for lines in sizes:
+            key = label(lines)
+            source = make_source(lines) + f"print(\"{NEEDLE}\");\n"
+            path = os.path.join(directory, f"corpus_{key}.cmm")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            
+            module.filedialog.askopenfilename = lambda **kwargs: path
+            
+            def open_file():
+                editor.open_file()
+                while editor.loader is not None:
+                    root.update()
+                root.update_idletasks()
+            
+            record(results, f"gui.open_file.{key}", measure(repeat, open_file, lambda: set_text("")))
+            threshold = editor.stream_threshold
+            editor.stream_threshold = 0
+            record(results, f"gui.open_file.streamed.{key}", measure(repeat, open_file, lambda: set_text("")))
+            editor.stream_threshold = threshold
+            record(results, f"gui.highlight_syntax.full.{key}", measure(repeat, highlight_all, lambda: set_text(source)))
+            
+            middle = max(1, source.count("\n") // 2)
+            set_text(source)
+            highlight_all()
+            text.see(f"{middle}.0")
+            root.update()
+            
+            def edit():
+                text.insert(f"{middle}.0", "x")
+                text.delete(f"{middle}.0")
+            
+            record(results, f"gui.highlight_syntax.edit.{key}", measure(repeat, editor.highlight_syntax, edit, number=20))
+            
+            def undo_redo():
+                editor.undo()
+                editor.redo()
+            
+            edit()
+            root.update_idletasks()
+            record(results, f"gui.undo_redo.{key}", measure(repeat, undo_redo, number=50))
+            record(results, f"gui.update_line_numbers.{key}", measure(repeat, editor.update_line_numbers, number=50))
+            search = editor.search
+            
+            def find_all():
+                search.set_pattern(search.compile(NEEDLE))
+                while search.catch_up():
+                    pass
+            
+            record(results, f"gui.find.all.{key}", measure(repeat, find_all, number=5))
+            record(results, f"gui.find.next.{key}", measure(
+                repeat, lambda: search.find(f"{middle}.0"), find_all, number=100
+            ))
+            search.set_pattern(None)
+            
+            output = [f"line {n}: {'x' * 40}\n" for n in range(lines)]
+            
+            def console():
+                for chunk in output:
+                    editor.write_to_console(chunk)
+                editor.console.flush()
+                root.update_idletasks()
+            
+            record(results, f"gui.write_to_console.{key}", measure(repeat, console, editor.clear_console))
+    finally:
+        root.destroy()
+
+
+def compare(results, baseline, tolerance, min_delta):
+    regressions = []
+    previous = baseline.get("results", {})
+    log(f"\n{'benchmark':<36} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for name, result in results.items():
+        base = previous.get(name)
+        if base is None:
+            log(f"{name:<36} {'-':>12} {result['best'] * 1000:>9.3f} ms {'new':>7}")
+            continue
+        ratio = result["best"] / base["best"] if base["best"] else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance and result["best"] - base["best"] > min_delta:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / (1 + tolerance):
+            flag = "  faster"
+        log(f"{name:<36} {base['best'] * 1000:>9.3f} ms {result['best'] * 1000:>9.3f} ms {ratio:>6.2f}x{flag}")
+    for name in previous:
+        if name not in results:
+            log(f"{name:<36} {'missing':>12}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark editor hot paths and the C-- runtime.")
+    parser.add_argument("--lines", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", choices=("cmm", "gui"))
+    parser.add_argument("--xvfb", action="store_true", help="run GUI benchmarks on a private Xvfb display")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a stored JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--min-delta", type=float, default=0.0005, help="ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args(argv)
+    
+    report = {
+        "version": FORMAT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "lines": args.lines,
+        "repeat": args.repeat,
+        "results": {},
+        "skipped": {}
+    }
+    results = report["results"]
+    
+    if args.only != "gui":
+        runtime_benchmarks(args.lines, args.repeat, results)
+    
+    if args.only != "cmm":
+        xvfb = None
+        if args.xvfb or (sys.platform not in ("win32", "darwin") and not os.environ.get("DISPLAY")):
+            xvfb = start_xvfb()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                gui_benchmarks(args.lines, args.repeat, results, directory)
+        except Exception as e:
+            report["skipped"]["gui"] = str(e).splitlines()[0] if str(e) else type(e).__name__
+            log(f"GUI benchmarks skipped: {report['skipped']['gui']}")
+        finally:
+            if xvfb is not None:
+                xvfb.terminate()
+                xvfb.wait()
+    
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+    
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta)
+        if regressions:
+            log(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from importlib import import_module
+
+from .optimizer import DEFAULT_LEVEL
+from .version import LANG_VERSION
+
+EXPORTS = {
+    "compile_file": "bytecode",
+    "CompileCache": "compiler",
+    "compile_program": "compiler",
+    "compile_source": "compiler",
+    "CmmError": "errors",
+    "CmmLimitError": "errors",
+    "CmmRuntimeError": "errors",
+    "CmmSyntaxError": "errors",
+    "tokenize": "lexer",
+    "Limits": "limits",
+    "Supervisor": "limits",
+    "O0": "optimizer",
+    "O1": "optimizer",
+    "O2": "optimizer",
+    "optimize": "optimizer",
+    "parse": "parser",
+    "LineProfiler": "profiler",
+    "MemoryProfiler": "profiler",
+    "execute": "runtime",
+    "ProjectIndex": "search",
+    "ScriptWorker": "worker"
+}
+
+
+def __getattr__(name):
+    module = EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def run_source(source, write, read, filename="<cmm>", optimize=DEFAULT_LEVEL):
+    from .compiler import compile_source
+    from .runtime import execute
+    
+    execute(compile_source(source, filename, optimize=optimize), write, read)
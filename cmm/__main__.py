@@ -0,0 +1,341 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import sys
+
+from . import bytecode, optimizer
+
+EXIT_OK = 0
+EXIT_RUNTIME_ERROR = 1
+EXIT_USAGE = 2
+EXIT_SYNTAX_ERROR = 3
+EXIT_LIMIT = 4
+EXIT_INTERRUPTED = 130
+
+
+def read_stdin(prompt=""):
+    if prompt:
+        sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError("end of input")
+    return line.rstrip("\r\n")
+
+
+def timed_stdin(supervisor):
+    import queue
+    import threading
+    
+    lines = queue.Queue()
+    
+    def pump():
+        for line in iter(sys.stdin.readline, ""):
+            lines.put(line)
+        lines.put("")
+    
+    reader = threading.Thread(target=pump, name="cmm-stdin", daemon=True)
+    
+    def read(prompt=""):
+        if prompt:
+            sys.stdout.write(prompt)
+        sys.stdout.flush()
+        if reader.ident is None:
+            reader.start()
+        try:
+            line = lines.get(timeout=supervisor.remaining())
+        except queue.Empty:
+            supervisor.expire()
+        if not line:
+            lines.put("")
+            raise EOFError("end of input")
+        return line.rstrip("\r\n")
+    
+    return read
+
+
+def load(path, args):
+    if args.no_cache:
+        from .compiler import compile_source
+        
+        with open(path, encoding="utf-8") as f:
+            return compile_source(f.read(), path, cache=None, optimize=args.optimize, checkpoints=args.max_steps is not None)
+    return bytecode.compile_file(
+        path, args.cache_dir, optimize=args.optimize, checkpoints=args.max_steps is not None
+    )
+
+
+def run_command(args):
+    from .errors import CmmError, CmmLimitError, CmmSyntaxError
+    from .limits import Limits, Supervisor
+    from .runtime import execute
+    
+    try:
+        code = load(args.file, args)
+    except OSError as e:
+        print(f"{args.file}: {e.strerror or e}", file=sys.stderr)
+        return EXIT_USAGE
+    except (CmmSyntaxError, UnicodeDecodeError) as e:
+        print(e if isinstance(e, CmmSyntaxError) else f"{args.file}: {e}", file=sys.stderr)
+        return EXIT_SYNTAX_ERROR
+    
+    supervisor = None
+    if args.max_steps is not None or args.timeout is not None or args.max_memory is not None:
+        max_memory = args.max_memory << 20 if args.max_memory is not None else None
+        supervisor = Supervisor(Limits(args.max_steps, args.timeout, max_memory))
+    
+    profiler = memory_profiler = None
+    if args.profile or args.profile_output:
+        from .profiler import LineProfiler
+        profiler = LineProfiler(code.co_filename)
+    if args.memory or args.memory_rate:
+        from .profiler import MEMORY_RATE, MemoryProfiler
+        memory_profiler = MemoryProfiler(code.co_filename, args.memory_rate or MEMORY_RATE)
+    
+    try:
+        read = timed_stdin(supervisor) if args.timeout is not None else read_stdin
+        execute(code, sys.stdout.write, read, supervisor, profiler, memory_profiler)
+    except CmmLimitError as e:
+        sys.stdout.flush()
+        print(e, file=sys.stderr)
+        return EXIT_LIMIT
+    except CmmError as e:
+        sys.stdout.flush()
+        print(e, file=sys.stderr)
+        return EXIT_RUNTIME_ERROR
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    finally:
+        try:
+            sys.stdout.flush()
+        except BrokenPipeError:
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+        if profiler is not None or memory_profiler is not None:
+            report_profiles(profiler, memory_profiler, args)
+    return EXIT_OK
+
+
+def report_profiles(profiler, memory_profiler, args):
+    try:
+        with open(args.file, "r", encoding="utf-8") as f:
+            source = f.read()
+    except OSError:
+        source = None
+    if memory_profiler is not None:
+        peak = "unknown" if memory_profiler.peak is None else f"+{memory_profiler.peak / (1 << 20):.1f} MiB"
+        print(f"\nmemory: peak {peak}, allocations sampled over {memory_profiler.rate:.0%} of the run", file=sys.stderr)
+        print(memory_profiler.report(source, args.top), end="", file=sys.stderr)
+    if profiler is None:
+        return
+    print(f"\nprofile: {profiler.elapsed / 1e6:.3f} ms", file=sys.stderr)
+    print(profiler.report(source, args.top), end="", file=sys.stderr)
+    if args.profile_output:
+        try:
+            profiler.export(args.profile_output)
+        except OSError as e:
+            print(f"{args.profile_output}: {e.strerror or e}", file=sys.stderr)
+
+
+def check_command(args):
+    from .compiler import compile_source
+    from .errors import CmmSyntaxError
+    
+    status = EXIT_OK
+    for path in args.files:
+        try:
+            with open(path, encoding="utf-8") as f:
+                compile_source(f.read(), path, cache=None, optimize=args.optimize)
+        except OSError as e:
+            print(f"{path}: {e.strerror or e}", file=sys.stderr)
+            status = max(status, EXIT_USAGE)
+        except (CmmSyntaxError, UnicodeDecodeError) as e:
+            print(e if isinstance(e, CmmSyntaxError) else f"{path}: {e}", file=sys.stderr)
+            status = EXIT_SYNTAX_ERROR
+        else:
+            if args.verbose:
+                print(f"{path}: ok")
+    return status
+
+
+def batch_command(args):
+    from . import batch
+    
+    return batch.main(args)
+
+
+def serve_command(args):
+    from . import server
+    
+    return server.main(args)
+
+
+def search_command(args):
+    import re
+    import sqlite3
+    from .search import ProjectIndex
+    
+    try:
+        with ProjectIndex(args.root, args.index) as index:
+            index.update()
+            hits = index.search(args.query, args.regex, args.case, args.limit or None)
+    except re.error as e:
+        print(f"invalid pattern: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except (OSError, sqlite3.Error) as e:
+        print(f"{args.root}: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    for hit in hits:
+        print(f"{os.path.join(args.root, hit.path)}:{hit.line}:{hit.start + 1}: {hit.text}")
+    return EXIT_OK if hits else EXIT_RUNTIME_ERROR
+
+
+def compile_command(args):
+    from .errors import CmmSyntaxError
+    
+    status = EXIT_OK
+    for path in args.files:
+        try:
+            bytecode.compile_file(path, args.cache_dir, args.validate, optimize=args.optimize)
+        except OSError as e:
+            print(f"{path}: {e.strerror or e}", file=sys.stderr)
+            status = max(status, EXIT_USAGE)
+        except (CmmSyntaxError, UnicodeDecodeError) as e:
+            print(e if isinstance(e, CmmSyntaxError) else f"{path}: {e}", file=sys.stderr)
+            status = EXIT_SYNTAX_ERROR
+        except Exception as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = max(status, EXIT_RUNTIME_ERROR)
+    return status
+
+
+def prune_command(args):
+    for path in bytecode.prune(args.root, args.dry_run):
+        print(path)
+    return EXIT_OK
+
+
+def add_optimize_argument(parser):
+    parser.add_argument(
+        "-O", dest="optimize", type=int, choices=(optimizer.O0, optimizer.O1, optimizer.O2),
+        default=optimizer.DEFAULT_LEVEL, help="optimization level (default: %(default)s)"
+    )
+
+
+def add_memory_arguments(parser):
+    parser.add_argument("--memory", action="store_true", help="report peak memory and allocation sites by line")
+    parser.add_argument(
+        "--memory-rate", type=float, metavar="FRACTION",
+        help="share of run time spent tracing allocations (default: 0.1, 1 traces continuously)"
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cmm", description="C-- language tools.")
+    commands = parser.add_subparsers(dest="command", required=True, prog=parser.prog)
+    
+    run_parser = commands.add_parser("run", help="run a .cmm file, reading input() lines from stdin")
+    run_parser.add_argument("file")
+    add_optimize_argument(run_parser)
+    run_parser.add_argument("--cache-dir", help="central cache directory instead of __cmmcache__")
+    run_parser.add_argument("--no-cache", action="store_true", help="do not read or write .cmmc files")
+    run_parser.add_argument("--max-steps", type=int, help="abort after this many loop iterations")
+    run_parser.add_argument("--timeout", type=float, help="abort after this many seconds")
+    run_parser.add_argument("--max-memory", type=int, help="abort when memory grows by this many MiB")
+    run_parser.add_argument("--profile", action="store_true", help="print the slowest lines to stderr")
+    run_parser.add_argument(
+        "--profile-output", metavar="FILE", help="write the profile as speedscope JSON (.json) or collapsed stacks"
+    )
+    add_memory_arguments(run_parser)
+    run_parser.add_argument("--top", type=int, default=15, help="lines to show in reports (default: %(default)s)")
+    run_parser.set_defaults(handler=run_command)
+    
+    batch_parser = commands.add_parser("batch", help="run many .cmm files in parallel, writing JSON Lines results")
+    batch_parser.add_argument("paths", nargs="+", help="files, directories or glob patterns")
+    add_optimize_argument(batch_parser)
+    batch_parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    batch_parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    batch_parser.add_argument("--cache-dir", help="central cache directory instead of __cmmcache__")
+    batch_parser.add_argument(
+        "--input-suffix", default=".in", help="input file next to each program (default: %(default)s)"
+    )
+    batch_parser.add_argument("--manifest", help="JSON Lines file with per-file input, timeout and limits")
+    batch_parser.add_argument("--timeout", type=float, help="default time limit per program in seconds")
+    batch_parser.add_argument("--max-steps", type=int, help="default loop iteration limit per program")
+    batch_parser.add_argument("--max-memory", type=int, help="default memory growth limit per program in MiB")
+    batch_parser.add_argument(
+        "--max-output", type=int, default=1 << 20, help="characters of stdout kept per program (default: %(default)s)"
+    )
+    add_memory_arguments(batch_parser)
+    batch_parser.set_defaults(handler=batch_command)
+    
+    serve_parser = commands.add_parser("serve", help="serve C-- runs over HTTP and WebSocket")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("-j", "--workers", type=int, help="warm worker processes (default: CPU count)")
+    serve_parser.add_argument("--max-queue", type=int, default=1000, help="runs allowed to wait for a worker")
+    serve_parser.add_argument("--timeout", type=float, default=10.0, help="maximum seconds per run")
+    serve_parser.add_argument("--max-steps", type=int, help="maximum loop iterations per run")
+    serve_parser.add_argument("--max-memory", type=int, help="maximum memory growth per run in MiB")
+    serve_parser.set_defaults(handler=serve_command)
+    
+    search_parser = commands.add_parser("search", help="search .cmm files under a directory using a trigram index")
+    search_parser.add_argument("query")
+    search_parser.add_argument("root", nargs="?", default=".")
+    search_parser.add_argument("-e", "--regex", action="store_true", help="treat the query as a regular expression")
+    search_parser.add_argument("-c", "--case", action="store_true", help="match case")
+    search_parser.add_argument("--limit", type=int, default=1000, help="stop after this many matches (0 for no limit)")
+    search_parser.add_argument("--index", help="index database (default: __cmmcache__/search.sqlite3 under root)")
+    search_parser.set_defaults(handler=search_command)
+    
+    check_parser = commands.add_parser("check", help="check .cmm files for syntax errors without running them")
+    check_parser.add_argument("files", nargs="+")
+    add_optimize_argument(check_parser)
+    check_parser.add_argument("-v", "--verbose", action="store_true", help="also report files that are ok")
+    check_parser.set_defaults(handler=check_command)
+    
+    compile_parser = commands.add_parser("compile", help="compile .cmm files into the .cmmc cache")
+    compile_parser.add_argument("files", nargs="+")
+    compile_parser.add_argument("--cache-dir", help="central cache directory instead of __cmmcache__")
+    compile_parser.add_argument(
+        "--validate", choices=(bytecode.VALIDATE_MTIME, bytecode.VALIDATE_HASH),
+        default=bytecode.VALIDATE_MTIME, help="how cached files are checked against their source"
+    )
+    add_optimize_argument(compile_parser)
+    compile_parser.set_defaults(handler=compile_command)
+    
+    prune_parser = commands.add_parser("prune", help="remove stale or orphaned .cmmc files")
+    prune_parser.add_argument("root", nargs="?", default=".")
+    prune_parser.add_argument("--dry-run", action="store_true")
+    prune_parser.set_defaults(handler=prune_command)
+    parser.commands = commands
+    return parser
+
+
+def command_names():
+    return tuple(build_parser().commands.choices)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
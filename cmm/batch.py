@@ -0,0 +1,312 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import bytecode
+from .errors import CmmError, CmmLimitError, CmmSyntaxError
+from .limits import Limits, Supervisor, peak_memory, reset_peak_memory
+from .optimizer import DEFAULT_LEVEL
+from .profiler import MEMORY_RATE, MemoryProfiler
+from .runtime import execute
+
+OK = "ok"
+RUNTIME_ERROR = "error"
+SYNTAX_ERROR = "syntax_error"
+LIMIT = "limit"
+MISSING = "missing"
+
+EXIT_CODES = {OK: 0, RUNTIME_ERROR: 1, MISSING: 2, SYNTAX_ERROR: 3, LIMIT: 4}
+INPUT_SUFFIX = ".in"
+MAX_OUTPUT = 1 << 20
+GRACE = 1.0
+
+
+class Job:
+    def __init__(self, path, input_path=None, timeout=None, max_steps=None, max_memory=None, error=None):
+        self.path = path
+        self.input_path = input_path
+        self.timeout = timeout
+        self.max_steps = max_steps
+        self.max_memory = max_memory
+        self.error = error
+
+
+class Capture:
+    def __init__(self, limit=MAX_OUTPUT):
+        self.parts = []
+        self.size = 0
+        self.limit = limit
+        self.truncated = False
+    
+    def write(self, text):
+        room = self.limit - self.size
+        if len(text) > room:
+            self.truncated = True
+            text = text[:max(room, 0)]
+        if text:
+            self.parts.append(text)
+            self.size += len(text)
+    
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+def collect(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for directory, dirnames, filenames in os.walk(pattern):
+                dirnames[:] = sorted(name for name in dirnames if name != bytecode.CACHE_DIRNAME)
+                paths.extend(os.path.join(directory, name) for name in sorted(filenames) if name.endswith(".cmm"))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
+def make_jobs(paths, timeout=None, max_steps=None, max_memory=None, input_suffix=INPUT_SUFFIX, manifest=None):
+    overrides = {}
+    invalid = []
+    if manifest is not None:
+        with open(manifest, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                where = f"{manifest}:{number}"
+                try:
+                    entry = json.loads(line)
+                except ValueError as e:
+                    invalid.append(Job(where, error=f"{where}: invalid JSON: {e}"))
+                    continue
+                if not isinstance(entry, dict) or not isinstance(entry.get("file"), str):
+                    invalid.append(Job(where, error=f'{where}: entry has no "file"'))
+                    continue
+                overrides[os.path.abspath(entry["file"])] = entry
+        known = {os.path.abspath(path) for path in paths}
+        paths = list(paths) + [entry["file"] for key, entry in overrides.items() if key not in known]
+    
+    jobs = []
+    for path in paths:
+        entry = overrides.get(os.path.abspath(path), {})
+        input_path = entry.get("input")
+        if input_path is None and input_suffix:
+            candidate = os.path.splitext(path)[0] + input_suffix
+            if os.path.isfile(candidate):
+                input_path = candidate
+        job_memory = entry.get("max_memory")
+        jobs.append(Job(
+            path, input_path, entry.get("timeout", timeout), entry.get("max_steps", max_steps),
+            job_memory << 20 if job_memory is not None else max_memory
+        ))
+    return jobs + invalid
+
+
+def line_reader(lines):
+    lines = iter(lines)
+    
+    def read(prompt=""):
+        for line in lines:
+            return line
+        raise EOFError("end of input")
+    
+    return read
+
+
+def describe_error(error, path):
+    if isinstance(error, OSError):
+        return MISSING, f"{error.filename or path}: {error.strerror or error}"
+    if isinstance(error, CmmSyntaxError):
+        return SYNTAX_ERROR, str(error)
+    if isinstance(error, CmmLimitError):
+        return LIMIT, str(error)
+    if isinstance(error, UnicodeDecodeError):
+        return SYNTAX_ERROR, f"{path}: {error}"
+    return RUNTIME_ERROR, str(error)
+
+
+def outcome(status, error, start):
+    return {
+        "status": status,
+        "exit_code": EXIT_CODES[status],
+        "error": error,
+        "duration": round(time.perf_counter() - start, 6),
+        "peak_memory": peak_memory()
+    }
+
+
+def run_job(job, optimize=DEFAULT_LEVEL, cache_dir=None, max_output=MAX_OUTPUT, memory_rate=None):
+    output = Capture(max_output)
+    memory_profiler = None
+    reset_peak_memory()
+    start = time.perf_counter()
+    status, error = MISSING, job.error
+    reading = job.path
+    try:
+        if error is None:
+            code = bytecode.compile_file(job.path, cache_dir, optimize=optimize, checkpoints=job.max_steps is not None)
+            lines = []
+            if job.input_path is not None:
+                reading = job.input_path
+                with open(job.input_path, encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            limits = Limits(job.max_steps, job.timeout, job.max_memory)
+            if memory_rate:
+                memory_profiler = MemoryProfiler(code.co_filename, memory_rate)
+            execute(code, output.write, line_reader(lines), Supervisor(limits), memory_profiler=memory_profiler)
+            status = OK
+    except (OSError, CmmError, ValueError) as e:
+        status, error = describe_error(e, reading)
+    
+    result = {"file": job.path, "input": job.input_path, "stdout": output.getvalue(), "truncated": output.truncated}
+    result.update(outcome(status, error, start))
+    if memory_profiler is not None and memory_profiler.thread is not None:
+        result["memory"] = memory_profiler.as_dict()
+    return result
+
+
+def job_failure(job, status, error, start):
+    result = {"file": job.path, "input": job.input_path, "stdout": "", "truncated": False}
+    result.update(outcome(status, error, start), peak_memory=None)
+    return result
+
+
+def serve_jobs(conn, options):
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        conn.send(run_job(job, *options))
+    conn.close()
+
+
+class BatchWorker:
+    def __init__(self, context, options):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=serve_jobs, args=(child, options), name="cmm-batch-worker", daemon=True)
+        self.process.start()
+        child.close()
+    
+    def run(self, job, grace):
+        self.conn.send(job)
+        if not self.conn.poll(job.timeout + grace if job.timeout is not None else None):
+            return None
+        return self.conn.recv()
+    
+    def close(self, timeout=1.0):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+    
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def run_batch(jobs, out, workers=None, optimize=DEFAULT_LEVEL, cache_dir=None, max_output=MAX_OUTPUT,
+              memory_rate=None, grace=GRACE):
+    from .pool import default_context
+    
+    context = default_context()
+    options = (optimize, cache_dir, max_output, memory_rate)
+    counts = dict.fromkeys(EXIT_CODES, 0)
+    pending = iter(jobs)
+    lock = threading.Lock()
+    stopping = threading.Event()
+    
+    def drive():
+        worker = None
+        try:
+            while not stopping.is_set():
+                with lock:
+                    job = next(pending, None)
+                if job is None:
+                    return
+                if worker is None:
+                    worker = BatchWorker(context, options)
+                start = time.perf_counter()
+                try:
+                    result = worker.run(job, grace)
+                except (EOFError, OSError):
+                    worker.kill()
+                    result = job_failure(
+                        job, RUNTIME_ERROR, f"worker process exited with code {worker.process.exitcode}", start
+                    )
+                    worker = None
+                if result is None:
+                    worker.kill()
+                    result = job_failure(job, LIMIT, f"time limit exceeded ({job.timeout:g} s)", start)
+                    worker = None
+                with lock:
+                    counts[result["status"]] += 1
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    out.flush()
+        finally:
+            if worker is not None:
+                worker.close()
+    
+    size = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    with ThreadPoolExecutor(max_workers=size, thread_name_prefix="cmm-batch") as drivers:
+        futures = [drivers.submit(drive) for _ in range(size)]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            stopping.set()
+            raise
+    return counts
+
+
+def main(args):
+    jobs = make_jobs(
+        collect(args.paths), args.timeout, args.max_steps,
+        args.max_memory << 20 if args.max_memory is not None else None,
+        args.input_suffix, args.manifest
+    )
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        memory_rate = args.memory_rate or (MEMORY_RATE if args.memory else None)
+        counts = run_batch(jobs, out, args.jobs, args.optimize, args.cache_dir, args.max_output, memory_rate)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    elapsed = time.perf_counter() - start
+    summary = ", ".join(f"{count} {status}" for status, count in counts.items() if count)
+    print(
+        f"{len(jobs)} programs in {elapsed:.2f} s ({len(jobs) / elapsed if elapsed else 0:.1f}/s): {summary or 'nothing to run'}",
+        file=sys.stderr
+    )
+    return 0 if counts[OK] == len(jobs) else 1
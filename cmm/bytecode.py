@@ -0,0 +1,215 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import marshal
+import os
+import struct
+import sys
+from importlib.util import MAGIC_NUMBER
+
+from .optimizer import DEFAULT_LEVEL
+from .version import LANG_VERSION
+
+MAGIC = b"CMMC"
+FORMAT_VERSION = 1
+CACHE_DIRNAME = "__cmmcache__"
+SUFFIX = ".cmmc"
+VALIDATE_MTIME = "mtime"
+VALIDATE_HASH = "hash"
+
+HEADER = struct.Struct("<4sH4sBqQ32s")
+FLAG_HASH = 1
+
+
+class CacheHeader:
+    __slots__ = ("flags", "mtime_ns", "size", "digest", "lang_version", "options", "source_path", "offset")
+    
+    @classmethod
+    def read(cls, data):
+        if len(data) < HEADER.size:
+            return None
+        magic, version, py_magic, flags, mtime_ns, size, digest = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION or py_magic != MAGIC_NUMBER:
+            return None
+        
+        header = cls()
+        header.flags = flags
+        header.mtime_ns = mtime_ns
+        header.size = size
+        header.digest = digest
+        offset = HEADER.size
+        strings = []
+        for _ in range(3):
+            if offset + 2 > len(data):
+                return None
+            length = struct.unpack_from("<H", data, offset)[0]
+            offset += 2
+            strings.append(data[offset:offset + length].decode("utf-8", "surrogateescape"))
+            offset += length
+        header.lang_version, header.options, header.source_path = strings
+        header.offset = offset
+        return header
+
+
+def cache_tag():
+    return sys.implementation.cache_tag or "cmm"
+
+
+def default_cache_dir():
+    return os.environ.get("CMM_CACHE_DIR") or None
+
+
+def cache_path(source_path, cache_dir=None):
+    cache_dir = cache_dir or default_cache_dir()
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    if cache_dir:
+        import hashlib
+        
+        path_hash = hashlib.sha1(os.path.abspath(source_path).encode("utf-8", "surrogateescape")).hexdigest()[:16]
+        return os.path.join(cache_dir, f"{stem}-{path_hash}.{cache_tag()}{SUFFIX}")
+    directory = os.path.dirname(source_path)
+    return os.path.join(directory, CACHE_DIRNAME, f"{stem}.{cache_tag()}{SUFFIX}")
+
+
+def pack(code, source_path, st, digest, options=""):
+    flags = FLAG_HASH if digest else 0
+    parts = [HEADER.pack(
+        MAGIC, FORMAT_VERSION, MAGIC_NUMBER, flags,
+        st.st_mtime_ns, st.st_size, digest or bytes(32)
+    )]
+    for text in (LANG_VERSION, options, os.path.abspath(source_path)):
+        encoded = text.encode("utf-8", "surrogateescape")
+        parts.append(struct.pack("<H", len(encoded)))
+        parts.append(encoded)
+    parts.append(marshal.dumps(code))
+    return b"".join(parts)
+
+
+def is_fresh(header, st, read_source, options=""):
+    if header.lang_version != LANG_VERSION or header.options != options:
+        return False
+    if header.size != st.st_size:
+        return False
+    if header.flags & FLAG_HASH:
+        import hashlib
+        
+        return hashlib.sha256(read_source()).digest() == header.digest
+    return header.mtime_ns == st.st_mtime_ns
+
+
+def read_file(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def write_atomic(path, data, mode=0o666):
+    directory = os.path.dirname(path) or "."
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.urandom(4).hex()}.tmp")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), mode & 0o666)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        return False
+
+
+def compile_file(path, cache_dir=None, validate=VALIDATE_MTIME, write=True, optimize=DEFAULT_LEVEL,
+                 checkpoints=False):
+    options = f"O{optimize}" + ("+steps" if checkpoints else "")
+    st = os.stat(path)
+    source_bytes = None
+    
+    def read_source():
+        nonlocal source_bytes
+        if source_bytes is None:
+            with open(path, "rb") as f:
+                source_bytes = f.read()
+        return source_bytes
+    
+    target = cache_path(path, cache_dir)
+    data = read_file(target)
+    if data is not None:
+        header = CacheHeader.read(data)
+        if header is not None and is_fresh(header, st, read_source, options):
+            try:
+                return marshal.loads(memoryview(data)[header.offset:])
+            except (EOFError, ValueError, TypeError):
+                pass
+    
+    from .compiler import compile_source
+    
+    source = read_source().decode("utf-8")
+    code = compile_source(source, path, cache=None, optimize=optimize, checkpoints=checkpoints)
+    if write:
+        import hashlib
+        
+        digest = hashlib.sha256(source_bytes).digest() if validate == VALIDATE_HASH else None
+        write_atomic(target, pack(code, path, st, digest, options), st.st_mode | 0o200)
+    return code
+
+
+def iter_cache_files(root):
+    directories = [root]
+    for directory, dirnames, filenames in os.walk(root):
+        if CACHE_DIRNAME in dirnames:
+            directories.append(os.path.join(directory, CACHE_DIRNAME))
+    
+    for directory in dict.fromkeys(directories):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if name.endswith(SUFFIX):
+                yield os.path.join(directory, name)
+
+
+def prune(root, dry_run=False):
+    removed = []
+    for cache_file in iter_cache_files(root):
+        data = read_file(cache_file)
+        header = CacheHeader.read(data) if data is not None else None
+        stale = header is None or header.lang_version != LANG_VERSION
+        if not stale:
+            try:
+                st = os.stat(header.source_path)
+            except OSError:
+                stale = True
+            else:
+                stale = not is_fresh(header, st, lambda: read_file(header.source_path) or b"", header.options)
+        if stale:
+            if not dry_run:
+                try:
+                    os.unlink(cache_file)
+                except OSError:
+                    continue
+            removed.append(cache_file)
+    return removed
+
@@ -0,0 +1,293 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import ast
+import hashlib
+import keyword
+import threading
+from collections import OrderedDict
+
+from . import nodes
+from .optimizer import DEFAULT_LEVEL, optimize as optimize_program
+from .parser import parse
+
+BINARY_OPS = {
+    "+": ast.Add, "-": ast.Sub, "*": ast.Mult, "/": ast.Div,
+    "%": ast.Mod, "**": ast.Pow
+}
+COMPARE_OPS = {
+    "==": ast.Eq, "!=": ast.NotEq, "<": ast.Lt,
+    ">": ast.Gt, "<=": ast.LtE, ">=": ast.GtE
+}
+UNARY_OPS = {"-": ast.USub, "+": ast.UAdd, "!": ast.Not}
+DEFAULTS = {"int": 0, "float": 0.0, "string": "", "bool": False}
+
+
+def py_name(name):
+    if keyword.iskeyword(name) or keyword.issoftkeyword(name):
+        return f"__k_{name}"
+    return name
+
+
+class Compiler:
+    def __init__(self, filename="<cmm>", checkpoints=False):
+        self.filename = filename
+        self.checkpoints = checkpoints
+        self.loops = []
+        self.global_names = set()
+        self.range_count = 0
+    
+    def at(self, node, source):
+        node.lineno = node.end_lineno = source.line or 1
+        node.col_offset = node.end_col_offset = max(source.col - 1, 0)
+        return node
+    
+    def compile(self, program):
+        functions = [item for item in program.body if type(item) is nodes.FuncDef]
+        statements = [item for item in program.body if type(item) is not nodes.FuncDef]
+        self.global_names = nodes.assigned_names(statements) | {item.name for item in functions}
+        
+        body = [self.function(item) for item in functions]
+        body.extend(self.block(statements))
+        module = ast.Module(body=body, type_ignores=[])
+        ast.fix_missing_locations(module)
+        return compile(module, self.filename, "exec")
+    
+    def function(self, definition):
+        local_names = set(definition.params) | nodes.assigned_names(definition.body, declared_only=True)
+        shared = sorted(
+            name for name in nodes.assigned_names(definition.body) - local_names
+            if name in self.global_names
+        )
+        
+        outer, self.loops = self.loops, []
+        body = self.block(definition.body)
+        self.loops = outer
+        if shared:
+            body.insert(0, self.at(ast.Global(names=[py_name(name) for name in shared]), definition))
+        
+        args = ast.arguments(
+            posonlyargs=[], args=[ast.arg(arg=py_name(param)) for param in definition.params],
+            vararg=None, kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[]
+        )
+        function = ast.FunctionDef(
+            name=py_name(definition.name), args=args, body=body, decorator_list=[], returns=None
+        )
+        if "type_params" in ast.FunctionDef._fields:
+            function.type_params = []
+        return self.at(function, definition)
+    
+    def block(self, statements):
+        body = []
+        for stmt in statements:
+            body.extend(self.statement(stmt))
+        return body or [ast.Pass()]
+    
+    def statement(self, stmt):
+        kind = type(stmt)
+        if kind is nodes.ExprStmt:
+            return [self.at(ast.Expr(value=self.expr(stmt.expr)), stmt)]
+        if kind is nodes.Assign:
+            return [self.assign(stmt)]
+        if kind is nodes.Decl:
+            value = self.expr(stmt.value) if stmt.value is not None else self.at(
+                ast.Constant(value=DEFAULTS.get(stmt.type)), stmt
+            )
+            target = self.at(ast.Name(id=py_name(stmt.name), ctx=ast.Store()), stmt)
+            return [self.at(ast.Assign(targets=[target], value=value), stmt)]
+        if kind is nodes.If:
+            return [self.at(ast.If(
+                test=self.expr(stmt.test), body=self.block(stmt.body),
+                orelse=self.block(stmt.orelse) if stmt.orelse else []
+            ), stmt)]
+        if kind is nodes.While:
+            return [self.loop(stmt, self.expr(stmt.test), stmt.body, None)]
+        if kind is nodes.For:
+            return self.for_loop(stmt)
+        if kind is nodes.RangeFor:
+            return self.range_loop(stmt)
+        if kind is nodes.Block:
+            return [item for child in stmt.body for item in self.statement(child)]
+        if kind is nodes.Break:
+            return [self.at(ast.Break(), stmt)]
+        if kind is nodes.Continue:
+            step = self.loops[-1]
+            return (self.statement(step) if step is not None else []) + [self.at(ast.Continue(), stmt)]
+        if kind is nodes.Return:
+            value = None if stmt.value is None else self.expr(stmt.value)
+            return [self.at(ast.Return(value=value), stmt)]
+        raise TypeError(f"cannot compile {kind.__name__}")
+    
+    def checkpoint(self, stmt):
+        call = ast.Call(func=self.at(ast.Name(id="__cmm_step", ctx=ast.Load()), stmt), args=[], keywords=[])
+        return self.at(ast.Expr(value=self.at(call, stmt)), stmt)
+    
+    def loop(self, stmt, test, body, step):
+        self.loops.append(step)
+        compiled = self.block(body)
+        self.loops.pop()
+        if self.checkpoints:
+            compiled.insert(0, self.checkpoint(stmt))
+        if step is not None:
+            compiled.extend(self.statement(step))
+        return self.at(ast.While(test=test, body=compiled, orelse=[]), stmt)
+    
+    def for_loop(self, stmt):
+        result = self.statement(stmt.init) if stmt.init is not None else []
+        test = self.expr(stmt.test) if stmt.test is not None else self.at(ast.Constant(value=True), stmt)
+        result.append(self.loop(stmt, test, stmt.body, stmt.step))
+        return result
+    
+    def range_loop(self, stmt):
+        self.range_count += 1
+        stop = f"__cmm_stop{self.range_count}"
+        var = py_name(stmt.var)
+        result = self.statement(stmt.init) if stmt.init is not None else []
+        result.append(self.at(ast.Assign(
+            targets=[self.at(ast.Name(id=stop, ctx=ast.Store()), stmt)], value=self.expr(stmt.stop)
+        ), stmt))
+        
+        self.loops.append(None)
+        body = self.block(stmt.body)
+        self.loops.pop()
+        if self.checkpoints:
+            body.insert(0, self.checkpoint(stmt))
+        iterator = self.at(ast.Call(
+            func=self.at(ast.Name(id="__cmm_range", ctx=ast.Load()), stmt),
+            args=[
+                self.at(ast.Name(id=var, ctx=ast.Load()), stmt),
+                self.at(ast.Name(id=stop, ctx=ast.Load()), stmt),
+                self.at(ast.Constant(value=stmt.step), stmt),
+                self.at(ast.Constant(value=stmt.op), stmt)
+            ], keywords=[]
+        ), stmt)
+        finish = self.at(ast.If(
+            test=self.at(ast.Compare(
+                left=self.at(ast.Name(id=var, ctx=ast.Load()), stmt), ops=[COMPARE_OPS[stmt.op]()],
+                comparators=[self.at(ast.Name(id=stop, ctx=ast.Load()), stmt)]
+            ), stmt),
+            body=[self.at(ast.AugAssign(
+                target=self.at(ast.Name(id=var, ctx=ast.Store()), stmt), op=ast.Add(),
+                value=self.at(ast.Constant(value=stmt.step), stmt)
+            ), stmt)],
+            orelse=[]
+        ), stmt)
+        result.append(self.at(ast.For(
+            target=self.at(ast.Name(id=var, ctx=ast.Store()), stmt), iter=iterator,
+            body=body, orelse=[finish]
+        ), stmt))
+        return result
+    
+    def assign(self, stmt):
+        target = self.target(stmt.target)
+        value = self.expr(stmt.value)
+        if stmt.op is None:
+            return self.at(ast.Assign(targets=[target], value=value), stmt)
+        return self.at(ast.AugAssign(target=target, op=BINARY_OPS[stmt.op](), value=value), stmt)
+    
+    def target(self, expr):
+        if type(expr) is nodes.Name:
+            return self.at(ast.Name(id=py_name(expr.id), ctx=ast.Store()), expr)
+        return self.at(ast.Subscript(
+            value=self.expr(expr.obj), slice=self.expr(expr.index), ctx=ast.Store()
+        ), expr)
+    
+    def expr(self, expr):
+        kind = type(expr)
+        if kind is nodes.Const:
+            return self.at(ast.Constant(value=expr.value), expr)
+        if kind is nodes.Name:
+            return self.at(ast.Name(id=py_name(expr.id), ctx=ast.Load()), expr)
+        if kind is nodes.BinOp:
+            return self.at(ast.BinOp(
+                left=self.expr(expr.left), op=BINARY_OPS[expr.op](), right=self.expr(expr.right)
+            ), expr)
+        if kind is nodes.Compare:
+            return self.at(ast.Compare(
+                left=self.expr(expr.left), ops=[COMPARE_OPS[expr.op]()], comparators=[self.expr(expr.right)]
+            ), expr)
+        if kind is nodes.Logic:
+            op = ast.And() if expr.op == "&&" else ast.Or()
+            return self.at(ast.BoolOp(op=op, values=[self.expr(expr.left), self.expr(expr.right)]), expr)
+        if kind is nodes.Unary:
+            return self.at(ast.UnaryOp(op=UNARY_OPS[expr.op](), operand=self.expr(expr.operand)), expr)
+        if kind is nodes.Call:
+            return self.at(ast.Call(
+                func=self.expr(expr.func), args=[self.expr(arg) for arg in expr.args], keywords=[]
+            ), expr)
+        if kind is nodes.Index:
+            return self.at(ast.Subscript(
+                value=self.expr(expr.obj), slice=self.expr(expr.index), ctx=ast.Load()
+            ), expr)
+        if kind is nodes.Attr:
+            return self.at(ast.Attribute(value=self.expr(expr.obj), attr=expr.name, ctx=ast.Load()), expr)
+        if kind is nodes.ListExpr:
+            return self.at(ast.List(elts=[self.expr(item) for item in expr.items], ctx=ast.Load()), expr)
+        raise TypeError(f"cannot compile {kind.__name__}")
+
+
+def source_hash(source):
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class CompileCache:
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            code = self.entries.get(key)
+            if code is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return code
+    
+    def put(self, key, code):
+        with self.lock:
+            self.entries[key] = code
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+default_cache = CompileCache()
+
+
+def compile_program(program, filename="<cmm>", optimize=DEFAULT_LEVEL, checkpoints=False):
+    return Compiler(filename, checkpoints).compile(optimize_program(program, optimize))
+
+
+def compile_source(source, filename="<cmm>", cache=default_cache, optimize=DEFAULT_LEVEL, checkpoints=False):
+    key = (source_hash(source), filename, optimize, checkpoints)
+    if cache is not None:
+        code = cache.get(key)
+        if code is not None:
+            return code
+    code = compile_program(parse(source, filename), filename, optimize, checkpoints)
+    if cache is not None:
+        cache.put(key, code)
+    return code
@@ -0,0 +1,52 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+class CmmError(Exception):
+    def __init__(self, message, line=None, col=None, filename=None):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+        self.col = col
+        self.filename = filename
+    
+    def location(self):
+        parts = []
+        if self.filename:
+            parts.append(self.filename)
+        if self.line is not None:
+            parts.append(f"line {self.line}")
+        if self.col is not None:
+            parts.append(f"column {self.col}")
+        return ", ".join(parts)
+    
+    def __str__(self):
+        location = self.location()
+        return f"{location}: {self.message}" if location else self.message
+
+
+class CmmSyntaxError(CmmError):
+    pass
+
+
+class CmmRuntimeError(CmmError):
+    pass
+
+
+class CmmLimitError(CmmRuntimeError):
+    def __init__(self, message, reason, line=None, filename=None):
+        super().__init__(message, line, filename=filename)
+        self.reason = reason
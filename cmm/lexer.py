@@ -0,0 +1,108 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import re
+
+from .errors import CmmSyntaxError
+
+KEYWORDS = frozenset((
+    "if", "else", "for", "while", "break", "continue", "return",
+    "true", "false", "null"
+))
+TYPES = frozenset(("int", "float", "string", "bool", "var", "void"))
+
+OPERATORS = (
+    "**=", "&&", "||", "==", "!=", "<=", ">=", "++", "--", "+=", "-=",
+    "*=", "/=", "%=", "**", "+", "-", "*", "/", "%", "<", ">", "=", "!",
+    "(", ")", "{", "}", "[", "]", ",", ";", "."
+)
+
+ESCAPES = {
+    "n": "\n", "t": "\t", "r": "\r", "0": "\0", "\\": "\\",
+    "\"": "\"", "'": "'", "a": "\a", "b": "\b", "f": "\f", "v": "\v"
+}
+
+TOKEN_RE = re.compile(r"""
+    (?P<ws>[ \t\r\f\v]+)
+  | (?P<nl>\n)
+  | (?P<comment>//[^\n]*|/\*(?:[^*]|\*(?!/))*\*/)
+  | (?P<num>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<str>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<open>/\*)
+  | (?P<op>""" + "|".join(re.escape(op) for op in OPERATORS) + r""")
+  | (?P<error>.)
+""", re.VERBOSE)
+
+ESCAPE_RE = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|.)")
+
+
+def unescape(body, line, col):
+    def replace(match):
+        code = match.group(1)
+        if code[0] in "xu" and len(code) > 1:
+            return chr(int(code[1:], 16))
+        try:
+            return ESCAPES[code]
+        except KeyError:
+            raise CmmSyntaxError(f"unknown escape sequence '\\{code}'", line, col + match.start() + 1)
+    
+    return ESCAPE_RE.sub(replace, body) if "\\" in body else body
+
+
+def tokenize(source):
+    tokens = []
+    append = tokens.append
+    line = 1
+    line_start = 0
+    
+    for match in TOKEN_RE.finditer(source):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "ws":
+            continue
+        if kind == "nl":
+            line += 1
+            line_start = match.end()
+            continue
+        
+        col = match.start() - line_start + 1
+        if kind == "comment":
+            newlines = value.count("\n")
+            if newlines:
+                line += newlines
+                line_start = match.start() + value.rfind("\n") + 1
+            continue
+        if kind == "name":
+            if value in KEYWORDS:
+                kind = "kw"
+            elif value in TYPES:
+                kind = "type"
+        elif kind == "num":
+            value = float(value) if value.strip("0123456789") else int(value)
+        elif kind == "str":
+            value = unescape(value[1:-1], line, col)
+        elif kind == "open":
+            raise CmmSyntaxError("unterminated comment", line, col)
+        elif kind == "error":
+            if value in "\"'":
+                raise CmmSyntaxError("unterminated string literal", line, col)
+            raise CmmSyntaxError(f"unexpected character {value!r}", line, col)
+        append((kind, value, line, col))
+    
+    append(("eof", None, line, len(source) - line_start + 1))
+    return tokens
@@ -0,0 +1,208 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import sys
+import threading
+import time
+
+CANCELLED = "cancelled"
+STEP_LIMIT = "steps"
+TIME_LIMIT = "timeout"
+MEMORY_LIMIT = "memory"
+
+
+class Interrupt(BaseException):
+    pass
+
+
+class Limits:
+    def __init__(self, max_steps=None, timeout=None, max_memory=None):
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_memory = max_memory
+    
+    def __repr__(self):
+        return f"Limits(max_steps={self.max_steps!r}, timeout={self.timeout!r}, max_memory={self.max_memory!r})"
+
+
+def process_counters():
+    import ctypes
+    
+    class Counters(ctypes.Structure):
+        _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + [
+            (name, ctypes.c_size_t) for name in (
+                "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                "PagefileUsage", "PeakPagefileUsage"
+            )
+        ]
+    
+    counters = Counters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if ctypes.windll.kernel32.K32GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return counters
+    return None
+
+
+def current_memory():
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "rb") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        counters = process_counters()
+        return counters and counters.WorkingSetSize
+    return None
+
+
+def reset_peak_memory():
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            return True
+        except OSError:
+            pass
+    return False
+
+
+def peak_memory():
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/status", "rb") as f:
+                for line in f:
+                    if line.startswith(b"VmHWM:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+    if sys.platform == "win32":
+        counters = process_counters()
+        return counters and counters.PeakWorkingSetSize
+    try:
+        import resource
+    except ImportError:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def set_async_exception(thread_id, exception):
+    import ctypes
+    
+    exception = None if exception is None else ctypes.py_object(exception)
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), exception)
+
+
+class Supervisor:
+    def __init__(self, limits=None, poll_interval=0.05):
+        self.limits = limits or Limits()
+        self.poll_interval = poll_interval
+        self.reason = None
+        self.thread_id = None
+        self.running = False
+        self.posted = False
+        self.started_at = None
+        self.elapsed = 0.0
+        self.memory_base = None
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+    
+    def step_counter(self):
+        remaining = self.limits.max_steps
+        
+        def step():
+            nonlocal remaining
+            remaining -= 1
+            if remaining < 0:
+                self.reason = STEP_LIMIT
+                raise Interrupt
+        
+        return step
+    
+    def start(self):
+        self.thread_id = threading.get_ident()
+        self.started_at = time.perf_counter()
+        with self.lock:
+            self.running = True
+            pending = self.reason
+        if pending is not None:
+            raise Interrupt
+        
+        if self.limits.max_memory is not None:
+            self.memory_base = current_memory()
+        if self.limits.timeout is not None or self.memory_base is not None:
+            threading.Thread(target=self.watch, name="cmm-watchdog", daemon=True).start()
+    
+    def finish(self):
+        with self.lock:
+            self.running = False
+            posted = self.posted
+        if posted:
+            # Let an Interrupt that was posted but not yet raised fire here instead of in the caller.
+            try:
+                for _ in range(2):
+                    pass
+            except Interrupt:
+                pass
+        self.finished.set()
+        self.elapsed = time.perf_counter() - self.started_at
+    
+    def remaining(self):
+        if self.limits.timeout is None:
+            return None
+        return max(self.limits.timeout - (time.perf_counter() - self.started_at), 0.0)
+    
+    def expire(self):
+        with self.lock:
+            if self.reason is None:
+                self.reason = TIME_LIMIT
+        raise Interrupt
+    
+    def interrupt(self, reason=CANCELLED):
+        with self.lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            if self.running:
+                set_async_exception(self.thread_id, Interrupt)
+                self.posted = True
+    
+    def watch(self):
+        limits = self.limits
+        while not self.finished.wait(self.poll_interval):
+            if limits.timeout is not None and time.perf_counter() - self.started_at > limits.timeout:
+                self.interrupt(TIME_LIMIT)
+            elif self.memory_base is not None:
+                memory = current_memory()
+                if memory is not None and memory - self.memory_base > limits.max_memory:
+                    self.interrupt(MEMORY_LIMIT)
+            if self.reason is not None:
+                return
+    
+    def describe(self):
+        limits = self.limits
+        if self.reason == STEP_LIMIT:
+            return f"step limit exceeded ({limits.max_steps} loop iterations)"
+        if self.reason == TIME_LIMIT:
+            return f"time limit exceeded ({limits.timeout:g} s)"
+        if self.reason == MEMORY_LIMIT:
+            return f"memory limit exceeded ({limits.max_memory // (1 << 20)} MiB)"
+        return "execution cancelled"
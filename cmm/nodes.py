@@ -0,0 +1,94 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+class Node:
+    __slots__ = ("line", "col")
+    fields = ()
+    
+    def __init__(self, *args, line=0, col=0):
+        for name, value in zip(self.fields, args):
+            setattr(self, name, value)
+        self.line = line
+        self.col = col
+    
+    def __repr__(self):
+        args = ", ".join(repr(getattr(self, name)) for name in self.fields)
+        return f"{type(self).__name__}({args})"
+
+
+def node(name, *fields):
+    return type(name, (Node,), {"__slots__": fields, "fields": fields})
+
+
+Program = node("Program", "body")
+FuncDef = node("FuncDef", "name", "params", "body", "type")
+
+Block = node("Block", "body")
+If = node("If", "test", "body", "orelse")
+While = node("While", "test", "body")
+For = node("For", "init", "test", "step", "body")
+RangeFor = node("RangeFor", "init", "var", "op", "stop", "step", "body")
+Break = node("Break")
+Continue = node("Continue")
+Return = node("Return", "value")
+Decl = node("Decl", "type", "name", "value")
+Assign = node("Assign", "target", "op", "value")
+ExprStmt = node("ExprStmt", "expr")
+
+Const = node("Const", "value")
+Name = node("Name", "id")
+ListExpr = node("ListExpr", "items")
+Index = node("Index", "obj", "index")
+Attr = node("Attr", "obj", "name")
+Call = node("Call", "func", "args")
+BinOp = node("BinOp", "op", "left", "right")
+Compare = node("Compare", "op", "left", "right")
+Logic = node("Logic", "op", "left", "right")
+Unary = node("Unary", "op", "operand")
+
+
+def iter_children(item):
+    for name in item.fields:
+        value = getattr(item, name)
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, list):
+            for child in value:
+                if isinstance(child, Node):
+                    yield child
+
+
+def walk(item):
+    stack = [item]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(iter_children(current))
+
+
+def assigned_names(body, declared_only=False):
+    names = set()
+    for item in body:
+        for child in walk(item):
+            kind = type(child)
+            if kind is Decl:
+                names.add(child.name)
+            elif kind is Assign and not declared_only and type(child.target) is Name:
+                names.add(child.target.id)
+            elif kind is RangeFor and not declared_only:
+                names.add(child.var)
+    return names
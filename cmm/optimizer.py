@@ -0,0 +1,375 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import operator
+
+from . import nodes
+
+O0, O1, O2 = 0, 1, 2
+DEFAULT_LEVEL = O2
+
+FOLD_OPS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul,
+    "/": operator.truediv, "%": operator.mod, "**": operator.pow,
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt,
+    ">": operator.gt, "<=": operator.le, ">=": operator.ge
+}
+SAFE_OPS = frozenset(("+", "-", "*", "==", "!=", "<", ">", "<=", ">="))
+NUMERIC_OPS = frozenset(("+", "-", "*", "/", "%", "**"))
+NUMERIC_CALLS = frozenset(("int", "float", "bool", "len", "abs", "round"))
+NUMERIC_TYPES = frozenset(("int", "float", "bool"))
+RANGE_OPS = {"<": 1, "<=": 1, ">": -1, ">=": -1}
+MAX_FOLDED_LENGTH = 1024
+MAX_FOLDED_BITS = 4096
+TERMINATORS = (nodes.Return, nodes.Break, nodes.Continue)
+HOISTABLE_NODES = (nodes.BinOp, nodes.Compare, nodes.Logic, nodes.Unary)
+INVARIANT_NODES = (nodes.Const, nodes.Name) + HOISTABLE_NODES
+
+
+def is_number(value):
+    return type(value) in (int, float, bool)
+
+
+def fold_value(op, left, right):
+    if op == "**" and not (is_number(left) and is_number(right) and abs(right) <= 256):
+        return None
+    if op == "*" and (isinstance(left, (str, list)) or isinstance(right, (str, list))):
+        size = len(left) * right if isinstance(left, (str, list)) else len(right) * left
+        if not isinstance(size, int) or size > MAX_FOLDED_LENGTH:
+            return None
+    try:
+        value = FOLD_OPS[op](left, right)
+    except Exception:
+        return None
+    if type(value) is int and value.bit_length() > MAX_FOLDED_BITS:
+        return None
+    return (value,)
+
+
+def expr_key(expr):
+    kind = type(expr)
+    if kind is nodes.Const:
+        return ("const", type(expr.value), expr.value)
+    if kind is nodes.Name:
+        return ("name", expr.id)
+    if kind is nodes.Unary:
+        return ("unary", expr.op, expr_key(expr.operand))
+    return (kind.__name__, expr.op, expr_key(expr.left), expr_key(expr.right))
+
+
+class Optimizer:
+    def __init__(self, level=DEFAULT_LEVEL):
+        self.level = level
+        self.temp_count = 0
+        self.function_globals = set()
+        self.rebound = set()
+    
+    def optimize(self, program):
+        if self.level <= O0:
+            return program
+        
+        for item in program.body:
+            if type(item) is nodes.FuncDef:
+                item.body = self.block(item.body)
+        program.body = self.block(program.body)
+        
+        if self.level >= O2:
+            self.loop_pass(program)
+        return program
+    
+    def block(self, statements):
+        result = []
+        for stmt in statements:
+            if type(stmt) is nodes.FuncDef:
+                result.append(stmt)
+                continue
+            result.extend(self.statement(stmt))
+            if result and isinstance(result[-1], TERMINATORS):
+                break
+        return result
+    
+    def statement(self, stmt):
+        kind = type(stmt)
+        if kind is nodes.ExprStmt:
+            stmt.expr = self.fold(stmt.expr)
+            if type(stmt.expr) is nodes.Const:
+                return []
+        elif kind is nodes.Assign:
+            stmt.value = self.fold(stmt.value)
+            if type(stmt.target) is nodes.Index:
+                stmt.target.obj = self.fold(stmt.target.obj)
+                stmt.target.index = self.fold(stmt.target.index)
+        elif kind is nodes.Decl:
+            if stmt.value is not None:
+                stmt.value = self.fold(stmt.value)
+        elif kind is nodes.Return:
+            if stmt.value is not None:
+                stmt.value = self.fold(stmt.value)
+        elif kind is nodes.Block:
+            return self.block(stmt.body)
+        elif kind is nodes.If:
+            stmt.test = self.fold(stmt.test)
+            if type(stmt.test) is nodes.Const:
+                return self.block(stmt.body if stmt.test.value else stmt.orelse)
+            stmt.body = self.block(stmt.body)
+            stmt.orelse = self.block(stmt.orelse)
+        elif kind is nodes.While:
+            stmt.test = self.fold(stmt.test)
+            if type(stmt.test) is nodes.Const and not stmt.test.value:
+                return []
+            stmt.body = self.block(stmt.body)
+        elif kind is nodes.For:
+            init = self.statement(stmt.init) if stmt.init is not None else []
+            stmt.init = init[0] if len(init) == 1 else (nodes.Block(init, line=stmt.line, col=stmt.col) if init else None)
+            if stmt.test is not None:
+                stmt.test = self.fold(stmt.test)
+                if type(stmt.test) is nodes.Const:
+                    if not stmt.test.value:
+                        return init
+                    stmt.test = None
+            if stmt.step is not None:
+                step = self.statement(stmt.step)
+                stmt.step = step[0] if step else None
+            stmt.body = self.block(stmt.body)
+        return [stmt]
+    
+    def fold(self, expr):
+        kind = type(expr)
+        if kind is nodes.BinOp or kind is nodes.Compare:
+            expr.left = self.fold(expr.left)
+            expr.right = self.fold(expr.right)
+            if type(expr.left) is nodes.Const and type(expr.right) is nodes.Const:
+                folded = fold_value(expr.op, expr.left.value, expr.right.value)
+                if folded is not None:
+                    return nodes.Const(folded[0], line=expr.line, col=expr.col)
+        elif kind is nodes.Unary:
+            expr.operand = self.fold(expr.operand)
+            if type(expr.operand) is nodes.Const:
+                value = expr.operand.value
+                if expr.op == "!":
+                    return nodes.Const(not value, line=expr.line, col=expr.col)
+                if is_number(value):
+                    return nodes.Const(-value if expr.op == "-" else +value, line=expr.line, col=expr.col)
+        elif kind is nodes.Logic:
+            expr.left = self.fold(expr.left)
+            expr.right = self.fold(expr.right)
+            if type(expr.left) is nodes.Const:
+                if bool(expr.left.value) == (expr.op == "&&"):
+                    return expr.right
+                return expr.left
+        elif kind is nodes.Call:
+            expr.func = self.fold(expr.func)
+            expr.args = [self.fold(arg) for arg in expr.args]
+        elif kind is nodes.Index:
+            expr.obj = self.fold(expr.obj)
+            expr.index = self.fold(expr.index)
+        elif kind is nodes.Attr:
+            expr.obj = self.fold(expr.obj)
+        elif kind is nodes.ListExpr:
+            expr.items = [self.fold(item) for item in expr.items]
+        return expr
+    
+    def loop_pass(self, program):
+        functions = [item for item in program.body if type(item) is nodes.FuncDef]
+        statements = [item for item in program.body if type(item) is not nodes.FuncDef]
+        global_names = nodes.assigned_names(statements) | {item.name for item in functions}
+        self.rebound = global_names | {name for item in functions for name in nodes.assigned_names(item.body)}
+        
+        for item in functions:
+            local_names = set(item.params) | nodes.assigned_names(item.body, declared_only=True)
+            self.function_globals |= (nodes.assigned_names(item.body) - local_names) & global_names
+        for item in functions:
+            local_names = set(item.params) | nodes.assigned_names(item.body, declared_only=True)
+            numeric = self.infer_numeric([item.body], local_names, set(item.params))
+            item.body = self.loops(item.body, numeric, set(item.params))
+        
+        numeric = self.infer_numeric([statements] + [item.body for item in functions], global_names, set())
+        program.body = functions + self.loops(statements, numeric, set())
+    
+    def infer_numeric(self, bodies, names, unknown):
+        assignments = {name: [] for name in names}
+        for body in bodies:
+            for item in body:
+                for child in nodes.walk(item):
+                    kind = type(child)
+                    if kind is nodes.Decl and child.name in assignments:
+                        if child.type in NUMERIC_TYPES or child.type == "var":
+                            default = nodes.Const(0 if child.type != "var" else None)
+                            assignments[child.name].append(child.value if child.value is not None else default)
+                        else:
+                            assignments[child.name].append(None)
+                    elif kind is nodes.Assign and type(child.target) is nodes.Name and child.target.id in assignments:
+                        if child.op is None:
+                            assignments[child.target.id].append(child.value)
+                        else:
+                            assignments[child.target.id].append(nodes.BinOp(child.op, child.target, child.value))
+                    elif kind is nodes.RangeFor and child.var in assignments:
+                        assignments[child.var].append(nodes.Name(child.var))
+        
+        numeric = set(assignments) - unknown
+        changed = True
+        while changed:
+            changed = False
+            for name in list(numeric):
+                if not all(value is not None and self.is_numeric(value, numeric) for value in assignments[name]):
+                    numeric.discard(name)
+                    changed = True
+        return numeric
+    
+    def is_numeric(self, expr, numeric):
+        kind = type(expr)
+        if kind is nodes.Const:
+            return is_number(expr.value)
+        if kind is nodes.Name:
+            return expr.id in numeric
+        if kind is nodes.BinOp:
+            return expr.op in NUMERIC_OPS and self.is_numeric(expr.left, numeric) and self.is_numeric(expr.right, numeric)
+        if kind is nodes.Compare:
+            return True
+        if kind is nodes.Unary:
+            return expr.op == "!" or self.is_numeric(expr.operand, numeric)
+        if kind is nodes.Logic:
+            return self.is_numeric(expr.left, numeric) and self.is_numeric(expr.right, numeric)
+        if kind is nodes.Call:
+            return (
+                type(expr.func) is nodes.Name and expr.func.id in NUMERIC_CALLS
+                and expr.func.id not in self.rebound
+            )
+        return False
+    
+    def loops(self, statements, numeric, defined):
+        defined = set(defined)
+        result = []
+        for stmt in statements:
+            result.extend(self.loop_statement(stmt, numeric, defined))
+            if type(stmt) is nodes.Decl:
+                defined.add(stmt.name)
+            elif type(stmt) is nodes.Assign and stmt.op is None and type(stmt.target) is nodes.Name:
+                defined.add(stmt.target.id)
+        return result
+    
+    def loop_statement(self, stmt, numeric, defined):
+        kind = type(stmt)
+        if kind is nodes.If:
+            stmt.body = self.loops(stmt.body, numeric, defined)
+            stmt.orelse = self.loops(stmt.orelse, numeric, defined)
+            return [stmt]
+        if kind is not nodes.While and kind is not nodes.For:
+            return [stmt]
+        
+        prelude = []
+        if kind is nodes.For and stmt.init is not None:
+            prelude.extend(self.loops([stmt.init], numeric, defined))
+            defined = defined | nodes.assigned_names([stmt.init], declared_only=True)
+            if type(stmt.init) is nodes.Assign and stmt.init.op is None and type(stmt.init.target) is nodes.Name:
+                defined.add(stmt.init.target.id)
+            stmt.init = None
+        stmt.body = self.loops(stmt.body, numeric, defined)
+        if kind is nodes.For:
+            stmt = self.range_loop(stmt)
+        prelude.extend(self.hoist(stmt, numeric, defined))
+        return prelude + [stmt]
+    
+    def loop_writes(self, stmt):
+        written = nodes.assigned_names([stmt])
+        if any(type(child) is nodes.Call for child in nodes.walk(stmt)):
+            written |= self.function_globals
+        return written
+    
+    def range_loop(self, stmt):
+        test, step = stmt.test, stmt.step
+        if (
+            type(test) is not nodes.Compare or test.op not in RANGE_OPS
+            or type(test.left) is not nodes.Name
+            or type(step) is not nodes.Assign or type(step.target) is not nodes.Name
+            or step.target.id != test.left.id or step.op not in ("+", "-")
+            or type(step.value) is not nodes.Const or type(step.value.value) is not int
+            or step.value.value == 0
+        ):
+            return stmt
+        
+        increment = step.value.value if step.op == "+" else -step.value.value
+        if (increment > 0) != (RANGE_OPS[test.op] > 0):
+            return stmt
+        
+        var = test.left.id
+        written = self.loop_writes(nodes.Block(stmt.body))
+        if var in written:
+            return stmt
+        for child in nodes.walk(test.right):
+            kind = type(child)
+            if kind is nodes.Name and (child.id in written or child.id == var):
+                return stmt
+            if kind not in INVARIANT_NODES:
+                return stmt
+        return nodes.RangeFor(None, var, test.op, test.right, increment, stmt.body, line=stmt.line, col=stmt.col)
+    
+    def hoist(self, stmt, numeric, defined):
+        written = self.loop_writes(stmt)
+        temps = {}
+        prelude = []
+        
+        def is_safe(expr):
+            kind = type(expr)
+            if kind is nodes.Const:
+                return is_number(expr.value)
+            if kind is nodes.Name:
+                return expr.id in numeric and expr.id in defined and expr.id not in written
+            if kind is nodes.BinOp or kind is nodes.Compare:
+                return expr.op in SAFE_OPS and is_safe(expr.left) and is_safe(expr.right)
+            if kind is nodes.Logic:
+                return is_safe(expr.left) and is_safe(expr.right)
+            if kind is nodes.Unary:
+                return is_safe(expr.operand)
+            return False
+        
+        def replace(expr):
+            kind = type(expr)
+            if kind is nodes.Const or kind is nodes.Name:
+                return expr
+            if kind in HOISTABLE_NODES and is_safe(expr) and any(
+                type(child) is nodes.Name for child in nodes.walk(expr)
+            ):
+                key = expr_key(expr)
+                if key not in temps:
+                    self.temp_count += 1
+                    temps[key] = f"__cmm_h{self.temp_count}"
+                    prelude.append(nodes.Decl("var", temps[key], expr, line=expr.line, col=expr.col))
+                return nodes.Name(temps[key], line=expr.line, col=expr.col)
+            for name in expr.fields:
+                value = getattr(expr, name)
+                if isinstance(value, nodes.Node):
+                    setattr(expr, name, replace(value))
+                elif isinstance(value, list):
+                    setattr(expr, name, [replace(item) if isinstance(item, nodes.Node) else item for item in value])
+            return expr
+        
+        for child in list(nodes.walk(stmt)):
+            kind = type(child)
+            if kind is nodes.ExprStmt:
+                child.expr = replace(child.expr)
+            elif kind in (nodes.Assign, nodes.Decl, nodes.Return) and child.value is not None:
+                child.value = replace(child.value)
+            elif kind in (nodes.If, nodes.While, nodes.For) and child.test is not None:
+                child.test = replace(child.test)
+            elif kind is nodes.RangeFor:
+                child.stop = replace(child.stop)
+        return prelude
+
+
+def optimize(program, level=DEFAULT_LEVEL):
+    return Optimizer(level).optimize(program)
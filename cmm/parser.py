@@ -0,0 +1,384 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from . import nodes
+from .errors import CmmSyntaxError
+from .lexer import tokenize
+
+BINARY_PRECEDENCE = {
+    "||": 1, "&&": 2,
+    "==": 3, "!=": 3,
+    "<": 4, ">": 4, "<=": 4, ">=": 4,
+    "+": 5, "-": 5,
+    "*": 6, "/": 6, "%": 6
+}
+COMPARISONS = frozenset(("==", "!=", "<", ">", "<=", ">="))
+ASSIGN_OPS = {"=": None, "+=": "+", "-=": "-", "*=": "*", "/=": "/", "%=": "%", "**=": "**"}
+STEP_OPS = {"++": "+", "--": "-"}
+CONSTANTS = {"true": True, "false": False, "null": None}
+
+
+def describe(token):
+    kind, value = token[0], token[1]
+    if kind == "eof":
+        return "end of file"
+    if kind == "str":
+        return "string literal"
+    if kind == "num":
+        return f"number {value}"
+    return f"'{value}'"
+
+
+class Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.last_line = 1
+        self.loop_depth = 0
+        self.in_function = False
+    
+    def peek(self, offset=0):
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+    
+    def advance(self):
+        token = self.tokens[self.pos]
+        if token[0] != "eof":
+            self.pos += 1
+        self.last_line = token[2]
+        return token
+    
+    def error(self, message, token=None):
+        token = token or self.peek()
+        return CmmSyntaxError(message, token[2], token[3])
+    
+    def at_op(self, op):
+        token = self.tokens[self.pos]
+        return token[0] == "op" and token[1] == op
+    
+    def accept_op(self, op):
+        if self.at_op(op):
+            return self.advance()
+        return None
+    
+    def expect_op(self, op):
+        if self.at_op(op):
+            return self.advance()
+        raise self.error(f"expected '{op}' but found {describe(self.peek())}")
+    
+    def expect_separator(self, closing):
+        if not self.accept_op(","):
+            raise self.error(f"expected ',' or '{closing}' but found {describe(self.peek())}")
+    
+    def expect_name(self):
+        token = self.peek()
+        if token[0] != "name":
+            raise self.error(f"expected a name but found {describe(token)}")
+        if token[1].startswith("__"):
+            raise self.error(f"names starting with '__' are reserved: '{token[1]}'")
+        return self.advance()
+    
+    def end_statement(self):
+        if self.accept_op(";"):
+            return
+        token = self.peek()
+        if token[0] == "eof" or (token[0] == "op" and token[1] == "}") or token[2] > self.last_line:
+            return
+        raise self.error(f"expected ';' but found {describe(token)}")
+    
+    def parse_program(self):
+        body = []
+        while self.peek()[0] != "eof":
+            token = self.peek()
+            if token[0] == "type" and self.peek(1)[0] == "name" and self.peek(2)[:2] == ("op", "("):
+                body.append(self.function())
+            else:
+                body.append(self.statement())
+        return nodes.Program(body, line=1, col=1)
+    
+    def function(self):
+        type_token = self.advance()
+        name = self.expect_name()
+        self.expect_op("(")
+        params = []
+        if self.peek()[:2] == ("type", "void") and self.peek(1)[:2] == ("op", ")"):
+            self.advance()
+        while not self.at_op(")"):
+            if params:
+                self.expect_separator(")")
+            if self.peek()[0] != "type":
+                raise self.error(f"expected a parameter type but found {describe(self.peek())}")
+            self.advance()
+            param = self.expect_name()[1]
+            if param in params:
+                raise self.error(f"duplicate parameter '{param}'")
+            params.append(param)
+        self.expect_op(")")
+        
+        outer = (self.loop_depth, self.in_function)
+        self.loop_depth, self.in_function = 0, True
+        body = self.block()
+        self.loop_depth, self.in_function = outer
+        return nodes.FuncDef(name[1], params, body, type_token[1], line=type_token[2], col=type_token[3])
+    
+    def block(self):
+        self.expect_op("{")
+        body = []
+        while not self.at_op("}"):
+            if self.peek()[0] == "eof":
+                raise self.error("expected '}' but found end of file")
+            body.append(self.statement())
+        self.advance()
+        return body
+    
+    def body(self):
+        if self.at_op("{"):
+            return self.block()
+        return [self.statement()]
+    
+    def statement(self):
+        token = self.peek()
+        kind, value = token[0], token[1]
+        
+        if kind == "kw":
+            if value == "if":
+                return self.if_statement()
+            if value == "while":
+                return self.while_statement()
+            if value == "for":
+                return self.for_statement()
+            if value in ("break", "continue"):
+                if not self.loop_depth:
+                    raise self.error(f"'{value}' outside of a loop")
+                self.advance()
+                self.end_statement()
+                node_type = nodes.Break if value == "break" else nodes.Continue
+                return node_type(line=token[2], col=token[3])
+            if value == "return":
+                if not self.in_function:
+                    raise self.error("'return' outside of a function")
+                self.advance()
+                result = None
+                next_token = self.peek()
+                if not (next_token[:2] in (("op", ";"), ("op", "}")) or next_token[0] == "eof"
+                        or next_token[2] > token[2]):
+                    result = self.expression()
+                self.end_statement()
+                return nodes.Return(result, line=token[2], col=token[3])
+        elif kind == "type" and self.peek(1)[0] == "name":
+            if self.peek(2)[:2] == ("op", "("):
+                raise self.error("functions can only be defined at the top level")
+            result = self.declaration()
+            self.end_statement()
+            return result
+        elif kind == "op" and value == "{":
+            return nodes.Block(self.block(), line=token[2], col=token[3])
+        elif kind == "op" and value == ";":
+            self.advance()
+            return nodes.Block([], line=token[2], col=token[3])
+        
+        result = self.simple_statement()
+        self.end_statement()
+        return result
+    
+    def if_statement(self):
+        token = self.advance()
+        self.expect_op("(")
+        test = self.expression()
+        self.expect_op(")")
+        body = self.body()
+        orelse = []
+        if self.peek()[:2] == ("kw", "else"):
+            self.advance()
+            if self.peek()[:2] == ("kw", "if"):
+                orelse = [self.if_statement()]
+            else:
+                orelse = self.body()
+        return nodes.If(test, body, orelse, line=token[2], col=token[3])
+    
+    def loop_body(self):
+        self.loop_depth += 1
+        body = self.body()
+        self.loop_depth -= 1
+        return body
+    
+    def while_statement(self):
+        token = self.advance()
+        self.expect_op("(")
+        test = self.expression()
+        self.expect_op(")")
+        return nodes.While(test, self.loop_body(), line=token[2], col=token[3])
+    
+    def for_statement(self):
+        token = self.advance()
+        self.expect_op("(")
+        init = test = step = None
+        if not self.at_op(";"):
+            if self.peek()[0] == "type":
+                init = self.declaration()
+            else:
+                init = self.simple_statement()
+        self.expect_op(";")
+        if not self.at_op(";"):
+            test = self.expression()
+        self.expect_op(";")
+        if not self.at_op(")"):
+            step = self.simple_statement()
+        self.expect_op(")")
+        return nodes.For(init, test, step, self.loop_body(), line=token[2], col=token[3])
+    
+    def declaration(self):
+        type_token = self.advance()
+        decls = []
+        while True:
+            name = self.expect_name()
+            value = None
+            if self.accept_op("="):
+                value = self.expression()
+            decls.append(nodes.Decl(type_token[1], name[1], value, line=name[2], col=name[3]))
+            if not self.accept_op(","):
+                break
+        if len(decls) == 1:
+            return decls[0]
+        return nodes.Block(decls, line=type_token[2], col=type_token[3])
+    
+    def simple_statement(self):
+        token = self.peek()
+        if token[0] == "op" and token[1] in STEP_OPS:
+            self.advance()
+            target = self.assign_target(self.unary())
+            one = nodes.Const(1, line=token[2], col=token[3])
+            return nodes.Assign(target, STEP_OPS[token[1]], one, line=token[2], col=token[3])
+        
+        expr = self.expression()
+        op_token = self.peek()
+        if op_token[0] == "op":
+            if op_token[1] in ASSIGN_OPS:
+                self.advance()
+                target = self.assign_target(expr)
+                value = self.expression()
+                return nodes.Assign(target, ASSIGN_OPS[op_token[1]], value, line=token[2], col=token[3])
+            if op_token[1] in STEP_OPS:
+                self.advance()
+                target = self.assign_target(expr)
+                one = nodes.Const(1, line=op_token[2], col=op_token[3])
+                return nodes.Assign(target, STEP_OPS[op_token[1]], one, line=token[2], col=token[3])
+        return nodes.ExprStmt(expr, line=token[2], col=token[3])
+    
+    def assign_target(self, expr):
+        if isinstance(expr, (nodes.Name, nodes.Index)):
+            return expr
+        raise CmmSyntaxError("can only assign to a variable or an element", expr.line, expr.col)
+    
+    def expression(self, min_precedence=1):
+        left = self.unary()
+        while True:
+            token = self.tokens[self.pos]
+            if token[0] != "op":
+                return left
+            op = token[1]
+            precedence = BINARY_PRECEDENCE.get(op)
+            if precedence is None or precedence < min_precedence:
+                return left
+            self.advance()
+            right = self.expression(precedence + 1)
+            if op in COMPARISONS:
+                left = nodes.Compare(op, left, right, line=token[2], col=token[3])
+            elif op in ("&&", "||"):
+                left = nodes.Logic(op, left, right, line=token[2], col=token[3])
+            else:
+                left = nodes.BinOp(op, left, right, line=token[2], col=token[3])
+    
+    def unary(self):
+        token = self.tokens[self.pos]
+        if token[0] == "op" and token[1] in ("-", "+", "!"):
+            self.advance()
+            return nodes.Unary(token[1], self.unary(), line=token[2], col=token[3])
+        
+        base = self.postfix()
+        token = self.tokens[self.pos]
+        if token[0] == "op" and token[1] == "**":
+            self.advance()
+            return nodes.BinOp("**", base, self.unary(), line=token[2], col=token[3])
+        return base
+    
+    def postfix(self):
+        expr = self.primary()
+        while True:
+            token = self.tokens[self.pos]
+            if token[0] != "op":
+                return expr
+            if token[1] == "(":
+                self.advance()
+                args = []
+                while not self.at_op(")"):
+                    if args:
+                        self.expect_separator(")")
+                    args.append(self.expression())
+                self.advance()
+                expr = nodes.Call(expr, args, line=token[2], col=token[3])
+            elif token[1] == "[":
+                self.advance()
+                index = self.expression()
+                self.expect_op("]")
+                expr = nodes.Index(expr, index, line=token[2], col=token[3])
+            elif token[1] == ".":
+                self.advance()
+                name = self.peek()
+                if name[0] != "name":
+                    raise self.error(f"expected a member name but found {describe(name)}")
+                if name[1].startswith("_"):
+                    raise self.error(f"private member '{name[1]}' is not accessible")
+                self.advance()
+                expr = nodes.Attr(expr, name[1], line=name[2], col=name[3])
+            else:
+                return expr
+    
+    def primary(self):
+        token = self.advance()
+        kind, value = token[0], token[1]
+        if kind in ("num", "str"):
+            return nodes.Const(value, line=token[2], col=token[3])
+        if kind == "kw" and value in CONSTANTS:
+            return nodes.Const(CONSTANTS[value], line=token[2], col=token[3])
+        if kind == "name":
+            if value.startswith("__"):
+                raise self.error(f"names starting with '__' are reserved: '{value}'", token)
+            return nodes.Name(value, line=token[2], col=token[3])
+        if kind == "type" and self.at_op("("):
+            return nodes.Name(value, line=token[2], col=token[3])
+        if kind == "op":
+            if value == "(":
+                expr = self.expression()
+                self.expect_op(")")
+                return expr
+            if value == "[":
+                items = []
+                while not self.at_op("]"):
+                    if items:
+                        self.expect_separator("]")
+                    items.append(self.expression())
+                self.advance()
+                return nodes.ListExpr(items, line=token[2], col=token[3])
+        raise self.error(f"expected an expression but found {describe(token)}", token)
+
+
+def parse(source, filename=None):
+    try:
+        return Parser(tokenize(source)).parse_program()
+    except CmmSyntaxError as e:
+        e.filename = filename
+        raise
@@ -0,0 +1,286 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import marshal
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from .batch import LIMIT, MAX_OUTPUT, OK, RUNTIME_ERROR, Capture, describe_error, outcome
+from .compiler import CompileCache, compile_source, source_hash
+from .errors import CmmError
+from .limits import Limits, Supervisor, current_memory, reset_peak_memory
+from .optimizer import DEFAULT_LEVEL
+from .runtime import execute
+
+FLUSH_INTERVAL = 0.02
+OUTPUT_CHUNK_SIZE = 1 << 16
+
+
+def failure(status, error, start):
+    return dict(outcome(status, error, start), stdout="", truncated=False, peak_memory=None)
+
+
+def default_context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context()
+
+
+class Stream:
+    def __init__(self, conn):
+        self.conn = conn
+        self.parts = []
+        self.size = 0
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_periodically, daemon=True)
+        self.flusher.start()
+    
+    def write(self, text):
+        with self.lock:
+            self.parts.append(text)
+            self.size += len(text)
+            if self.size >= OUTPUT_CHUNK_SIZE:
+                self.flush()
+    
+    def flush(self):
+        if self.parts:
+            self.conn.send(("output", "".join(self.parts)))
+            self.parts = []
+            self.size = 0
+    
+    def send(self, message):
+        with self.lock:
+            self.flush()
+            self.conn.send(message)
+    
+    def flush_periodically(self):
+        while not self.done.wait(FLUSH_INTERVAL):
+            with self.lock:
+                self.flush()
+    
+    def close(self):
+        self.done.set()
+        self.flusher.join()
+        with self.lock:
+            self.flush()
+
+
+def serve(conn, cache_size, max_output):
+    codes = CompileCache(cache_size)
+    conn.send(("ready", current_memory()))
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+        
+        key, data, filename, input_text, limits, stream = request
+        code = codes.get(key)
+        if code is None:
+            code = marshal.loads(data)
+            codes.put(key, code)
+        
+        lines = iter(input_text.splitlines() if input_text else ())
+        output = Stream(conn) if stream else Capture(max_output)
+        
+        def read(prompt=""):
+            for line in lines:
+                return line
+            if not stream:
+                raise EOFError("end of input")
+            output.send(("input", prompt))
+            reply = conn.recv()
+            if reply is None:
+                raise EOFError("end of input")
+            return reply
+        
+        reset_peak_memory()
+        start = time.perf_counter()
+        try:
+            execute(code, output.write, read, Supervisor(Limits(*limits)))
+            status, error = OK, None
+        except CmmError as e:
+            status, error = describe_error(e, filename)
+        
+        result = outcome(status, error, start)
+        if stream:
+            output.close()
+        else:
+            result.update(stdout=output.getvalue(), truncated=output.truncated)
+        result["memory"] = current_memory()
+        conn.send(("done", result))
+    conn.close()
+
+
+class PoolWorker:
+    def __init__(self, context, cache_size, max_output):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=serve, args=(child, cache_size, max_output), name="cmm-pool-worker", daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.runs = 0
+        kind, self.base_memory = self.conn.recv()
+    
+    def close(self, timeout=1.0):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+    
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WarmPool:
+    def __init__(self, size=None, max_runs=1000, max_memory_growth=256 << 20, optimize=DEFAULT_LEVEL,
+                 cache_size=256, max_output=MAX_OUTPUT, grace=1.0, context=None):
+        self.size = size or os.cpu_count() or 1
+        self.max_runs = max_runs
+        self.max_memory_growth = max_memory_growth
+        self.optimize = optimize
+        self.cache_size = cache_size
+        self.max_output = max_output
+        self.grace = grace
+        self.context = context or default_context()
+        self.programs = CompileCache(cache_size)
+        self.idle = queue.Queue()
+        self.workers = set()
+        self.lock = threading.Lock()
+        self.closed = False
+        for _ in range(self.size):
+            self.spawn()
+    
+    def spawn(self):
+        worker = PoolWorker(self.context, self.cache_size, self.max_output)
+        with self.lock:
+            if self.closed:
+                worker.close()
+                return
+            self.workers.add(worker)
+        self.idle.put(worker)
+    
+    def retire(self, worker, kill=False):
+        with self.lock:
+            self.workers.discard(worker)
+        worker.kill() if kill else worker.close()
+        if not self.closed:
+            threading.Thread(target=self.spawn, daemon=True).start()
+    
+    def compile(self, source, filename, checkpoints):
+        key = (source_hash(source), filename, self.optimize, checkpoints)
+        data = self.programs.get(key)
+        if data is None:
+            data = marshal.dumps(compile_source(source, filename, optimize=self.optimize, checkpoints=checkpoints))
+            self.programs.put(key, data)
+        return key, data
+    
+    def run(self, source, filename="<cmm>", input_text=None, limits=None, on_output=None, on_input=None,
+            cancel=None):
+        limits = limits or Limits()
+        start = time.perf_counter()
+        try:
+            key, data = self.compile(source, filename, limits.max_steps is not None)
+        except CmmError as e:
+            return failure(*describe_error(e, filename), start)
+        
+        stream = on_output is not None
+        worker = self.idle.get()
+        start = time.perf_counter()
+        try:
+            worker.conn.send((key, data, filename, input_text, (limits.max_steps, limits.timeout, limits.max_memory), stream))
+            result = self.wait(worker, limits, start, on_output, on_input, cancel)
+        except (EOFError, OSError):
+            self.retire(worker, kill=True)
+            return failure(RUNTIME_ERROR, f"worker process exited with code {worker.process.exitcode}", start)
+        
+        if result is None:
+            self.retire(worker, kill=True)
+            if cancel is not None and cancel.is_set():
+                return failure(LIMIT, "execution cancelled", start)
+            return failure(LIMIT, f"time limit exceeded ({limits.timeout:g} s)", start)
+        
+        worker.runs += 1
+        memory = result.pop("memory", None)
+        if worker.runs >= self.max_runs or (
+            memory is not None and worker.base_memory is not None
+            and memory - worker.base_memory > self.max_memory_growth
+        ):
+            self.retire(worker)
+        else:
+            self.idle.put(worker)
+        return result
+    
+    def wait(self, worker, limits, start, on_output, on_input, cancel):
+        conn = worker.conn
+        deadline = start + limits.timeout + self.grace if limits.timeout is not None else None
+        while True:
+            if deadline is None and cancel is None:
+                ready = True
+            else:
+                ready = conn.poll(0.05)
+            if ready:
+                kind, value = conn.recv()
+                if kind == "done":
+                    return value
+                if kind == "output":
+                    on_output(value)
+                elif kind == "input":
+                    if on_input is None:
+                        conn.send(None)
+                        continue
+                    try:
+                        reply = on_input(value, deadline - time.perf_counter() if deadline is not None else None)
+                    except TimeoutError:
+                        return None
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    conn.send(reply)
+                continue
+            if cancel is not None and cancel.is_set():
+                return None
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+    
+    def close(self):
+        with self.lock:
+            self.closed = True
+            workers, self.workers = self.workers, set()
+        for worker in workers:
+            worker.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
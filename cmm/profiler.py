@@ -0,0 +1,333 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from time import perf_counter_ns
+
+from .limits import current_memory, peak_memory, reset_peak_memory
+
+MAIN = "<main>"
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+MEMORY_RATE = 0.1
+MEMORY_INTERVAL = 0.05
+MEMORY_FRAMES = 2
+
+
+def function_name(code):
+    if code.co_name == "<module>":
+        return MAIN
+    if code.co_name.startswith("__k_"):
+        return code.co_name[4:]
+    return code.co_name
+
+
+def source_snippet(lines, line, width=48):
+    code = lines[line - 1].strip() if 0 < line <= len(lines) else ""
+    return code[:width - 3] + "..." if len(code) > width else code
+
+
+class LineProfiler:
+    def __init__(self, filename="<cmm>"):
+        self.filename = filename
+        self.nodes = {}
+        self.parents = []
+        self.labels = []
+        self.node_hits = []
+        self.node_time = []
+        self.hits = {}
+        self.total = {}
+        self.own = {}
+        self.elapsed = 0
+        self.previous = None
+        self.started = None
+        self.frames = []
+    
+    def start(self):
+        self.previous = sys.gettrace()
+        self.started = perf_counter_ns()
+        sys.settrace(self.tracer())
+    
+    def stop(self):
+        sys.settrace(self.previous)
+        now = perf_counter_ns()
+        while self.frames:
+            record = self.frames.pop()
+            if record[1] >= 0:
+                self.node_time[record[1]] += now - record[2] - record[3]
+            if self.frames:
+                self.frames[-1][3] += now - record[4]
+        self.elapsed += now - self.started
+        self.summarize()
+    
+    def tracer(self):
+        filename = self.filename
+        frames = self.frames
+        node_hits = self.node_hits
+        node_time = self.node_time
+        clock = perf_counter_ns
+        add_node = self.add_node
+        
+        def trace_line(frame, event, arg):
+            now = clock()
+            if event == "line":
+                record = frames[-1]
+                if record[1] >= 0:
+                    node_time[record[1]] += now - record[2] - record[3]
+                node = record[0].get(frame.f_lineno)
+                if node is None:
+                    node = add_node(record, frame.f_lineno)
+                node_hits[node] += 1
+                record[1] = node
+                record[2] = now
+                record[3] = 0
+            elif event == "return":
+                record = frames.pop()
+                if record[1] >= 0:
+                    node_time[record[1]] += now - record[2] - record[3]
+                if frames:
+                    frames[-1][3] += now - record[4]
+            return trace_line
+        
+        def trace_call(frame, event, arg):
+            if frame.f_code.co_filename != filename:
+                return None
+            parent = frames[-1][1] if frames else -1
+            name = function_name(frame.f_code)
+            lines = self.nodes.setdefault((parent, name), {})
+            now = clock()
+            frames.append([lines, -1, now, 0, now, parent, name])
+            return trace_line
+        
+        return trace_call
+    
+    def add_node(self, record, line):
+        index = record[0][line] = len(self.parents)
+        self.parents.append(record[5])
+        self.labels.append((record[6], line))
+        self.node_hits.append(0)
+        self.node_time.append(0)
+        return index
+    
+    def summarize(self):
+        count = len(self.parents)
+        inclusive = list(self.node_time)
+        for index in range(count - 1, -1, -1):
+            parent = self.parents[index]
+            if parent >= 0:
+                inclusive[parent] += inclusive[index]
+        
+        self.hits = {}
+        self.total = {}
+        self.own = {}
+        outer = []
+        for index in range(count):
+            line = self.labels[index][1]
+            parent = self.parents[index]
+            active = outer[parent] if parent >= 0 else frozenset()
+            outer.append(active | {line})
+            self.hits[line] = self.hits.get(line, 0) + self.node_hits[index]
+            self.own[line] = self.own.get(line, 0) + self.node_time[index]
+            if line not in active:
+                self.total[line] = self.total.get(line, 0) + inclusive[index]
+    
+    def top(self, limit=10):
+        lines = sorted(self.own, key=self.own.get, reverse=True)[:limit]
+        return [(line, self.hits.get(line, 0), self.total.get(line, 0), self.own[line]) for line in lines]
+    
+    def heat(self):
+        peak = max(self.own.values(), default=0)
+        if peak <= 0:
+            return {}
+        return {line: own / peak for line, own in self.own.items() if own > 0}
+    
+    def report(self, source=None, limit=10):
+        lines = source.splitlines() if source is not None else []
+        elapsed = max(self.elapsed, 1)
+        rows = [f"{'line':>6} {'hits':>10} {'total ms':>10} {'self ms':>10} {'self %':>7}  code"]
+        for line, hits, total, own in self.top(limit):
+            rows.append(
+                f"{line:>6} {hits:>10} {total / 1e6:>10.3f} {own / 1e6:>10.3f} {own * 100 / elapsed:>6.1f}%  "
+                f"{source_snippet(lines, line)}"
+            )
+        return "\n".join(rows) + "\n"
+    
+    def stacks(self):
+        paths = {}
+        for index, own in enumerate(self.node_time):
+            if own <= 0:
+                continue
+            path = []
+            node = index
+            while node != -1:
+                path.append(self.labels[node])
+                node = self.parents[node]
+            path.reverse()
+            paths[tuple(path)] = paths.get(tuple(path), 0) + own
+        return paths
+    
+    def collapsed(self):
+        return "".join(
+            ";".join(f"{name}:{line}" for name, line in path) + f" {max(own // 1000, 1)}\n"
+            for path, own in self.stacks().items()
+        )
+    
+    def speedscope(self, name=None):
+        frames = []
+        indexes = {}
+        samples = []
+        weights = []
+        for path, own in self.stacks().items():
+            sample = []
+            for label in path:
+                index = indexes.get(label)
+                if index is None:
+                    index = indexes[label] = len(frames)
+                    frames.append({"name": f"{label[0]}:{label[1]}", "file": self.filename, "line": label[1]})
+                sample.append(index)
+            samples.append(sample)
+            weights.append(own)
+        name = name or self.filename
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights
+            }],
+            "name": name,
+            "exporter": "cmm"
+        }
+    
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            if path.lower().endswith(".json"):
+                json.dump(self.speedscope(), f)
+            else:
+                f.write(self.collapsed())
+
+
+class MemoryProfiler:
+    def __init__(self, filename="<cmm>", rate=MEMORY_RATE, interval=MEMORY_INTERVAL, frames=MEMORY_FRAMES):
+        self.filename = filename
+        self.rate = min(max(rate, 0.001), 1.0)
+        self.interval = interval
+        self.frames = frames
+        self.sizes = {}
+        self.blocks = {}
+        self.sites = []
+        self.peak = None
+        self.base = None
+        self.highest = None
+        self.reset_peak = False
+        self.owns_tracing = False
+        self.elapsed = 0.0
+        self.traced = 0.0
+        self.windows = 0
+        self.started = None
+        self.stopped = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        self.owns_tracing = not tracemalloc.is_tracing()
+        self.reset_peak = reset_peak_memory()
+        self.base = self.highest = current_memory()
+        self.started = time.perf_counter()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.sample_loop, name="cmm-memory", daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        self.measure()
+        if self.base is not None:
+            highest = self.highest
+            if self.reset_peak:
+                highest = max(highest, peak_memory() or 0)
+            self.peak = max(highest - self.base, 0)
+        self.summarize()
+    
+    def sample_loop(self):
+        continuous = self.rate >= 1 or not self.owns_tracing
+        window = self.interval * self.rate
+        while True:
+            if self.owns_tracing:
+                tracemalloc.start(self.frames)
+            began = time.perf_counter()
+            stopped = self.stopped.wait(self.interval if continuous else window)
+            while continuous and not stopped:
+                self.measure()
+                stopped = self.stopped.wait(self.interval)
+            snapshot = tracemalloc.take_snapshot()
+            if self.owns_tracing:
+                tracemalloc.stop()
+            self.traced += time.perf_counter() - began
+            self.collect(snapshot)
+            self.windows += 1
+            self.measure()
+            if stopped or self.stopped.wait(self.interval - window):
+                return
+    
+    def measure(self):
+        current = current_memory()
+        if current is not None and self.highest is not None and current > self.highest:
+            self.highest = current
+    
+    def collect(self, snapshot):
+        for statistic in snapshot.statistics("traceback"):
+            frames = statistic.traceback
+            if frames[-1].filename == __file__:
+                continue
+            for frame in reversed(frames):
+                if frame.filename == self.filename:
+                    if frame.lineno < 1:
+                        break
+                    self.sizes[frame.lineno] = self.sizes.get(frame.lineno, 0) + statistic.size
+                    self.blocks[frame.lineno] = self.blocks.get(frame.lineno, 0) + statistic.count
+                    break
+    
+    def summarize(self):
+        scale = max(self.elapsed / self.traced, 1.0) if self.traced else 1.0
+        self.sites = sorted(
+            ((line, round(size * scale), round(self.blocks[line] * scale)) for line, size in self.sizes.items()),
+            key=lambda site: -site[1]
+        )
+    
+    def report(self, source=None, limit=10):
+        lines = source.splitlines() if source is not None else []
+        rows = [f"{'line':>6} {'KiB':>12} {'blocks':>10}  code"]
+        for line, size, count in self.sites[:limit]:
+            rows.append(f"{line:>6} {size / 1024:>12.1f} {count:>10}  {source_snippet(lines, line)}")
+        return "\n".join(rows) + "\n"
+    
+    def as_dict(self, limit=10):
+        return {
+            "peak_bytes": self.peak,
+            "rate": self.rate,
+            "windows": self.windows,
+            "sites": [{"line": line, "bytes": size, "blocks": count} for line, size, count in self.sites[:limit]]
+        }
@@ -0,0 +1,143 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import operator
+
+from .errors import CmmError, CmmLimitError, CmmRuntimeError
+from .limits import Interrupt
+
+RANGE_TESTS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+def format_value(value):
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    if isinstance(value, list):
+        return "[" + ", ".join(map(repr_value, value)) + "]"
+    return str(value)
+
+
+def repr_value(value):
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return format_value(value)
+
+
+def make_builtins(write, read):
+    def cmm_print(*args):
+        write(" ".join(map(format_value, args)) + "\n")
+    
+    def cmm_input(prompt=""):
+        return read(format_value(prompt))
+    
+    return {
+        "print": cmm_print,
+        "input": cmm_input,
+        "str": format_value,
+        "string": format_value,
+        "int": int,
+        "float": float,
+        "bool": bool,
+        "len": len,
+        "abs": abs,
+        "min": min,
+        "max": max,
+        "round": round,
+        "range": range,
+        "list": list
+    }
+
+
+def count_up(value, stop, step, test):
+    while test(value, stop):
+        yield value
+        value += step
+
+
+def loop_range(start, stop, step, op):
+    if type(start) is int and type(stop) is int:
+        if op == "<=":
+            stop += 1
+        elif op == ">=":
+            stop -= 1
+        return range(start, stop, step)
+    return count_up(start, stop, step, RANGE_TESTS[op])
+
+
+def make_namespace(write, read, supervisor=None):
+    namespace = make_builtins(write, read)
+    namespace["__cmm_range"] = loop_range
+    if supervisor is not None and supervisor.limits.max_steps is not None:
+        namespace["__cmm_step"] = supervisor.step_counter()
+    namespace["__builtins__"] = {}
+    namespace["__name__"] = "__cmm__"
+    return namespace
+
+
+def source_line(tb, filename):
+    line = None
+    while tb is not None:
+        if tb.tb_frame.f_code.co_filename == filename:
+            line = tb.tb_lineno
+        tb = tb.tb_next
+    return line
+
+
+def runtime_error(error, filename):
+    if isinstance(error, RecursionError):
+        message = "maximum recursion depth exceeded"
+    else:
+        message = f"{type(error).__name__}: {error}"
+    return CmmRuntimeError(message, source_line(error.__traceback__, filename), filename=filename)
+
+
+def execute(code, write, read, supervisor=None, profiler=None, memory_profiler=None):
+    namespace = make_namespace(write, read, supervisor)
+    try:
+        if supervisor is None and profiler is None and memory_profiler is None:
+            exec(code, namespace)
+        else:
+            if supervisor is not None:
+                supervisor.start()
+            if memory_profiler is not None:
+                memory_profiler.start()
+            if profiler is not None:
+                profiler.start()
+            try:
+                exec(code, namespace)
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+                if memory_profiler is not None:
+                    memory_profiler.stop()
+                if supervisor is not None:
+                    supervisor.finish()
+    except CmmError:
+        raise
+    except BaseException as e:
+        if supervisor is not None and supervisor.reason is not None:
+            raise CmmLimitError(
+                supervisor.describe(), supervisor.reason,
+                source_line(e.__traceback__, code.co_filename), code.co_filename
+            ) from None
+        if isinstance(e, (Interrupt, KeyboardInterrupt, SystemExit)):
+            raise
+        raise runtime_error(e, code.co_filename) from None
@@ -0,0 +1,289 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from .bytecode import CACHE_DIRNAME
+
+INDEX_FILENAME = "search.sqlite3"
+SCHEMA_VERSION = 1
+GRAM = 3
+MAX_RESULTS = 1000
+BATCH_FILES = 50
+REFRESH_INTERVAL = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grams (
+    gram TEXT NOT NULL,
+    file INTEGER NOT NULL,
+    PRIMARY KEY (gram, file)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS grams_by_file ON grams (file);
+"""
+
+PROGRESS = "progress"
+INDEXED = "indexed"
+RESULTS = "results"
+ERROR = "error"
+
+
+def trigrams(text):
+    grams = set()
+    for line in text.lower().splitlines():
+        grams.update(line[i:i + GRAM] for i in range(len(line) - GRAM + 1))
+    return grams
+
+
+def compile_query(query, regex=False, match_case=False):
+    flags = 0 if match_case else re.IGNORECASE
+    return re.compile(query if regex else re.escape(query), flags)
+
+
+def literal_of(query, regex=False):
+    if not regex:
+        return query
+    return query if re.escape(query) == query else None
+
+
+def iter_sources(root):
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name != CACHE_DIRNAME and not name.startswith("."))
+        for name in sorted(filenames):
+            if name.endswith(".cmm"):
+                yield os.path.join(directory, name)
+
+
+def read_source(path):
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", "replace")
+
+
+class Hit:
+    __slots__ = ("path", "line", "start", "end", "text")
+    
+    def __init__(self, path, line, start, end, text):
+        self.path = path
+        self.line = line
+        self.start = start
+        self.end = end
+        self.text = text
+    
+    def __repr__(self):
+        return f"{self.path}:{self.line}:{self.start + 1}: {self.text}"
+
+
+class ProjectIndex:
+    def __init__(self, root, path=None):
+        self.root = os.path.abspath(root)
+        self.path = path or os.path.join(self.root, CACHE_DIRNAME, INDEX_FILENAME)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS grams; DROP TABLE IF EXISTS files;")
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.db.executescript(SCHEMA)
+    
+    def close(self):
+        self.db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def relative(self, path):
+        return os.path.relpath(path, self.root)
+    
+    def update(self, progress=None, cancelled=None):
+        known = {path: (file_id, mtime_ns, size) for file_id, path, mtime_ns, size in self.db.execute(
+            "SELECT id, path, mtime_ns, size FROM files"
+        )}
+        changed = []
+        seen = set()
+        for path in iter_sources(self.root):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            name = self.relative(path)
+            seen.add(name)
+            entry = known.get(name)
+            if entry is None or entry[1] != st.st_mtime_ns or entry[2] != st.st_size:
+                changed.append((name, st))
+        removed = [entry[0] for name, entry in known.items() if name not in seen]
+        
+        with self.db:
+            self.db.executemany("DELETE FROM grams WHERE file = ?", ((file_id,) for file_id in removed))
+            self.db.executemany("DELETE FROM files WHERE id = ?", ((file_id,) for file_id in removed))
+        
+        for done, (name, st) in enumerate(changed, 1):
+            if cancelled is not None and cancelled():
+                break
+            try:
+                grams = trigrams(read_source(os.path.join(self.root, name)))
+            except OSError:
+                continue
+            with self.db:
+                entry = known.get(name)
+                if entry is not None:
+                    file_id = entry[0]
+                    self.db.execute("DELETE FROM grams WHERE file = ?", (file_id,))
+                    self.db.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?", (st.st_mtime_ns, st.st_size, file_id)
+                    )
+                else:
+                    file_id = self.db.execute(
+                        "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)", (name, st.st_mtime_ns, st.st_size)
+                    ).lastrowid
+                self.db.executemany("INSERT INTO grams (gram, file) VALUES (?, ?)", ((gram, file_id) for gram in grams))
+            if progress is not None and (done % BATCH_FILES == 0 or done == len(changed)):
+                progress(done, len(changed))
+        return len(changed), len(removed)
+    
+    def file_count(self):
+        return self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    
+    def candidates(self, query, regex=False):
+        literal = literal_of(query, regex)
+        grams = trigrams(literal) if literal else set()
+        if not grams:
+            rows = self.db.execute("SELECT path FROM files ORDER BY path")
+        else:
+            marks = ", ".join("?" * len(grams))
+            rows = self.db.execute(
+                f"SELECT path FROM files WHERE id IN (SELECT file FROM grams WHERE gram IN ({marks}) "
+                f"GROUP BY file HAVING COUNT(*) = ?) ORDER BY path",
+                (*grams, len(grams))
+            )
+        return [row[0] for row in rows]
+    
+    def search(self, query, regex=False, match_case=False, limit=MAX_RESULTS):
+        pattern = compile_query(query, regex, match_case)
+        hits = []
+        for name in self.candidates(query, regex):
+            try:
+                source = read_source(os.path.join(self.root, name))
+            except OSError:
+                continue
+            for number, line in enumerate(source.splitlines(), 1):
+                for match in pattern.finditer(line):
+                    if match.start() == match.end():
+                        continue
+                    hits.append(Hit(name, number, match.start(), match.end(), line))
+                    if limit is not None and len(hits) >= limit:
+                        return hits
+        return hits
+
+
+class SearchWorker:
+    def __init__(self, root, path=None, refresh_interval=REFRESH_INTERVAL):
+        self.root = root
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.requests = queue.Queue()
+        self.events = queue.Queue()
+        self.stopped = False
+        self.thread = threading.Thread(target=self.run, name="cmm-indexer", daemon=True)
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def query(self, query, regex=False, match_case=False, limit=MAX_RESULTS):
+        self.requests.put((query, regex, match_case, limit))
+    
+    def stop(self):
+        self.stopped = True
+        self.requests.put(None)
+    
+    def latest_request(self, timeout=None):
+        request = self.requests.get(timeout=timeout)
+        while request is not None:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+        return request
+    
+    def run(self):
+        try:
+            index = ProjectIndex(self.root, self.path)
+        except (OSError, sqlite3.Error) as e:
+            self.events.put((ERROR, e))
+            return
+        try:
+            self.refresh(index)
+            refresh_at = self.next_refresh()
+            while not self.stopped:
+                if refresh_at is not None and time.perf_counter() >= refresh_at:
+                    self.refresh(index, quiet=True)
+                    refresh_at = self.next_refresh()
+                try:
+                    request = self.latest_request(
+                        max(refresh_at - time.perf_counter(), 0) if refresh_at is not None else None
+                    )
+                except queue.Empty:
+                    continue
+                if request is None:
+                    break
+                query, regex, match_case, limit = request
+                start = time.perf_counter()
+                try:
+                    hits = index.search(query, regex, match_case, limit)
+                except re.error as e:
+                    self.events.put((ERROR, e))
+                    continue
+                self.events.put((RESULTS, (query, hits, time.perf_counter() - start)))
+        except (OSError, sqlite3.Error) as e:
+            self.events.put((ERROR, e))
+        finally:
+            index.close()
+    
+    def next_refresh(self):
+        if self.refresh_interval is None:
+            return None
+        return time.perf_counter() + self.refresh_interval
+    
+    def refresh(self, index, quiet=False):
+        start = time.perf_counter()
+        changed, removed = index.update(
+            lambda done, total: self.events.put((PROGRESS, (done, total))), lambda: self.stopped
+        )
+        if changed or removed or not quiet:
+            self.events.put((INDEXED, (index.file_count(), changed, removed, time.perf_counter() - start)))
+    
+    def drain(self):
+        items = []
+        while True:
+            try:
+                items.append(self.events.get_nowait())
+            except queue.Empty:
+                return items
@@ -0,0 +1,436 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import base64
+import functools
+import hashlib
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .limits import Limits
+from .pool import WarmPool
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BODY = 1 << 20
+MAX_HEADERS = 100
+MAX_OUTPUT = 1 << 20
+OP_CONTINUATION, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0, 1, 2, 8, 9, 10
+CLOSE_NORMAL, CLOSE_PROTOCOL_ERROR, CLOSE_INVALID_DATA, CLOSE_TOO_BIG = 1000, 1002, 1007, 1009
+REASONS = {
+    101: "Switching Protocols", 200: "OK", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 503: "Service Unavailable"
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method, path, headers, body):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+
+async def read_line(reader):
+    try:
+        return await reader.readline()
+    except (asyncio.LimitOverrunError, ValueError):
+        raise HttpError(400, "request line or header too long") from None
+
+
+async def read_request(reader):
+    line = await read_line(reader)
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "malformed request line") from None
+    
+    headers = {}
+    for count in range(MAX_HEADERS + 1):
+        line = await read_line(reader)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if count == MAX_HEADERS:
+            raise HttpError(400, "too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "invalid Content-Length") from None
+    if length > MAX_BODY:
+        raise HttpError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method, target.split("?", 1)[0], headers, body)
+
+
+def response_head(status, headers):
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def json_response(writer, status, payload):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(response_head(status, [
+        ("Content-Type", "application/json"), ("Content-Length", len(body)), ("Connection", "close")
+    ]) + body)
+
+
+def unmask(payload, mask):
+    if not payload:
+        return payload
+    repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    value = int.from_bytes(payload, "little") ^ int.from_bytes(repeated, "little")
+    return value.to_bytes(len(payload), "little")
+
+
+class WebSocket:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+    
+    async def read_frame(self):
+        head = await self.reader.readexactly(2)
+        fin, opcode = head[0] & 0x80, head[0] & 0x0F
+        masked, length = head[1] & 0x80, head[1] & 0x7F
+        if length == 126:
+            length = int.from_bytes(await self.reader.readexactly(2), "big")
+        elif length == 127:
+            length = int.from_bytes(await self.reader.readexactly(8), "big")
+        if length > MAX_BODY:
+            raise HttpError(413, "message too large")
+        mask = await self.reader.readexactly(4) if masked else None
+        payload = await self.reader.readexactly(length)
+        return fin, opcode, unmask(payload, mask) if mask else payload
+    
+    async def receive(self):
+        parts = []
+        while True:
+            fin, opcode, payload = await self.read_frame()
+            if opcode == OP_PING:
+                await self.send_frame(OP_PONG, payload)
+            elif opcode == OP_PONG:
+                pass
+            elif opcode == OP_CLOSE:
+                await self.close()
+                return None
+            else:
+                parts.append(payload)
+                if sum(map(len, parts)) > MAX_BODY:
+                    raise HttpError(413, "message too large")
+                if fin:
+                    return b"".join(parts).decode("utf-8")
+    
+    async def send_frame(self, opcode, payload):
+        if self.closed and opcode != OP_CLOSE:
+            return
+        length = len(payload)
+        if length < 126:
+            head = bytes((0x80 | opcode, length))
+        elif length < 1 << 16:
+            head = bytes((0x80 | opcode, 126)) + length.to_bytes(2, "big")
+        else:
+            head = bytes((0x80 | opcode, 127)) + length.to_bytes(8, "big")
+        self.writer.write(head + payload)
+        await self.writer.drain()
+    
+    async def send_json(self, payload):
+        await self.send_frame(OP_TEXT, json.dumps(payload).encode("utf-8"))
+    
+    async def close(self, code=CLOSE_NORMAL, reason=""):
+        if not self.closed:
+            self.closed = True
+            try:
+                await self.send_frame(OP_CLOSE, code.to_bytes(2, "big") + reason.encode("utf-8")[:123])
+            except (ConnectionError, RuntimeError):
+                pass
+
+
+def clamp(requested, cap):
+    if requested is None:
+        return cap
+    if cap is None:
+        return requested
+    return min(requested, cap)
+
+
+class Run:
+    def __init__(self, source, filename, input_text, limits, interactive):
+        self.source = source
+        self.filename = filename
+        self.input_text = input_text
+        self.limits = limits
+        self.interactive = interactive
+        self.cancel = threading.Event()
+        self.replies = queue.Queue()
+    
+    def reply(self, line):
+        self.replies.put(line)
+    
+    def stop(self):
+        self.cancel.set()
+        self.replies.put(None)
+
+
+class ExecutionServer:
+    def __init__(self, pool=None, workers=None, max_queue=1000, limits=None, max_output=MAX_OUTPUT):
+        self.pool = pool or WarmPool(workers)
+        self.limits = limits or Limits(timeout=10.0)
+        self.max_queue = max_queue
+        self.max_output = max_output
+        self.executor = ThreadPoolExecutor(self.pool.size, thread_name_prefix="cmm-serve")
+        self.slots = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+    
+    def parse_run(self, text, interactive):
+        try:
+            payload = json.loads(text)
+        except ValueError:
+            raise HttpError(400, "request body must be JSON") from None
+        if not isinstance(payload, dict) or not isinstance(payload.get("source"), str):
+            raise HttpError(400, "'source' must be a string")
+        input_text = payload.get("input")
+        if input_text is not None and not isinstance(input_text, str):
+            raise HttpError(400, "'input' must be a string")
+        
+        values = []
+        for name, cast in (("max_steps", int), ("timeout", float), ("max_memory", int)):
+            value = payload.get(name)
+            if value is not None:
+                if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+                    raise HttpError(400, f"'{name}' must be a positive number")
+                value = cast(value) << 20 if name == "max_memory" else cast(value)
+            values.append(value)
+        limits = Limits(
+            clamp(values[0], self.limits.max_steps), clamp(values[1], self.limits.timeout),
+            clamp(values[2], self.limits.max_memory)
+        )
+        return Run(payload["source"], str(payload.get("filename") or "<web>"), input_text, limits, interactive)
+    
+    def admit(self):
+        if self.queued >= self.max_queue:
+            raise HttpError(503, "too many queued runs")
+    
+    async def execute(self, run, emit):
+        self.queued += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        try:
+            await emit("started", None)
+            loop = asyncio.get_running_loop()
+            events = asyncio.Queue()
+            
+            def on_output(text):
+                loop.call_soon_threadsafe(events.put_nowait, ("output", text))
+            
+            def on_input(prompt, timeout=None):
+                loop.call_soon_threadsafe(events.put_nowait, ("input", prompt))
+                try:
+                    return run.replies.get(timeout=max(timeout, 0) if timeout is not None else None)
+                except queue.Empty:
+                    raise TimeoutError("no input before the time limit") from None
+            
+            future = loop.run_in_executor(self.executor, functools.partial(
+                self.pool.run, run.source, run.filename, run.input_text, run.limits,
+                on_output, on_input if run.interactive else None, run.cancel
+            ))
+            future.add_done_callback(lambda f: events.put_nowait(("done", None)))
+            
+            sent = 0
+            truncated = False
+            while True:
+                kind, value = await events.get()
+                if kind == "done":
+                    break
+                if kind == "output":
+                    if sent >= self.max_output:
+                        truncated = True
+                        continue
+                    if sent + len(value) > self.max_output:
+                        value = value[:self.max_output - sent]
+                        truncated = True
+                    sent += len(value)
+                try:
+                    await emit(kind, value)
+                except (ConnectionError, RuntimeError):
+                    run.stop()
+            
+            result = future.result()
+            result.pop("stdout", None)
+            result["truncated"] = truncated
+            return result
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.slots.release()
+    
+    async def handle(self, reader, writer):
+        try:
+            request = await read_request(reader)
+            if request is None:
+                return
+            if request.path == "/health":
+                json_response(writer, 200, {
+                    "workers": self.pool.size, "running": self.running,
+                    "queued": self.queued, "completed": self.completed
+                })
+            elif request.path == "/run":
+                if request.method != "POST":
+                    raise HttpError(405, "use POST")
+                await self.handle_http_run(request, writer)
+            elif request.path == "/ws":
+                await self.handle_websocket(request, reader, writer)
+            else:
+                raise HttpError(404, "not found")
+        except HttpError as e:
+            json_response(writer, e.status, {"error": e.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, RuntimeError):
+                pass
+    
+    async def handle_http_run(self, request, writer):
+        run = self.parse_run(request.body.decode("utf-8", "replace"), interactive=False)
+        self.admit()
+        writer.write(response_head(200, [
+            ("Content-Type", "application/x-ndjson"), ("Transfer-Encoding", "chunked"),
+            ("Cache-Control", "no-cache"), ("Connection", "close")
+        ]))
+        
+        async def send(payload):
+            data = (json.dumps(payload) + "\n").encode("utf-8")
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+        
+        async def emit(kind, value):
+            await send({"type": kind} if value is None else {"type": kind, "data": value})
+        
+        result = await self.execute(run, emit)
+        await send(dict(result, type="done"))
+        writer.write(b"0\r\n\r\n")
+    
+    async def handle_websocket(self, request, reader, writer):
+        key = request.headers.get("sec-websocket-key")
+        if request.headers.get("upgrade", "").lower() != "websocket" or not key:
+            raise HttpError(400, "expected a WebSocket upgrade")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(response_head(101, [
+            ("Upgrade", "websocket"), ("Connection", "Upgrade"), ("Sec-WebSocket-Accept", accept)
+        ]))
+        socket = WebSocket(reader, writer)
+        
+        try:
+            message = await socket.receive()
+            if message is None:
+                return
+            try:
+                run = self.parse_run(message, interactive=True)
+                self.admit()
+            except HttpError as e:
+                await socket.send_json({"type": "error", "status": e.status, "error": e.message})
+                return
+            
+            async def listen():
+                try:
+                    while True:
+                        message = await socket.receive()
+                        if message is None:
+                            break
+                        try:
+                            payload = json.loads(message)
+                        except ValueError:
+                            continue
+                        if payload.get("type") == "input":
+                            run.reply(str(payload.get("data", "")))
+                        elif payload.get("type") == "eof":
+                            run.reply(None)
+                        elif payload.get("type") == "cancel":
+                            break
+                except (ConnectionError, asyncio.IncompleteReadError, HttpError, UnicodeDecodeError):
+                    pass
+                run.stop()
+            
+            async def emit(kind, value):
+                await socket.send_json({"type": kind} if value is None else {"type": kind, "data": value})
+            
+            listener = asyncio.create_task(listen())
+            await socket.send_json({"type": "queued", "position": self.queued})
+            try:
+                result = await self.execute(run, emit)
+            finally:
+                listener.cancel()
+            await socket.send_json(dict(result, type="done"))
+        except HttpError as e:
+            await socket.close(CLOSE_TOO_BIG if e.status == 413 else CLOSE_PROTOCOL_ERROR, e.message)
+        except UnicodeDecodeError:
+            await socket.close(CLOSE_INVALID_DATA, "messages must be UTF-8")
+        finally:
+            await socket.close()
+    
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        self.slots = asyncio.Semaphore(self.pool.size)
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+    
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close()
+
+
+def main(args):
+    limits = Limits(args.max_steps, args.timeout, args.max_memory << 20 if args.max_memory is not None else None)
+    server = ExecutionServer(WarmPool(args.workers), max_queue=args.max_queue, limits=limits)
+    
+    def ready(listener):
+        for sock in listener.sockets:
+            host, port = sock.getsockname()[:2]
+            print(f"C-- execution service listening on http://{host}:{port} ({server.pool.size} workers)", flush=True)
+    
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
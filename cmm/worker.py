@@ -0,0 +1,165 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import queue
+import threading
+import time
+from collections import deque
+
+from .compiler import compile_source
+from .errors import CmmError
+from .limits import Supervisor
+from .optimizer import DEFAULT_LEVEL
+from .profiler import LineProfiler, MemoryProfiler
+from .runtime import execute
+
+OUTPUT = "output"
+INPUT = "input"
+ERROR = "error"
+ECHO = "echo"
+DONE = "done"
+
+OUTPUT_CHUNK_SIZE = 1 << 16
+MAX_QUEUED_CHUNKS = 64
+
+
+class InputChannel:
+    def __init__(self, text=None):
+        self.lines = deque()
+        self.closed = False
+        self.condition = threading.Condition()
+        if text:
+            self.feed(text)
+    
+    def feed(self, text):
+        lines = text.splitlines() or [""]
+        with self.condition:
+            self.lines.extend(lines)
+            self.condition.notify()
+    
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+    
+    def pending(self):
+        with self.condition:
+            return len(self.lines)
+    
+    def readline(self, timeout=None):
+        deadline = time.perf_counter() + timeout if timeout is not None else None
+        with self.condition:
+            while not self.lines:
+                if self.closed:
+                    raise EOFError("end of input")
+                remaining = deadline - time.perf_counter() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("no input before the deadline")
+                self.condition.wait(remaining)
+            return self.lines.popleft()
+
+
+class ScriptWorker:
+    def __init__(self, source, filename="<cmm>", optimize=DEFAULT_LEVEL, input_text=None, limits=None,
+                 profile=False, memory_rate=None):
+        self.source = source
+        self.filename = filename
+        self.optimize = optimize
+        self.supervisor = Supervisor(limits)
+        self.profiler = LineProfiler(filename) if profile else None
+        self.memory_profiler = MemoryProfiler(filename, memory_rate) if memory_rate else None
+        self.events = queue.Queue()
+        self.input = InputChannel(input_text)
+        self.output = []
+        self.output_size = 0
+        self.queued_chunks = 0
+        self.output_ready = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="cmm-worker", daemon=True)
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def is_running(self):
+        return self.thread.is_alive()
+    
+    def write(self, text):
+        with self.output_ready:
+            self.output.append(text)
+            self.output_size += len(text)
+            if self.output_size >= OUTPUT_CHUNK_SIZE:
+                while self.queued_chunks >= MAX_QUEUED_CHUNKS:
+                    self.output_ready.wait()
+                self.flush_output()
+    
+    def flush_output(self):
+        if self.output:
+            self.events.put((OUTPUT, "".join(self.output)))
+            self.output = []
+            self.output_size = 0
+            self.queued_chunks += 1
+    
+    def post(self, kind, value):
+        with self.output_ready:
+            self.flush_output()
+            self.events.put((kind, value))
+    
+    def read(self, prompt=""):
+        self.post(INPUT, prompt)
+        try:
+            line = self.input.readline(self.supervisor.remaining())
+        except TimeoutError:
+            self.supervisor.expire()
+        self.post(ECHO, line)
+        return line
+    
+    def send(self, text):
+        self.input.feed(text)
+    
+    def close_input(self):
+        self.input.close()
+    
+    def cancel(self):
+        self.supervisor.interrupt()
+        self.input.close()
+    
+    def run(self):
+        try:
+            code = compile_source(
+                self.source, self.filename, optimize=self.optimize,
+                checkpoints=self.supervisor.limits.max_steps is not None
+            )
+            execute(code, self.write, self.read, self.supervisor, self.profiler, self.memory_profiler)
+        except CmmError as e:
+            self.post(ERROR, e)
+        except BaseException as e:
+            self.post(ERROR, CmmError(f"{type(e).__name__}: {e}", filename=self.filename))
+        finally:
+            self.post(DONE, self.supervisor.elapsed)
+    
+    def drain(self, limit=None):
+        items = []
+        with self.output_ready:
+            self.flush_output()
+            while limit is None or len(items) < limit:
+                try:
+                    items.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+            self.queued_chunks -= sum(1 for kind, value in items if kind == OUTPUT)
+            self.output_ready.notify()
+        return items
@@ -0,0 +1,58 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cmm.compiler import compile_source
+from cmm.runtime import execute
+
+
+def run_source(source, inputs=(), supervisor=None, profiler=None, memory_profiler=None, **options):
+    output = []
+    lines = iter(inputs)
+    
+    def read(prompt=""):
+        for line in lines:
+            return line
+        raise EOFError("end of input")
+    
+    code = compile_source(source, "test.cmm", cache=None, **options)
+    execute(code, output.append, read, supervisor, profiler, memory_profiler)
+    return "".join(output)
+
+
+@pytest.fixture
+def run():
+    return run_source
+
+
+def load_ide():
+    pytest.importorskip("tkinter")
+    pytest.importorskip("pygments")
+    if "devcmm" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("devcmm", os.path.join(ROOT, "Dev-C--.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["devcmm"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["devcmm"]
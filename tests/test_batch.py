@@ -0,0 +1,146 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import io
+import json
+import os
+
+import pytest
+
+from cmm import batch
+
+
+@pytest.fixture
+def programs(tmp_path):
+    files = {
+        "ok.cmm": 'print("hi", input());\n',
+        "ok.in": "ada\n",
+        "sub/error.cmm": "print(1 / 0);\n",
+        "sub/syntax.cmm": "print(;\n",
+        "sub/loop.cmm": "while (true) {\n}\n",
+        "sub/notes.txt": "not a program\n",
+        "__cmmcache__/stale.cmm": "print(0);\n",
+    }
+    for name, text in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return tmp_path
+
+
+def names(paths, root):
+    return [os.path.relpath(path, root).replace(os.sep, "/") for path in paths]
+
+
+def test_collect_walks_directories_and_globs(programs):
+    paths = batch.collect([str(programs), str(programs / "sub" / "*.cmm"), str(programs / "ok.cmm")])
+    assert names(paths, programs) == ["ok.cmm", "sub/error.cmm", "sub/loop.cmm", "sub/syntax.cmm"]
+
+
+def test_make_jobs_pairs_input_files_and_applies_the_manifest(programs, tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(
+        json.dumps({"file": str(programs / "sub" / "loop.cmm"), "max_steps": 10, "max_memory": 2}) + "\n\n"
+        + json.dumps({"file": str(programs / "extra.cmm"), "input": "x.in", "timeout": 0.5}) + "\n",
+        encoding="utf-8"
+    )
+    jobs = batch.make_jobs([str(programs / "ok.cmm"), str(programs / "sub" / "loop.cmm")], timeout=3,
+                           manifest=str(manifest))
+    first, loop, extra = jobs
+    assert first.input_path == str(programs / "ok.in") and first.timeout == 3
+    assert (loop.max_steps, loop.max_memory, loop.timeout) == (10, 2 << 20, 3)
+    assert (extra.path, extra.input_path, extra.timeout) == (str(programs / "extra.cmm"), "x.in", 0.5)
+
+
+@pytest.mark.parametrize("name, status", [
+    ("ok.cmm", batch.OK),
+    ("sub/error.cmm", batch.RUNTIME_ERROR),
+    ("sub/syntax.cmm", batch.SYNTAX_ERROR),
+    ("sub/loop.cmm", batch.LIMIT),
+    ("missing.cmm", batch.MISSING),
+])
+def test_run_job_status(programs, name, status):
+    job = batch.make_jobs([str(programs / name)], max_steps=1000)[0]
+    result = batch.run_job(job)
+    assert result["status"] == status
+    assert result["exit_code"] == batch.EXIT_CODES[status]
+    assert (result["error"] is None) == (status == batch.OK)
+
+
+def test_undecodable_files_are_reported_per_job(programs):
+    (programs / "latin1.cmm").write_bytes(b'print("caf\xe9");\n')
+    (programs / "bad_input.cmm").write_text("print(input());\n", encoding="utf-8")
+    (programs / "bad_input.in").write_bytes(b"caf\xe9\n")
+    for name in ("latin1.cmm", "bad_input.in"):
+        result = batch.run_job(batch.make_jobs([str(programs / name.replace(".in", ".cmm"))])[0])
+        assert result["status"] == batch.SYNTAX_ERROR
+        assert result["error"].startswith(f"{programs / name}: 'utf-8' codec can't decode")
+
+
+def test_bad_manifest_entries_become_error_records(programs, tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text('{"input": "x.in"}\nnot json\n[1]\n', encoding="utf-8")
+    jobs = batch.make_jobs([str(programs / "ok.cmm")], manifest=str(manifest))
+    assert [job.path for job in jobs] == [str(programs / "ok.cmm")] + [f"{manifest}:{n}" for n in (1, 2, 3)]
+    out = io.StringIO()
+    counts = batch.run_batch(jobs, out, workers=2)
+    assert counts[batch.OK] == 1 and counts[batch.MISSING] == 3
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    errors = sorted(record["error"] for record in records if record["status"] == batch.MISSING)
+    assert errors[0] == f'{manifest}:1: entry has no "file"'
+    assert errors[1].startswith(f"{manifest}:2: invalid JSON: ")
+    assert errors[2] == f'{manifest}:3: entry has no "file"'
+
+
+def test_run_job_captures_and_truncates_output(programs):
+    result = batch.run_job(batch.make_jobs([str(programs / "ok.cmm")])[0])
+    assert result["stdout"] == "hi ada\n" and not result["truncated"]
+    result = batch.run_job(batch.make_jobs([str(programs / "ok.cmm")])[0], max_output=3)
+    assert result["stdout"] == "hi " and result["truncated"]
+
+
+def test_run_job_reports_memory_sites(tmp_path):
+    path = tmp_path / "big.cmm"
+    path.write_text("big = list(range(100000));\nprint(len(big));\n", encoding="utf-8")
+    result = batch.run_job(batch.Job(str(path)), memory_rate=1.0)
+    assert result["status"] == batch.OK
+    assert result["memory"]["sites"][0]["line"] == 1
+    assert "memory" not in batch.run_job(batch.Job(str(path)))
+
+
+def test_run_batch_writes_one_record_per_program(programs):
+    out = io.StringIO()
+    jobs = batch.make_jobs(batch.collect([str(programs)]), max_steps=1000)
+    counts = batch.run_batch(jobs, out, workers=2)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sorted(names([record["file"] for record in records], programs)) == [
+        "ok.cmm", "sub/error.cmm", "sub/loop.cmm", "sub/syntax.cmm"
+    ]
+    assert counts == {batch.OK: 1, batch.RUNTIME_ERROR: 1, batch.MISSING: 0, batch.SYNTAX_ERROR: 1, batch.LIMIT: 1}
+
+
+def test_run_batch_kills_programs_stuck_past_the_deadline(tmp_path):
+    (tmp_path / "power.cmm").write_text("int a = 3;\nint b = a ** 300000000;\n", encoding="utf-8")
+    (tmp_path / "after.cmm").write_text("print(1);\n", encoding="utf-8")
+    out = io.StringIO()
+    jobs = batch.make_jobs([str(tmp_path / "power.cmm"), str(tmp_path / "after.cmm")], timeout=0.2)
+    counts = batch.run_batch(jobs, out, workers=1, grace=0.2)
+    power, after = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert (power["status"], power["error"]) == (batch.LIMIT, "time limit exceeded (0.2 s)")
+    assert power["duration"] < 5
+    assert (after["status"], after["stdout"]) == (batch.OK, "1\n")
+    assert counts[batch.LIMIT] == counts[batch.OK] == 1
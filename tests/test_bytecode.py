@@ -0,0 +1,155 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+
+import pytest
+
+from cmm import bytecode, compiler
+from cmm.runtime import execute
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "prog.cmm"
+    path.write_text('print("one");\n', encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def compiles(monkeypatch):
+    calls = []
+    original = compiler.compile_source
+    
+    def counting(*args, **kwargs):
+        calls.append(args[1] if len(args) > 1 else kwargs.get("filename"))
+        return original(*args, **kwargs)
+    
+    monkeypatch.setattr(compiler, "compile_source", counting)
+    return calls
+
+
+def output_of(code):
+    output = []
+    execute(code, output.append, None)
+    return "".join(output)
+
+
+def rewrite(path, text, same_stat=False):
+    st = os.stat(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    if same_stat:
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    else:
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_cache_is_written_and_reused(source_file, compiles):
+    first = bytecode.compile_file(source_file)
+    target = bytecode.cache_path(source_file)
+    assert os.path.isfile(target)
+    second = bytecode.compile_file(source_file)
+    assert len(compiles) == 1
+    assert output_of(first) == output_of(second) == "one\n"
+
+
+def test_edited_source_invalidates_cache(source_file, compiles):
+    bytecode.compile_file(source_file)
+    rewrite(source_file, 'print("two");\n')
+    assert output_of(bytecode.compile_file(source_file)) == "two\n"
+    assert len(compiles) == 2
+
+
+def test_hash_validation_catches_same_size_and_mtime(source_file, compiles):
+    bytecode.compile_file(source_file, validate=bytecode.VALIDATE_HASH)
+    rewrite(source_file, 'print("eno");\n', same_stat=True)
+    assert output_of(bytecode.compile_file(source_file, validate=bytecode.VALIDATE_HASH)) == "eno\n"
+    assert len(compiles) == 2
+
+
+def test_mtime_validation_trusts_unchanged_stat(source_file, compiles):
+    bytecode.compile_file(source_file)
+    rewrite(source_file, 'print("eno");\n', same_stat=True)
+    assert output_of(bytecode.compile_file(source_file)) == "one\n"
+    assert len(compiles) == 1
+
+
+def test_options_and_language_version_are_part_of_the_key(source_file, compiles, monkeypatch):
+    bytecode.compile_file(source_file, optimize=0)
+    bytecode.compile_file(source_file, optimize=2)
+    bytecode.compile_file(source_file, optimize=2, checkpoints=True)
+    bytecode.compile_file(source_file, optimize=2, checkpoints=True)
+    assert len(compiles) == 3
+    monkeypatch.setattr(bytecode, "LANG_VERSION", "0.0.0-test")
+    bytecode.compile_file(source_file, optimize=2, checkpoints=True)
+    assert len(compiles) == 4
+
+
+@pytest.mark.parametrize("damage", [b"", b"CMMC", b"XXXX" + bytes(100)])
+def test_corrupt_cache_is_recompiled(source_file, compiles, damage):
+    bytecode.compile_file(source_file)
+    target = bytecode.cache_path(source_file)
+    if damage:
+        with open(target, "wb") as f:
+            f.write(damage)
+    else:
+        with open(target, "r+b") as f:
+            f.truncate(os.path.getsize(target) - 5)
+    assert output_of(bytecode.compile_file(source_file)) == "one\n"
+    assert len(compiles) == 2
+    assert bytecode.CacheHeader.read(bytecode.read_file(target)) is not None
+
+
+def test_central_cache_dir(source_file, tmp_path, monkeypatch):
+    monkeypatch.setenv("CMM_CACHE_DIR", str(tmp_path / "central"))
+    bytecode.compile_file(source_file)
+    target = bytecode.cache_path(source_file)
+    assert os.path.dirname(target) == str(tmp_path / "central")
+    assert os.path.isfile(target)
+
+
+def test_prune_removes_stale_and_orphaned_files(source_file, tmp_path):
+    other = tmp_path / "other.cmm"
+    other.write_text("print(2);\n", encoding="utf-8")
+    bytecode.compile_file(source_file)
+    bytecode.compile_file(str(other))
+    rewrite(source_file, 'print("changed");\n')
+    os.unlink(other)
+    kept = tmp_path / "kept.cmm"
+    kept.write_text("print(3);\n", encoding="utf-8")
+    bytecode.compile_file(str(kept))
+    
+    stale = {bytecode.cache_path(source_file), bytecode.cache_path(str(other))}
+    assert set(bytecode.prune(str(tmp_path), dry_run=True)) == stale
+    assert set(bytecode.prune(str(tmp_path))) == stale
+    assert os.listdir(os.path.join(tmp_path, bytecode.CACHE_DIRNAME)) == [
+        os.path.basename(bytecode.cache_path(str(kept)))
+    ]
+
+
+def current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def test_cache_takes_source_permissions(source_file):
+    os.chmod(source_file, 0o644)
+    bytecode.compile_file(source_file)
+    mode = os.stat(bytecode.cache_path(source_file)).st_mode & 0o777
+    assert mode == 0o644 & ~current_umask()
@@ -0,0 +1,173 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+
+def cmm(*args, cwd, stdin="", script=None):
+    command = [sys.executable, "-X", "importtime"]
+    command += [os.path.join(ROOT, script)] if script else ["-m", "cmm"]
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONIOENCODING="utf-8")
+    env.pop("CMM_CACHE_DIR", None)
+    return subprocess.run(command + list(args), cwd=cwd, input=stdin, capture_output=True, text=True, env=env, timeout=60)
+
+
+def write(directory, name, source):
+    path = directory / name
+    path.write_text(source, encoding="utf-8")
+    return name
+
+
+def errors(result):
+    return "\n".join(line for line in result.stderr.splitlines() if not line.startswith("import time:"))
+
+
+def test_run_reads_stdin_and_writes_stdout(tmp_path):
+    name = write(tmp_path, "greet.cmm", 'name = input("name? ");\nprint("hi", name);\n')
+    result = cmm("run", name, cwd=tmp_path, stdin="ada\n")
+    assert (result.returncode, result.stdout, errors(result)) == (0, "name? hi ada\n", "")
+    assert (tmp_path / "__cmmcache__").is_dir()
+
+
+def test_run_does_not_import_the_gui(tmp_path):
+    result = cmm("run", write(tmp_path, "a.cmm", "print(1);\n"), "--no-cache", cwd=tmp_path)
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+    assert result.stdout == "1\n"
+    assert not imported & {"tkinter", "pygments", "asyncio", "multiprocessing"}
+    assert not (tmp_path / "__cmmcache__").exists()
+
+
+@pytest.mark.parametrize("source, status, message", [
+    ("print(1);\nprint(1 / 0);\n", 1, "line 2: ZeroDivisionError: division by zero"),
+    ("print(;\n", 3, "line 1, column 7: expected an expression but found ';'"),
+    ("while (true) {\n}\n", 4, "step limit"),
+])
+def test_run_exit_status(tmp_path, source, status, message):
+    result = cmm("run", write(tmp_path, "prog.cmm", source), "--max-steps", "1000", cwd=tmp_path)
+    assert result.returncode == status
+    assert message in errors(result)
+
+
+def test_run_time_limit_covers_waiting_for_input(tmp_path):
+    name = write(tmp_path, "ask.cmm", 'string name = input("name? ");\nprint(name);\n')
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    with subprocess.Popen([sys.executable, "-m", "cmm", "run", "--timeout", "0.5", name], cwd=tmp_path, env=env,
+                          stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as process:
+        try:
+            process.wait(timeout=30)
+        finally:
+            process.kill()
+        assert (process.returncode, process.stdout.read()) == (4, "name? ")
+        assert "time limit exceeded (0.5 s)" in process.stderr.read()
+
+
+def test_run_missing_file(tmp_path):
+    result = cmm("run", "missing.cmm", cwd=tmp_path)
+    assert result.returncode == 2
+    assert errors(result).startswith("missing.cmm: ")
+
+
+def test_undecodable_files_are_syntax_errors(tmp_path):
+    (tmp_path / "latin1.cmm").write_bytes(b'print("caf\xe9");\n')
+    for command in ("run", "compile"):
+        result = cmm(command, "latin1.cmm", cwd=tmp_path)
+        assert result.returncode == 3
+        assert errors(result).startswith("latin1.cmm: 'utf-8' codec can't decode")
+    result = cmm("compile", "latin1.cmm", "missing.cmm", cwd=tmp_path)
+    assert result.returncode == 3
+    assert "missing.cmm: " in errors(result)
+
+
+def test_check_reports_every_bad_file(tmp_path):
+    good = write(tmp_path, "good.cmm", "print(1);\n")
+    bad = write(tmp_path, "bad.cmm", "print(1\n")
+    result = cmm("check", "-v", good, bad, "gone.cmm", cwd=tmp_path)
+    assert result.returncode == 3
+    assert result.stdout == "good.cmm: ok\n"
+    assert "bad.cmm, line 2" in errors(result) and "gone.cmm: " in errors(result)
+
+
+def test_compile_then_prune(tmp_path):
+    name = write(tmp_path, "prog.cmm", "print(1);\n")
+    assert cmm("compile", name, cwd=tmp_path).returncode == 0
+    os.unlink(tmp_path / name)
+    result = cmm("prune", cwd=tmp_path)
+    assert result.returncode == 0
+    assert result.stdout.strip().endswith(".cmmc")
+    assert os.listdir(tmp_path / "__cmmcache__") == []
+
+
+def test_ide_script_runs_headless(tmp_path):
+    result = cmm("run", write(tmp_path, "a.cmm", 'print("ok");\n'), cwd=tmp_path, script="Dev-C--.py")
+    assert (result.returncode, result.stdout) == (0, "ok\n")
+    assert " tkinter" not in result.stderr
+
+
+def test_ide_script_dispatches_every_command(tmp_path):
+    from cmm.__main__ import command_names
+    
+    assert {"run", "batch", "serve", "search", "check", "compile", "prune"} <= set(command_names())
+    for name in command_names():
+        result = cmm(name, "--help", cwd=tmp_path, script="Dev-C--.py")
+        assert result.returncode == 0
+        assert result.stdout.startswith(f"usage: python -m cmm {name}")
+        assert " tkinter" not in result.stderr
+
+
+def test_batch_writes_json_lines(tmp_path):
+    write(tmp_path, "a.cmm", "print(1);\n")
+    write(tmp_path, "b.cmm", "print(1 / 0);\n")
+    result = cmm("batch", ".", "-j", "2", "-o", "results.jsonl", cwd=tmp_path)
+    assert result.returncode == 1
+    assert "2 programs in" in errors(result) and "1 ok, 1 error" in errors(result)
+    records = (tmp_path / "results.jsonl").read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["status"] for line in records) == ["error", "ok"]
+
+
+def test_run_profile(tmp_path):
+    name = write(tmp_path, "prog.cmm", "int total = 0;\nfor (int i = 0; i < 50; i++) {\n    total += i;\n}\nprint(total);\n")
+    result = cmm("run", name, "--profile", "--top", "2", "--profile-output", "out.json", cwd=tmp_path)
+    assert (result.returncode, result.stdout) == (0, "1225\n")
+    report = errors(result).split("profile: ", 1)[1].splitlines()
+    assert report[1].split()[0] == "line" and len(report) == 4
+    assert json.loads((tmp_path / "out.json").read_text(encoding="utf-8"))["exporter"] == "cmm"
+
+
+def test_run_memory_report(tmp_path):
+    name = write(tmp_path, "prog.cmm", "big = list(range(100000));\nprint(len(big));\n")
+    result = cmm("run", name, "--memory-rate", "1", "--top", "1", cwd=tmp_path)
+    assert (result.returncode, result.stdout) == (0, "100000\n")
+    report = errors(result).split("memory: ", 1)[1].splitlines()
+    assert report[0].startswith("peak ") and report[1].split()[0] == "line"
+    assert report[2].split()[0] == "1"
+
+
+def test_search_prints_hits(tmp_path):
+    write(tmp_path, "a.cmm", 'print("needle");\n')
+    write(tmp_path, "b.cmm", "print(1);\n")
+    result = cmm("search", "NEEDLE", cwd=tmp_path)
+    assert (result.returncode, result.stdout, errors(result)) == (0, f'{os.path.join(".", "a.cmm")}:1:8: print("needle");\n', "")
+    assert cmm("search", "needle", "--case", "-e", cwd=tmp_path).returncode == 0
+    assert cmm("search", "missing", cwd=tmp_path).returncode == 1
+    assert cmm("search", "(", "--regex", cwd=tmp_path).returncode == 2
@@ -0,0 +1,44 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from cmm.compiler import CompileCache, compile_source
+
+
+def test_cache_returns_the_same_code_object():
+    cache = CompileCache()
+    code = compile_source("print(1);", "a.cmm", cache)
+    assert compile_source("print(1);", "a.cmm", cache) is code
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert compile_source("print(1);", "b.cmm", cache) is not code
+    assert compile_source("print(2);", "a.cmm", cache) is not code
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CompileCache(maxsize=2)
+    first = compile_source("print(1);", "a.cmm", cache)
+    compile_source("print(2);", "a.cmm", cache)
+    compile_source("print(1);", "a.cmm", cache)
+    compile_source("print(3);", "a.cmm", cache)
+    assert len(cache.entries) == 2
+    assert compile_source("print(1);", "a.cmm", cache) is first
+    misses = cache.misses
+    compile_source("print(2);", "a.cmm", cache)
+    assert cache.misses == misses + 1
+
+
+def test_no_cache_always_compiles():
+    assert compile_source("print(1);", cache=None) is not compile_source("print(1);", cache=None)
@@ -0,0 +1,123 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from conftest import load_ide
+
+ide = load_ide()
+
+
+class FakeRoot:
+    def __init__(self):
+        self.jobs = {}
+    
+    def after(self, delay, callback):
+        job = len(self.jobs) + 1
+        self.jobs[job] = callback
+        return job
+    
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+    
+    def run_jobs(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+class FakeConsole:
+    def __init__(self):
+        self.content = ""
+        self.inserts = []
+        self.state = "disabled"
+    
+    def config(self, state):
+        self.state = state
+    
+    def see(self, index):
+        pass
+    
+    def offset(self, index):
+        if index in ("end", "end-1c"):
+            return len(self.content)
+        line = int(index.split(".")[0])
+        return sum(len(text) + 1 for text in self.content.split("\n")[:line - 1])
+    
+    def index(self, index):
+        return f"{self.content[:self.offset(index)].count(chr(10)) + 1}.0"
+    
+    def insert(self, index, *args):
+        assert index == "end" and self.state == "normal"
+        self.inserts.append(args)
+        self.content += "".join(args[::2])
+    
+    def get(self, first, last):
+        return self.content[self.offset(first):self.offset(last)]
+    
+    def delete(self, first, last):
+        assert self.state == "normal"
+        self.content = self.content[:self.offset(first)] + self.content[self.offset(last):]
+
+
+def console(**options):
+    root = FakeRoot()
+    widget = FakeConsole()
+    return root, widget, ide.ConsoleBuffer(root, widget, **options)
+
+
+def test_writes_are_batched_into_one_insert():
+    root, widget, buffer = console()
+    buffer.write("a")
+    buffer.write("b\n")
+    buffer.write("oops\n", "error")
+    buffer.write("c\n")
+    assert len(root.jobs) == 1 and widget.inserts == []
+    root.run_jobs()
+    assert widget.inserts == [("ab\n", (), "oops\n", "error", "c\n", ())]
+    assert widget.state == "disabled"
+
+
+def test_scrollback_is_capped_and_spilled_to_the_log(tmp_path):
+    root, widget, buffer = console(max_lines=5)
+    buffer.log_path = str(tmp_path / "console.log")
+    for i in range(12):
+        buffer.write(f"line {i}\n")
+    root.run_jobs()
+    assert widget.content == "".join(f"line {i}\n" for i in range(8, 12))
+    assert open(buffer.log_path, encoding="utf-8").read() == "".join(f"line {i}\n" for i in range(8))
+
+
+def test_pending_output_is_bounded_between_flushes(tmp_path):
+    root, widget, buffer = console(max_lines=10)
+    buffer.log_path = str(tmp_path / "console.log")
+    for i in range(1000):
+        buffer.write(f"{i}\n", "error" if i % 3 == 0 else None)
+    assert buffer.pending_lines <= 20
+    root.run_jobs()
+    lines = widget.content.splitlines()
+    assert lines[-1] == "999" and len(lines) <= 10
+    spilled = open(buffer.log_path, encoding="utf-8").read().splitlines()
+    assert spilled + lines == [str(i) for i in range(1000)]
+
+
+def test_clear_drops_pending_output():
+    root, widget, buffer = console()
+    buffer.write("x\n")
+    buffer.clear()
+    assert root.jobs == {}
+    buffer.write("y\n")
+    root.run_jobs()
+    assert widget.content == "y\n"
@@ -0,0 +1,273 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import random
+import re
+
+from conftest import load_ide
+
+devcmm = load_ide()
+
+INDEX = re.compile(r"(end|(\d+)\.(\d+|end))((?:[+-]\d+c)*)")
+
+
+class FakeText:
+    def __init__(self, content=""):
+        self.buffer = content + "\n"
+        self.idle = []
+        self.tracker = FakeTracker(self)
+    
+    def offset(self, index):
+        match = INDEX.fullmatch(str(index))
+        base, line, column, adjust = match.groups()
+        lines = self.buffer.split("\n")
+        if base == "end" or int(line) > len(lines) - 1:
+            offset = len(self.buffer)
+        else:
+            line = max(int(line), 1)
+            length = len(lines[line - 1])
+            offset = sum(len(text) + 1 for text in lines[:line - 1])
+            offset += length if column == "end" else min(int(column), length)
+        offset += sum(int(step[:-1]) for step in re.findall(r"[+-]\d+c", adjust))
+        return max(0, min(offset, len(self.buffer)))
+    
+    def index_of(self, offset):
+        before = self.buffer[:offset]
+        return f"{before.count(chr(10)) + 1}.{offset - before.rfind(chr(10)) - 1}"
+    
+    def raw(self, command, *args):
+        if command == "index":
+            return self.index_of(self.offset(args[0]))
+        if command == "compare":
+            left, op, right = self.offset(args[0]), args[1], self.offset(args[2])
+            return {"<": left < right, "<=": left <= right, "==": left == right,
+                    ">=": left >= right, ">": left > right, "!=": left != right}[op]
+        if command == "get":
+            return self.buffer[self.offset(args[0]):self.offset(args[1])]
+        last = len(self.buffer) - 1
+        if command == "insert":
+            at = min(self.offset(args[0]), last)
+            self.buffer = self.buffer[:at] + "".join(args[1::2]) + self.buffer[at:]
+        elif command == "delete":
+            start = self.offset(args[0])
+            end = self.offset(args[1]) if len(args) > 1 else start + 1
+            end = min(end, last)
+            if start < end:
+                self.buffer = self.buffer[:start] + self.buffer[end:]
+    
+    def insert(self, index, chars):
+        self.tracker.dispatch("insert", index, chars)
+    
+    def delete(self, first, last=None):
+        self.tracker.dispatch("delete", *((first,) if last is None else (first, last)))
+    
+    def index(self, index):
+        return self.raw("index", index)
+    
+    def get(self, first, last):
+        return self.raw("get", first, last)
+    
+    def content(self):
+        return self.buffer[:-1]
+    
+    def after_idle(self, callback):
+        self.idle.append(callback)
+        return callback
+    
+    def after_cancel(self, job):
+        if job in self.idle:
+            self.idle.remove(job)
+    
+    def flush(self):
+        while self.idle:
+            self.idle.pop(0)()
+
+
+class FakeTracker(devcmm.TextChangeTracker):
+    def __init__(self, widget):
+        self.widget = widget
+        self.listeners = [lambda first, old_last, new_last: None]
+        self.recorder = None
+    
+    def call(self, *args):
+        return self.widget.raw(*args)
+
+
+def history(content="", **options):
+    text = FakeText(content)
+    return text, devcmm.UndoHistory(text, text.tracker, **options)
+
+
+def end(text):
+    return text.index("end-1c")
+
+
+def test_typing_coalesces_into_one_group():
+    text, undo = history()
+    for char in "hello":
+        text.insert(end(text), char)
+        text.flush()
+    assert len(undo.undo_stack) == 1
+    assert undo.undo_stack[0].ops == [[1, 0, "", "hello"]]
+    assert undo.undo() == "1.0"
+    assert text.content() == ""
+    undo.redo()
+    assert text.content() == "hello"
+
+
+def test_newline_and_pauses_break_groups(monkeypatch):
+    text, undo = history()
+    for char in "ab\ncd":
+        text.insert(end(text), char)
+        text.flush()
+    assert len(undo.undo_stack) == 3
+    undo.undo()
+    assert text.content() == "ab\n"
+    
+    monkeypatch.setattr(devcmm.UndoHistory, "COALESCE_SECONDS", 0.0)
+    text.insert(end(text), "x")
+    text.flush()
+    text.insert(end(text), "y")
+    text.flush()
+    undo.undo()
+    assert text.content() == "ab\nx"
+
+
+def test_backspace_and_forward_delete_coalesce():
+    text, undo = history("abcdef")
+    for column in (5, 4, 3):
+        text.delete(f"1.{column}")
+        text.flush()
+    assert text.content() == "abc"
+    text.delete("1.0")
+    text.flush()
+    text.delete("1.0")
+    text.flush()
+    assert text.content() == "c"
+    assert len(undo.undo_stack) == 2
+    undo.undo()
+    assert text.content() == "abc"
+    undo.undo()
+    assert text.content() == "abcdef"
+
+
+def test_byte_cap_drops_oldest_groups():
+    text, undo = history(max_bytes=100)
+    for i in range(50):
+        text.insert("end", f"line {i}\n")
+        text.flush()
+    assert undo.size <= 100
+    assert sum(group.size for group in undo.undo_stack) == undo.size
+    dropped = 50 - len(undo.undo_stack)
+    assert dropped > 0
+    while undo.undo():
+        pass
+    assert text.content() == "".join(f"line {i}\n" for i in range(dropped))
+    assert not undo.is_clean()
+
+
+def test_clean_state_tracking():
+    text, undo = history()
+    assert undo.is_clean()
+    text.insert("end", "one\n")
+    assert not undo.is_clean()
+    undo.mark_clean()
+    assert undo.is_clean()
+    text.insert(end(text), "q")
+    text.flush()
+    assert not undo.is_clean()
+    undo.undo()
+    assert undo.is_clean()
+    undo.undo()
+    assert not undo.is_clean()
+
+
+def test_large_groups_are_compressed():
+    text, undo = history(compress_threshold=50)
+    text.insert("end", "x" * 200 + "\n")
+    text.flush()
+    group = undo.undo_stack[-1]
+    assert group.compressed and group.size < 200
+    undo.undo()
+    assert text.content() == ""
+    undo.redo()
+    assert text.content() == "x" * 200 + "\n"
+
+
+def test_random_edits_round_trip():
+    rng = random.Random(1)
+    text, undo = history(compress_threshold=20)
+    for _ in range(300):
+        length = len(text.content())
+        if rng.random() < 0.6 or length == 0:
+            position = text.index_of(rng.randint(0, length))
+            text.insert(position, rng.choice(["a", "b", "\n", "xyz\nq", "long" * 10]))
+        else:
+            start = rng.randint(0, length - 1)
+            stop = rng.randint(start + 1, min(length, start + 8))
+            text.delete(text.index_of(start), text.index_of(stop))
+        if rng.random() < 0.5:
+            text.flush()
+    text.flush()
+    final = text.content()
+    while undo.undo():
+        pass
+    assert text.content() == ""
+    while undo.redo():
+        pass
+    assert text.content() == final
+
+
+def matches_of(text, pattern):
+    index = devcmm.SearchIndex(text, text.tracker)
+    index.set_pattern(pattern)
+    while index.catch_up():
+        pass
+    return index
+
+
+def test_search_index_follows_edits():
+    rng = random.Random(2)
+    lines = ["".join(rng.choice("ab ") for _ in range(rng.randint(0, 12))) for _ in range(300)]
+    text = FakeText("\n".join(lines))
+    pattern = devcmm.SearchIndex.compile("ab")
+    index = devcmm.SearchIndex(text, text.tracker)
+    index.CHUNK_LINES = 50
+    index.set_pattern(pattern)
+    index.catch_up()
+    for step in range(200):
+        length = len(text.content())
+        start = rng.randint(0, length)
+        if rng.random() < 0.6:
+            text.insert(text.index_of(start), rng.choice(["ab", "a", "b\nab", "\n", "xx\n\nab"]))
+        elif length:
+            text.delete(text.index_of(start), text.index_of(min(length, start + rng.randint(1, 30))))
+        if step % 7 == 0:
+            index.catch_up()
+    while index.catch_up():
+        pass
+    assert index.matches == matches_of(FakeText(text.content()), pattern).matches
+
+
+def test_search_find_wraps():
+    text = FakeText("cat\ndog cat\n\ncat")
+    index = matches_of(text, devcmm.SearchIndex.compile("CAT"))
+    assert index.matches == [(1, 0, 3), (2, 4, 7), (4, 0, 3)]
+    assert index.find("2.5") == (4, 0, 3)
+    assert index.find("4.1") == (1, 0, 3)
+    assert index.find("1.0", backwards=True) == (4, 0, 3)
+    assert matches_of(FakeText("cat"), devcmm.SearchIndex.compile("CAT", match_case=True)).matches == []
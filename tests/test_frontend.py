@@ -0,0 +1,68 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import pytest
+
+from cmm import CmmRuntimeError, CmmSyntaxError, compile_source, parse
+
+
+@pytest.mark.parametrize("source, message, line, col", [
+    ("int x = ;", "expected an expression but found ';'", 1, 9),
+    ("print(1", "expected ',' or ')' but found end of file", 1, 8),
+    ("if (x) {\n    print(1);\n", "expected '}' but found end of file", 3, 1),
+    ("x = \"abc;", "unterminated string literal", 1, 5),
+    ("x = 1 +* 2;", "expected an expression but found '*'", 1, 8),
+    ("x = 1;\n@", "unexpected character '@'", 2, 1),
+    ("return 1;", "'return' outside of a function", 1, 1),
+    ("break;", "'break' outside of a loop", 1, 1),
+    ("int f(int a, int a) {\n    return a;\n}", "duplicate parameter 'a'", 1, 19),
+])
+def test_syntax_errors_report_location(source, message, line, col):
+    with pytest.raises(CmmSyntaxError) as info:
+        compile_source(source, "bad.cmm", cache=None)
+    error = info.value
+    assert error.message == message
+    assert (error.line, error.col, error.filename) == (line, col, "bad.cmm")
+    assert str(error) == f"bad.cmm, line {line}, column {col}: {message}"
+
+
+def test_parse_reports_first_error_only():
+    with pytest.raises(CmmSyntaxError) as info:
+        parse("x = ;\ny = ;\n", "two.cmm")
+    assert info.value.line == 1
+
+
+@pytest.mark.parametrize("source, message, line", [
+    ("x = 1;\nprint(x / 0);", "ZeroDivisionError: division by zero", 2),
+    ("print(y);", "NameError: name 'y' is not defined", 1),
+    ("x = [1];\n\nprint(x[5]);", "IndexError: list index out of range", 3),
+])
+def test_runtime_errors_map_to_source_lines(run, source, message, line):
+    with pytest.raises(CmmRuntimeError) as info:
+        run(source)
+    assert info.value.message == message
+    assert info.value.line == line
+
+
+def test_input_reads_lines_and_raises_at_end(run):
+    assert run('name = input("name? ");\nprint("hi", name);', inputs=["ada"]) == "hi ada\n"
+    with pytest.raises(CmmRuntimeError):
+        run("input();")
+
+
+def test_values_print_in_cmm_syntax(run):
+    assert run('print(true, false, null, [1, "a"], 2 ** 4);') == 'true false null [1, "a"] 16\n'
@@ -0,0 +1,108 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from cmm.errors import CmmLimitError
+from cmm.limits import CANCELLED, MEMORY_LIMIT, STEP_LIMIT, TIME_LIMIT, Limits, Supervisor
+
+from conftest import ROOT, run_source
+
+FOREVER = "int i = 0;\nwhile (true) {\n    i = i + 1;\n}\n"
+
+
+def stopped(source, limits, checkpoints=False, after=None):
+    supervisor = Supervisor(limits)
+    if after is not None:
+        timer = threading.Timer(after, supervisor.interrupt)
+        timer.start()
+    start = time.perf_counter()
+    try:
+        with pytest.raises(CmmLimitError) as info:
+            run_source(source, supervisor=supervisor, checkpoints=checkpoints)
+    finally:
+        if after is not None:
+            timer.cancel()
+    return info.value, time.perf_counter() - start
+
+
+def test_step_limit():
+    error, _ = stopped(FOREVER, Limits(max_steps=10_000), checkpoints=True)
+    assert error.reason == STEP_LIMIT
+    assert error.line is not None
+
+
+def test_steps_below_limit_run_to_completion():
+    source = "int total = 0;\nfor (int i = 0; i < 100; i++) {\n    total = total + i;\n}\nprint(total);\n"
+    output = run_source(source, supervisor=Supervisor(Limits(max_steps=10_000)), checkpoints=True)
+    assert output == "4950\n"
+
+
+def test_time_limit():
+    error, elapsed = stopped(FOREVER, Limits(timeout=0.3))
+    assert error.reason == TIME_LIMIT
+    assert elapsed < 5
+
+
+def test_memory_limit():
+    error, elapsed = stopped('string x = "a";\nwhile (true) {\n    x = x + x;\n}\n', Limits(max_memory=64 << 20))
+    assert error.reason == MEMORY_LIMIT
+    assert elapsed < 5
+
+
+def test_cancel():
+    error, elapsed = stopped(FOREVER, Limits(), after=0.2)
+    assert error.reason == CANCELLED
+    assert elapsed < 5
+
+
+TRACED_AFTER_LIMIT = """
+import sys
+import threading
+
+from cmm.compiler import compile_source
+from cmm.errors import CmmLimitError
+from cmm.limits import Limits, Supervisor
+from cmm.runtime import execute
+
+supervisor = Supervisor(Limits(max_steps=int(sys.argv[1])))
+threading.Timer(0.1, supervisor.interrupt).start()
+try:
+    execute(compile_source("while (true) {\\n}\\n", cache=None, checkpoints=True), sys.stdout.write, input, supervisor)
+except CmmLimitError as e:
+    print(e.reason)
+
+
+def tracer(frame, event, arg):
+    return tracer
+
+
+sys.settrace(tracer)
+execute(compile_source("print(1);", cache=None), sys.stdout.write, input)
+"""
+
+
+@pytest.mark.parametrize("max_steps, reason", [(10, STEP_LIMIT), (10 ** 9, CANCELLED)])
+def test_stopped_run_leaves_no_pending_interrupt(max_steps, reason):
+    result = subprocess.run([sys.executable, "-c", TRACED_AFTER_LIMIT, str(max_steps)], cwd=ROOT,
+                            capture_output=True, text=True, timeout=30)
+    assert (result.returncode, result.stdout) == (0, f"{reason}\n1\n")
@@ -0,0 +1,78 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import time
+
+import pytest
+
+from conftest import load_ide
+
+ide = load_ide()
+
+
+def load(path, chunk_bytes=64):
+    loader = ide.FileLoader(str(path))
+    loader.CHUNK_BYTES = chunk_bytes
+    try:
+        while loader.scanning():
+            loader.scan(time.perf_counter())
+        texts = []
+        while not loader.done():
+            texts.append(loader.next_text())
+        return loader, texts
+    finally:
+        loader.close()
+
+
+def test_chunks_end_on_line_boundaries(tmp_path):
+    lines = [f"line {i} " + "x" * (i % 40) + "\r\n" for i in range(500)]
+    path = tmp_path / "big.cmm"
+    path.write_bytes("".join(lines).encode("utf-8"))
+    loader, texts = load(path)
+    assert len(texts) > 10
+    assert all(text.endswith("\n") and "\r" not in text for text in texts)
+    assert "".join(texts) == "".join(lines).replace("\r\n", "\n")
+    assert loader.lines == 501
+    assert loader.loaded_bytes() == loader.size
+
+
+def test_line_count_is_known_before_inserting(tmp_path):
+    path = tmp_path / "big.cmm"
+    path.write_bytes(b"a\n" * 1000 + b"tail")
+    loader = ide.FileLoader(str(path))
+    loader.CHUNK_BYTES = 100
+    try:
+        loader.scan(0)
+        assert loader.scanning() and len(loader.chunks) == 1
+        while loader.scanning():
+            loader.scan(time.perf_counter() + 1)
+        assert loader.lines == 1001
+        assert loader.loaded_lines() == 0
+        first = loader.next_text()
+        assert loader.loaded_lines() == first.count("\n")
+        while not loader.done():
+            loader.next_text()
+        assert loader.loaded_lines() == 1001
+    finally:
+        loader.close()
+
+
+def test_empty_files_cannot_be_mapped(tmp_path):
+    path = tmp_path / "empty.cmm"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        ide.FileLoader(str(path))
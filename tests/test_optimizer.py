@@ -0,0 +1,123 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import sys
+
+import pytest
+
+from cmm import CmmRuntimeError, O0, O1, O2
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from parse_throughput import make_source
+
+LEVELS = (O0, O1, O2)
+
+CASES = dict(generated=make_source(200), recursion="""int fib(int n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+print(fib(15));
+""", strings="""text = "";
+for (int i = 0; i < 200; i++) {
+    text = text + "item " + str(i) + ";";
+}
+print(len(text), text[0], text[-1]);
+""", folding="""x = 2 * 3 + 4;
+y = "ab" + "cd";
+z = 7 / 2 + 7 % 3 - 2 ** 10;
+print(x, y, z, 1 < 2, "a" == "a", -(3 - 5), !false);
+""", dead_code="""int f(int n) {
+    if (n > 0) {
+        return n;
+        print("unreachable");
+    }
+    while (false) {
+        print("never");
+    }
+    return -1;
+}
+if (false) {
+    print(1 / 0);
+} else {
+    print(f(3), f(-3));
+}
+""", invariants="""int scale = 3;
+int offset = 10;
+int total = 0;
+for (int i = 0; i < 50; i++) {
+    total += i * (scale * offset + 1);
+    if (i == 40) {
+        scale = 5;
+    }
+}
+print(total, scale);
+""", loops="""out = "";
+for (int i = 10; i >= 0; i -= 3) {
+    out = out + str(i) + ",";
+}
+for (int j = 0; j <= 6; j++) {
+    if (j == 2) {
+        continue;
+    }
+    if (j == 5) {
+        break;
+    }
+    out = out + str(j);
+}
+float f = 0.5;
+for (f = 0.5; f < 2; f += 0.5) {
+    out = out + "|" + str(f);
+}
+int k = 0;
+for (k = 0; k < 3; k++) {
+}
+print(out, k, f);
+""", mutated_bound="""int n = 5;
+int count = 0;
+for (int i = 0; i < n; i++) {
+    n = n - 1;
+    count += 1;
+}
+print(count, n);
+""")
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_levels_produce_identical_output(run, name):
+    outputs = [run(CASES[name], optimize=level) for level in LEVELS]
+    assert outputs[0]
+    assert outputs[1] == outputs[0]
+    assert outputs[2] == outputs[0]
+
+
+@pytest.mark.parametrize("source", [
+    "print(1 / 0);",
+    "x = 0;\nprint(10 % x);",
+    'print("a" - 1);',
+])
+def test_levels_fail_the_same_way(run, source):
+    errors = []
+    for level in LEVELS:
+        with pytest.raises(CmmRuntimeError) as info:
+            run(source, optimize=level)
+        errors.append((info.value.message, info.value.line))
+    assert errors[1] == errors[0]
+    assert errors[2] == errors[0]
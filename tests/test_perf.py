@@ -0,0 +1,73 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import time
+
+import pytest
+
+from conftest import load_ide
+
+ide = load_ide()
+
+
+def test_wrap_times_calls_and_keeps_results():
+    monitor = ide.PerfMonitor()
+    timed = monitor.wrap("render", lambda value: value * 2)
+    assert timed(21) == 42
+    failing = monitor.wrap("fail", lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        failing()
+    assert [event[0] for event in monitor.events] == ["render", "fail"]
+    assert all(duration >= 0 for name, start, duration in monitor.events)
+
+
+def test_stats_are_percentiles_over_the_window():
+    monitor = ide.PerfMonitor(window=10)
+    now = time.perf_counter()
+    for i in range(100):
+        monitor.record("key", now, (i + 1) / 1000)
+    monitor.record("key", now - 60, 5.0)
+    monitor.record(monitor.IDLE, now, 0.004)
+    rows = dict((row[0], row[1:]) for row in monitor.stats())
+    count, p50, p95, p99, peak = rows["key"]
+    assert count == 100
+    assert (p50, p95, p99, peak) == (0.051, 0.096, 0.1, 0.1)
+    assert rows[monitor.IDLE][0] == 1
+    report = monitor.report().splitlines()
+    assert report[0].split() == ["count", "p50", "ms", "p95", "ms", "p99", "ms", "max", "ms"]
+    assert report[1].split()[:3] == [monitor.IDLE, "1", "4.00"]
+
+
+def test_events_are_bounded():
+    monitor = ide.PerfMonitor(max_events=10)
+    for i in range(100):
+        monitor.record("key", time.perf_counter(), 0.001)
+    assert len(monitor.events) == 10
+
+
+def test_dump_writes_a_chrome_trace(tmp_path):
+    monitor = ide.PerfMonitor()
+    start = time.perf_counter()
+    monitor.record("highlight", start, 0.002)
+    monitor.record(monitor.IDLE, start, 0.001)
+    path = tmp_path / "trace.json"
+    monitor.dump(str(path))
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert [(event["name"], event["tid"], event["dur"]) for event in spans] == [("highlight", 1, 2000.0), (monitor.IDLE, 2, 1000.0)]
+    assert trace["otherData"]["summary"]["highlight"]["count"] == 1
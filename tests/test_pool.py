@@ -0,0 +1,134 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import threading
+import time
+
+import pytest
+
+from cmm.batch import LIMIT, OK, RUNTIME_ERROR, SYNTAX_ERROR
+from cmm.limits import Limits
+from cmm.pool import WarmPool
+
+FOREVER = "int i = 0;\nwhile (true) {\n    i = i + 1;\n}\n"
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with WarmPool(2, grace=0.2) as pool:
+        yield pool
+
+
+def pids(pool):
+    return {worker.process.pid for worker in pool.workers}
+
+
+def test_run_reuses_warm_workers(pool):
+    before = pids(pool)
+    for _ in range(3):
+        result = pool.run('print("hi", input());\n', input_text="ada\n")
+        assert result == dict(result, status=OK, stdout="hi ada\n", error=None)
+    assert pids(pool) == before
+    assert pool.programs.hits >= 2
+
+
+def test_errors_are_reported(pool):
+    result = pool.run("print(;\n", "bad.cmm")
+    assert result["status"] == SYNTAX_ERROR and result["error"].startswith("bad.cmm, line 1")
+    result = pool.run("print(1);\nprint(1 / 0);\n", "div.cmm")
+    assert result["status"] == RUNTIME_ERROR and result["stdout"] == "1\n"
+    assert result["error"] == "div.cmm, line 2: ZeroDivisionError: division by zero"
+
+
+def test_output_can_be_streamed(pool):
+    chunks = []
+    result = pool.run("for (int i = 0; i < 3; i++) {\n    print(i);\n}\n", on_output=chunks.append)
+    assert result["status"] == OK
+    assert "".join(chunks) == "0\n1\n2\n"
+
+
+def test_time_limit_recycles_worker(pool):
+    result = pool.run(FOREVER, limits=Limits(timeout=0.3))
+    assert result["status"] == LIMIT
+    assert pool.run("print(1);\n")["stdout"] == "1\n"
+
+
+def test_time_spent_waiting_for_a_worker_does_not_count():
+    holding = threading.Event()
+    slow = "int i = 0;\nwhile (i < 300000) {\n    i = i + 1;\n}\nprint(i);\n"
+    
+    def hold(prompt, timeout):
+        holding.set()
+        time.sleep(1.0)
+        return "done"
+    
+    with WarmPool(1, grace=0.1) as pool:
+        holder = threading.Thread(target=pool.run, args=('string name = input("? ");\n',),
+                                  kwargs=dict(on_output=lambda text: None, on_input=hold))
+        holder.start()
+        assert holding.wait(10)
+        result = pool.run(slow, limits=Limits(timeout=0.5))
+        holder.join()
+    assert (result["status"], result["stdout"]) == (OK, "300000\n")
+
+
+def test_input_wait_respects_time_limit(pool):
+    def on_input(prompt, timeout):
+        assert timeout is not None and timeout <= 0.5
+        raise TimeoutError
+    
+    result = pool.run('string name = input("name? ");\nprint(name);\n', limits=Limits(timeout=0.3),
+                      on_output=lambda text: None, on_input=on_input)
+    assert result["status"] == LIMIT
+    result = pool.run("print(2);\n")
+    assert result["status"] == OK and result["stdout"] == "2\n"
+
+
+def test_input_wait_respects_cancel(pool):
+    cancel = threading.Event()
+    
+    def on_input(prompt, timeout):
+        cancel.set()
+        return "ignored"
+    
+    result = pool.run('string name = input("name? ");\nprint(name);\n', on_output=lambda text: None,
+                      on_input=on_input, cancel=cancel)
+    assert result == dict(result, status=LIMIT, error="execution cancelled")
+    assert pool.run("print(3);\n")["stdout"] == "3\n"
+
+
+def test_concurrent_runs_share_the_pool(pool):
+    results = {}
+    
+    def run(n):
+        results[n] = pool.run(f"print({n} * {n});\n", f"{n % 3}.cmm")
+    
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    assert {n: result["stdout"] for n, result in results.items()} == {n: f"{n * n}\n" for n in range(12)}
+
+
+def test_workers_are_replaced_after_max_runs():
+    with WarmPool(1, max_runs=2) as pool:
+        first = pids(pool)
+        pool.run("print(1);\n")
+        pool.run("print(2);\n")
+        assert pool.run("print(3);\n")["stdout"] == "3\n"
+        assert pids(pool) and pids(pool) != first
@@ -0,0 +1,140 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import sys
+import tracemalloc
+
+import pytest
+
+from cmm.profiler import MAIN, LineProfiler, MemoryProfiler
+
+from conftest import run_source
+
+SOURCE = """int square(int n) {
+    return n * n;
+}
+int total = 0;
+for (int i = 0; i < 100; i++) {
+    total += square(i);
+}
+print(total);
+"""
+
+FIB = """int fib(int n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+print(fib(12));
+"""
+
+
+def profiled(source):
+    profiler = LineProfiler("test.cmm")
+    output = run_source(source, profiler=profiler)
+    return profiler, output
+
+
+def test_counts_hits_per_line():
+    profiler, output = profiled(SOURCE)
+    assert output == "328350\n"
+    assert profiler.hits[2] == 100 and profiler.hits[6] == 100
+    assert profiler.hits[4] == 1 and profiler.hits[8] == 1
+    assert profiler.total[6] >= profiler.own[6] + profiler.own[2]
+
+
+def test_recursive_calls_are_not_counted_twice():
+    profiler, _ = profiled(FIB)
+    assert profiler.hits[2] == 465
+    assert max(profiler.total.values()) <= profiler.elapsed
+    assert sum(profiler.own.values()) <= profiler.elapsed
+
+
+def test_tracer_is_restored():
+    before = sys.gettrace()
+    profiled(SOURCE)
+    assert sys.gettrace() is before
+    profiler = LineProfiler("test.cmm")
+    with pytest.raises(Exception):
+        run_source("print(1);\nprint(1 / 0);\n", profiler=profiler)
+    assert sys.gettrace() is before
+    assert profiler.hits == {1: 1, 2: 1}
+
+
+def test_report_and_heat():
+    profiler, _ = profiled(SOURCE)
+    report = profiler.report(SOURCE, limit=3).splitlines()
+    assert report[0].split()[:5] == ["line", "hits", "total", "ms", "self"]
+    assert len(report) == 4
+    assert any(row.endswith("total += square(i);") or row.endswith("return n * n;") for row in report[1:])
+    heat = profiler.heat()
+    assert max(heat.values()) == 1.0 and all(0 < value <= 1 for value in heat.values())
+
+
+def test_exports(tmp_path):
+    profiler, _ = profiled(SOURCE)
+    assert ((MAIN, 6), ("square", 2)) in profiler.stacks()
+    
+    profiler.export(str(tmp_path / "profile.txt"))
+    collapsed = (tmp_path / "profile.txt").read_text(encoding="utf-8").splitlines()
+    assert any(line.startswith(f"{MAIN}:6;square:2 ") for line in collapsed)
+    assert all(int(line.rsplit(" ", 1)[1]) >= 1 for line in collapsed)
+    
+    profiler.export(str(tmp_path / "profile.json"))
+    document = json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))
+    profile = document["profiles"][0]
+    names = [frame["name"] for frame in document["shared"]["frames"]]
+    assert f"{MAIN}:6" in names and "square:2" in names
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert profile["endValue"] == sum(profile["weights"])
+
+
+ALLOCATING = """int n = 200000;
+big = list(range(n));
+small = [1, 2, 3];
+print(len(big), len(small));
+"""
+
+
+def test_memory_profiler_attributes_allocations_to_lines():
+    profiler = MemoryProfiler("test.cmm", rate=1.0)
+    assert run_source(ALLOCATING, memory_profiler=profiler) == "200000 3\n"
+    assert not tracemalloc.is_tracing()
+    line, size, blocks = profiler.sites[0]
+    assert line == 2 and size > 200000 * 28 and blocks > 100000
+    assert profiler.windows == 1
+    assert profiler.peak is None or profiler.peak >= 0
+    
+    report = profiler.report(ALLOCATING, limit=1).splitlines()
+    assert report[0].split() == ["line", "KiB", "blocks", "code"]
+    assert report[1].split()[0] == "2" and report[1].endswith("big = list(range(n));")
+    summary = profiler.as_dict(limit=1)
+    assert summary["sites"] == [{"line": 2, "bytes": size, "blocks": blocks}]
+    assert summary["rate"] == 1.0
+
+
+def test_memory_profiler_leaves_existing_tracing_alone():
+    tracemalloc.start()
+    try:
+        profiler = MemoryProfiler("test.cmm", rate=0.1)
+        run_source(ALLOCATING, memory_profiler=profiler)
+        assert tracemalloc.is_tracing()
+        assert profiler.sites and profiler.sites[0][0] == 2
+    finally:
+        tracemalloc.stop()
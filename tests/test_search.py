@@ -0,0 +1,139 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import time
+
+import pytest
+
+from cmm.search import ERROR, INDEXED, RESULTS, ProjectIndex, SearchWorker, trigrams
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "main.cmm").write_text('total = 0;\nprint("Total", total);\n', encoding="utf-8")
+    (tmp_path / "lib" / "math.cmm").write_text("def square(x) {\n    return x * x;\n}\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("square total\n", encoding="utf-8")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "skip.cmm").write_text("square\n", encoding="utf-8")
+    return tmp_path
+
+
+def touch(path, text):
+    stat = os.stat(path)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_trigrams_are_case_folded_per_line():
+    assert trigrams("Abcd\nab") == {"abc", "bcd"}
+
+
+def test_index_finds_hits_in_cmm_sources_only(project):
+    with ProjectIndex(project) as index:
+        assert index.update() == (2, 0)
+        assert index.file_count() == 2
+        hits = index.search("total")
+        assert [(hit.path, hit.line, hit.start, hit.end) for hit in hits] == [
+            ("main.cmm", 1, 0, 5), ("main.cmm", 2, 7, 12), ("main.cmm", 2, 15, 20)
+        ]
+        assert [hit.line for hit in index.search("Total", match_case=True)] == [2]
+        assert index.candidates("square") == [os.path.join("lib", "math.cmm")]
+
+
+def test_regex_queries_scan_every_file(project):
+    with ProjectIndex(project) as index:
+        index.update()
+        assert index.candidates(r"x \* x", regex=True) == sorted([os.path.join("lib", "math.cmm"), "main.cmm"])
+        assert [hit.text for hit in index.search(r"x \* x", regex=True)] == ["    return x * x;"]
+
+
+def test_update_only_reindexes_changed_files(project):
+    with ProjectIndex(project) as index:
+        index.update()
+        assert index.update() == (0, 0)
+        touch(project / "main.cmm", "print(square(3));\n")
+        (project / "lib" / "math.cmm").unlink()
+        assert index.update() == (1, 1)
+        assert [hit.path for hit in index.search("square")] == ["main.cmm"]
+        assert index.search("total") == []
+    with ProjectIndex(project) as index:
+        assert index.update() == (0, 0)
+
+
+def test_search_stops_at_the_limit(project):
+    with ProjectIndex(project) as index:
+        index.update()
+        assert len(index.search("total", limit=2)) == 2
+
+
+def events_until(worker, kind, timeout=10):
+    deadline = time.monotonic() + timeout
+    seen = []
+    while time.monotonic() < deadline:
+        seen.extend(worker.drain())
+        if any(event[0] == kind for event in seen):
+            return seen
+        time.sleep(0.01)
+    raise AssertionError(f"no {kind} event in {seen}")
+
+
+def test_worker_indexes_then_answers_queries(project):
+    worker = SearchWorker(str(project)).start()
+    try:
+        events = events_until(worker, INDEXED)
+        assert [event for event in events if event[0] == INDEXED][0][1][:3] == (2, 2, 0)
+        worker.query("(", regex=True)
+        assert events_until(worker, ERROR)[-1][0] == ERROR
+        worker.query("square")
+        query, hits, elapsed = events_until(worker, RESULTS)[-1][1]
+        assert query == "square"
+        assert [(hit.path, hit.line) for hit in hits] == [(os.path.join("lib", "math.cmm"), 1)]
+    finally:
+        worker.stop()
+        worker.thread.join(5)
+    assert not worker.thread.is_alive()
+
+
+def test_queries_read_the_last_refreshed_index(project, monkeypatch):
+    worker = SearchWorker(str(project), refresh_interval=None).start()
+    try:
+        events_until(worker, INDEXED)
+        monkeypatch.setattr(ProjectIndex, "update", lambda *args, **kwargs: pytest.fail("query walked the tree"))
+        (project / "new.cmm").write_text("square(2);\n", encoding="utf-8")
+        worker.query("square")
+        query, hits, elapsed = events_until(worker, RESULTS)[-1][1]
+        assert [hit.path for hit in hits] == [os.path.join("lib", "math.cmm")]
+    finally:
+        worker.stop()
+        worker.thread.join(5)
+
+
+def test_worker_refreshes_the_index_on_a_timer(project):
+    worker = SearchWorker(str(project), refresh_interval=0.05).start()
+    try:
+        events_until(worker, INDEXED)
+        (project / "new.cmm").write_text("square(2);\n", encoding="utf-8")
+        files, changed, removed, elapsed = [event for event in events_until(worker, INDEXED) if event[0] == INDEXED][-1][1]
+        assert (files, changed, removed) == (3, 1, 0)
+        worker.query("square")
+        query, hits, elapsed = events_until(worker, RESULTS)[-1][1]
+        assert [hit.path for hit in hits] == [os.path.join("lib", "math.cmm"), "new.cmm"]
+    finally:
+        worker.stop()
+        worker.thread.join(5)
@@ -0,0 +1,234 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import base64
+import http.client
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from cmm.limits import Limits
+from cmm.pool import WarmPool
+from cmm.server import ExecutionServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    service = ExecutionServer(WarmPool(2, grace=0.2), limits=Limits(timeout=5))
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    
+    def on_ready(listener):
+        service.port = listener.sockets[0].getsockname()[1]
+        ready.set()
+    
+    task = loop.create_task(service.serve("127.0.0.1", 0, on_ready))
+    
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert ready.wait(30)
+    yield service
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+    service.close()
+
+
+def request(server, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=30)
+    try:
+        connection.request(method, path, body=None if body is None else json.dumps(body).encode("utf-8"))
+        response = connection.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read().decode("utf-8")
+    finally:
+        connection.close()
+
+
+class WebSocketClient:
+    def __init__(self, port):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=30)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        self.sock.sendall((
+            f"GET /ws HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        ).encode("ascii"))
+        head = b""
+        while not head.endswith(b"\r\n\r\n"):
+            head += self.sock.recv(1)
+        self.status = int(head.split()[1])
+    
+    def read(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("connection closed")
+            data += chunk
+        return data
+    
+    def send(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        mask = os.urandom(4)
+        head = bytes((0x81, 0x80 | len(data))) if len(data) < 126 else bytes((0x81, 0x80 | 126)) + len(data).to_bytes(2, "big")
+        self.sock.sendall(head + mask + bytes(byte ^ mask[i % 4] for i, byte in enumerate(data)))
+    
+    def receive(self):
+        first, second = self.read(2)
+        length = second & 0x7F
+        if length == 126:
+            length = int.from_bytes(self.read(2), "big")
+        elif length == 127:
+            length = int.from_bytes(self.read(8), "big")
+        payload = self.read(length)
+        if first & 0x0F == 8:
+            close = {"type": "close", "code": int.from_bytes(payload[:2], "big")}
+            return dict(close, reason=payload[2:].decode("utf-8")) if length > 2 else close
+        return json.loads(payload)
+    
+    def receive_until(self, kind):
+        messages = []
+        while not messages or messages[-1]["type"] not in (kind, "close"):
+            messages.append(self.receive())
+        return messages
+    
+    def close(self):
+        self.sock.close()
+
+
+def test_health(server):
+    status, content_type, body = request(server, "GET", "/health")
+    assert (status, content_type) == (200, "application/json")
+    assert json.loads(body) == dict(json.loads(body), workers=2, running=0)
+
+
+def test_http_run_streams_json_lines(server):
+    status, content_type, body = request(server, "POST", "/run", {
+        "source": 'print("hi", input());\nprint(1 / 0);\n', "input": "ada\n", "filename": "web.cmm"
+    })
+    assert (status, content_type) == (200, "application/x-ndjson")
+    events = [json.loads(line) for line in body.splitlines()]
+    assert events[0] == {"type": "started"}
+    assert "".join(event["data"] for event in events if event["type"] == "output") == "hi ada\n"
+    assert events[-1]["type"] == "done" and events[-1]["status"] == "error"
+    assert events[-1]["error"] == "web.cmm, line 2: ZeroDivisionError: division by zero"
+
+
+def test_server_limits_cap_requested_limits(server):
+    status, _, body = request(server, "POST", "/run", {"source": "while (true) {\n}\n", "timeout": 60, "max_steps": 500})
+    done = json.loads(body.splitlines()[-1])
+    assert done["status"] == "limit" and "step" in done["error"]
+
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("POST", "/run", "not json", 400),
+    ("POST", "/run", {"source": 1}, 400),
+    ("POST", "/run", {"source": "", "timeout": -1}, 400),
+    ("GET", "/run", None, 405),
+    ("GET", "/missing", None, 404),
+])
+def test_bad_requests(server, method, path, body, status):
+    got, content_type, text = request(server, method, path, body)
+    assert (got, content_type) == (status, "application/json")
+    assert json.loads(text)["error"]
+
+
+def test_websocket_interactive_input(server):
+    client = WebSocketClient(server.port)
+    try:
+        assert client.status == 101
+        client.send({"source": 'name = input("name? ");\nprint("hi", name);\n'})
+        messages = client.receive_until("input")
+        assert [message["type"] for message in messages] == ["queued", "started", "input"]
+        assert messages[-1]["data"] == "name? "
+        client.send({"type": "input", "data": "ada"})
+        messages = client.receive_until("done")
+        assert {"type": "output", "data": "hi ada\n"} in messages
+        assert messages[-1]["status"] == "ok"
+        assert client.receive() == {"type": "close", "code": 1000}
+    finally:
+        client.close()
+
+
+def test_websocket_cancel(server):
+    client = WebSocketClient(server.port)
+    try:
+        client.send({"source": "while (true) {\n}\n"})
+        client.receive_until("started")
+        client.send({"type": "cancel"})
+        done = client.receive_until("done")[-1]
+        assert (done["status"], done["error"]) == ("limit", "execution cancelled")
+    finally:
+        client.close()
+    status, _, body = request(server, "GET", "/health")
+    assert json.loads(body)["running"] == 0
+
+
+def test_websocket_idle_input_hits_the_time_limit(server):
+    client = WebSocketClient(server.port)
+    try:
+        client.send({"source": 'name = input("name? ");\n', "timeout": 0.5})
+        client.receive_until("input")
+        done = client.receive_until("done")[-1]
+        assert done["status"] == "limit"
+    finally:
+        client.close()
+
+
+def raw_request(server, data):
+    with socket.create_connection(("127.0.0.1", server.port), timeout=30) as sock:
+        sock.sendall(data)
+        response = b""
+        while chunk := sock.recv(65536):
+            response += chunk
+    return response.decode("latin-1")
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 100000 + b"\r\n\r\n", "request line or header too long"),
+    (b"GET /health HTTP/1.1\r\n" + b"X-Many: 1\r\n" * 200 + b"\r\n", "too many headers"),
+], ids=["long", "many"])
+def test_oversized_headers_are_rejected(server, data, message):
+    response = raw_request(server, data)
+    assert response.startswith("HTTP/1.1 400 Bad Request\r\n")
+    assert response.endswith(json.dumps({"error": message}))
+
+
+def test_websocket_errors_close_the_socket(server):
+    client = WebSocketClient(server.port)
+    try:
+        client.sock.sendall(bytes((0x81, 0x80 | 127)) + (2 << 20).to_bytes(8, "big"))
+        assert client.receive() == {"type": "close", "code": 1009, "reason": "message too large"}
+    finally:
+        client.close()
+    
+    client = WebSocketClient(server.port)
+    try:
+        client.sock.sendall(bytes((0x81, 0x82)) + bytes(4) + b"\xff\xfe")
+        assert client.receive() == {"type": "close", "code": 1007, "reason": "messages must be UTF-8"}
+    finally:
+        client.close()
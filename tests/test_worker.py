@@ -0,0 +1,171 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import threading
+import time
+
+import pytest
+
+from cmm import CmmLimitError, CmmRuntimeError, CmmSyntaxError, Limits
+from cmm import worker as worker_module
+from cmm.worker import DONE, ECHO, ERROR, INPUT, OUTPUT, InputChannel, ScriptWorker
+
+
+def events_of(worker, replies=()):
+    replies = iter(replies)
+    events = []
+    while True:
+        kind, value = worker.events.get(timeout=5)
+        events.append((kind, value))
+        if kind == INPUT:
+            reply = next(replies, None)
+            if reply is not None:
+                worker.send(reply)
+        elif kind == DONE:
+            return events
+
+
+def test_output_streams_in_order():
+    worker = ScriptWorker('for (int i = 0; i < 3; i++) {\n    print(i);\n}\nprint("end");').start()
+    events = events_of(worker)
+    assert events[-1][0] == DONE
+    assert "".join(value for kind, value in events if kind == OUTPUT) == "0\n1\n2\nend\n"
+    worker.thread.join(5)
+    assert not worker.is_running()
+
+
+def test_program_runs_off_the_calling_thread():
+    threads = []
+    worker = ScriptWorker('print("x");')
+    worker.write = lambda text: threads.append(threading.current_thread())
+    events_of(worker.start())
+    assert threads and threads[0] is not threading.current_thread()
+
+
+def test_input_blocks_until_a_reply_arrives():
+    worker = ScriptWorker('name = input("name? ");\nprint("hi", name);').start()
+    events = events_of(worker, ["ada"])
+    assert (INPUT, "name? ") in events
+    assert (ECHO, "ada") in events
+    assert (OUTPUT, "hi ada\n") in events
+
+
+def test_type_ahead_input_is_consumed_without_waiting():
+    worker = ScriptWorker('a = input();\nb = input();\nprint(b, a);', input_text="one\ntwo\n").start()
+    events = events_of(worker)
+    assert [value for kind, value in events if kind == ECHO] == ["one", "two"]
+    assert (OUTPUT, "two one\n") in events
+
+
+def test_closing_input_ends_a_blocked_read():
+    worker = ScriptWorker('print(input("? "));').start()
+    assert worker.events.get(timeout=5) == (INPUT, "? ")
+    worker.close_input()
+    kind, error = events_of(worker)[-2]
+    assert kind == ERROR and "EOFError" in error.message
+
+
+def test_errors_are_reported_as_events():
+    events = events_of(ScriptWorker('print(1);\nprint(1 / 0);', "div.cmm").start())
+    kind, error = events[-2]
+    assert kind == ERROR and isinstance(error, CmmRuntimeError)
+    assert error.line == 2
+    kind, error = events_of(ScriptWorker("print(", "bad.cmm").start())[-2]
+    assert kind == ERROR and isinstance(error, CmmSyntaxError)
+    assert error.filename == "bad.cmm"
+
+
+def test_cancel_stops_a_running_program():
+    worker = ScriptWorker("while (true) {\n}").start()
+    threading.Timer(0.1, worker.cancel).start()
+    kind, error = events_of(worker)[-2]
+    assert kind == ERROR and isinstance(error, CmmLimitError)
+    assert error.reason == "cancelled"
+
+
+def test_cancel_ends_a_blocked_read():
+    worker = ScriptWorker('print(input("? "));').start()
+    assert worker.events.get(timeout=5) == (INPUT, "? ")
+    worker.cancel()
+    kind, error = events_of(worker)[-2]
+    assert kind == ERROR and isinstance(error, CmmLimitError)
+
+
+def test_time_limit_ends_a_blocked_read():
+    worker = ScriptWorker('string name = input("? ");\nprint(name);', limits=Limits(timeout=0.3)).start()
+    start = time.perf_counter()
+    kind, error = events_of(worker)[-2]
+    assert kind == ERROR and error.reason == "timeout"
+    assert time.perf_counter() - start < 3
+
+
+def test_worker_enforces_limits():
+    worker = ScriptWorker("while (true) {\n}", limits=Limits(max_steps=1000)).start()
+    kind, error = events_of(worker)[-2]
+    assert kind == ERROR and error.reason == "steps"
+
+
+def test_output_is_batched_until_the_next_event():
+    worker = ScriptWorker("print(1);\nprint(2);\nprint(3);").start()
+    worker.thread.join(5)
+    events = worker.drain()
+    assert [kind for kind, value in events] == [OUTPUT, DONE]
+    assert events[0][1] == "1\n2\n3\n"
+
+
+def test_writer_waits_while_the_consumer_is_behind(monkeypatch):
+    monkeypatch.setattr(worker_module, "OUTPUT_CHUNK_SIZE", 1)
+    monkeypatch.setattr(worker_module, "MAX_QUEUED_CHUNKS", 2)
+    worker = ScriptWorker("for (int i = 0; i < 10; i++) {\n    print(i);\n}").start()
+    time.sleep(0.2)
+    assert worker.is_running() and worker.events.qsize() == 2
+    events = []
+    while not events or events[-1][0] != DONE:
+        events += worker.drain()
+        time.sleep(0.01)
+    assert "".join(value for kind, value in events if kind == OUTPUT) == "".join(f"{i}\n" for i in range(10))
+
+
+def test_channel_splits_lines_and_counts_pending():
+    channel = InputChannel("a\nb\r\nc")
+    channel.feed("")
+    assert channel.pending() == 4
+    assert [channel.readline() for _ in range(4)] == ["a", "b", "c", ""]
+
+
+def test_channel_readline_blocks_until_fed():
+    channel = InputChannel()
+    timer = threading.Timer(0.1, channel.feed, ["late"])
+    start = time.perf_counter()
+    timer.start()
+    assert channel.readline() == "late"
+    assert time.perf_counter() - start >= 0.05
+
+
+def test_channel_readline_times_out():
+    channel = InputChannel("ready")
+    assert channel.readline(timeout=0) == "ready"
+    with pytest.raises(TimeoutError):
+        channel.readline(timeout=0.05)
+
+
+def test_channel_close_wakes_reader_after_buffered_lines():
+    channel = InputChannel("left")
+    threading.Timer(0.1, channel.close).start()
+    assert channel.readline() == "left"
+    with pytest.raises(EOFError):
+        channel.readline()
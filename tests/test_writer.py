@@ -0,0 +1,104 @@
+# Name: Dev-C-- and C-- Language | Introduce: An IDE and a coding language
+# Copyright (C) 2023~2025 YX-Studio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+from conftest import load_ide
+
+ide = load_ide()
+
+
+@pytest.fixture
+def writer():
+    writer = ide.BackgroundWriter()
+    yield writer
+    writer.close(5)
+
+
+def finished(writer):
+    writer.wait()
+    results = writer.drain()
+    assert writer.pending == 0
+    return results
+
+
+def test_write_atomic_replaces_and_keeps_the_mode(tmp_path):
+    path = tmp_path / "a.cmm"
+    path.write_text("old", encoding="utf-8")
+    os.chmod(path, 0o640)
+    ide.write_atomic(str(path), "new\n")
+    assert path.read_text(encoding="utf-8") == "new\n"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert os.listdir(tmp_path) == ["a.cmm"]
+
+
+def test_failed_write_leaves_the_original(tmp_path, monkeypatch):
+    path = tmp_path / "a.cmm"
+    path.write_text("old", encoding="utf-8")
+    
+    def fail(fd):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(ide.os, "fsync", fail)
+    with pytest.raises(OSError):
+        ide.write_atomic(str(path), "new")
+    assert path.read_text(encoding="utf-8") == "old"
+    assert os.listdir(tmp_path) == ["a.cmm"]
+
+
+def test_saves_report_their_token_and_errors(writer, tmp_path):
+    writer.submit(writer.SAVE, str(tmp_path / "a.cmm"), "print(1);\n", token=7)
+    writer.submit(writer.SAVE, str(tmp_path / "missing" / "b.cmm"), "", token=8)
+    assert writer.pending == 2
+    (kind, path, token, error), (_, _, token2, error2) = finished(writer)
+    assert (kind, token, error) == (writer.SAVE, 7, None)
+    assert (tmp_path / "a.cmm").read_text(encoding="utf-8") == "print(1);\n"
+    assert token2 == 8 and isinstance(error2, OSError)
+
+
+def test_autosave_skips_unchanged_snapshots(writer, tmp_path, monkeypatch):
+    writes = []
+    write_atomic = ide.write_atomic
+    monkeypatch.setattr(ide, "write_atomic", lambda path, text: (writes.append(path), write_atomic(path, text)))
+    path = str(tmp_path / "recovery" / "1.json")
+    for text in ("a", "a", "ab", "a"):
+        writer.submit(writer.AUTOSAVE, path, {"path": "x.cmm", "text": text})
+    finished(writer)
+    assert len(writes) == 3
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"path": "x.cmm", "text": "a"}
+    
+    writer.submit(writer.DISCARD, path)
+    writer.submit(writer.DISCARD, path)
+    assert [error for *_, error in finished(writer)] == [None, None]
+    assert not os.path.exists(path)
+    writer.submit(writer.AUTOSAVE, path, {"path": "x.cmm", "text": "a"})
+    finished(writer)
+    assert len(writes) == 4
+
+
+def test_process_alive():
+    assert ide.process_alive(os.getpid())
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    assert not ide.process_alive(child.pid)